@@ -1024,6 +1024,17 @@ def api_cancel_job(job_id: str):
     return jsonify({"job_id": job_id, "status": "cancelled"})
 
 
+def _sorted_pdf_entries(folder: str) -> list:
+    """Regular .pdf files in folder as os.DirEntry objects, sorted by name ([] if missing)."""
+    try:
+        with os.scandir(folder) as it:
+            entries = [e for e in it if e.name.endswith(".pdf") and e.is_file()]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
 @app.route("/api/output/<patient_id>")
 def api_output(patient_id: str):
     """
@@ -1045,27 +1056,21 @@ def api_output(patient_id: str):
 
     # Scan for Persona and Reports in patient-specific folder
     report_folder = get_patient_report_folder(patient_id, patient_name)
-    if os.path.exists(report_folder):
-        for f in sorted(os.listdir(report_folder)):
-            if not f.endswith(".pdf"):
-                continue
-            full_path = os.path.join(report_folder, f)
-            if not os.path.isfile(full_path):
-                continue
-
-            if f.startswith(f"DOC-{patient_id}-"):
-                files.append({"type": "report", "name": f, "path": full_path})
-            elif "-persona" in f and f.startswith(f"{patient_id}-"):
-                files.append({"type": "persona", "name": f, "path": full_path})
+    # scandir hands back each entry's path and cached file type: no per-file join or stat
+    report_prefix = f"DOC-{patient_id}-"
+    persona_prefix = f"{patient_id}-"
+    for entry in _sorted_pdf_entries(report_folder):
+        f = entry.name
+        if f.startswith(report_prefix):
+            files.append({"type": "report", "name": f, "path": entry.path})
+        elif "-persona" in f and f.startswith(persona_prefix):
+            files.append({"type": "persona", "name": f, "path": entry.path})
 
     # Scan for Summaries in the shared summary folder
-    summary_folder = get_patient_summary_folder(patient_id)
-    if os.path.exists(summary_folder):
-        for f in sorted(os.listdir(summary_folder)):
-            if f.startswith(f"Clinical_Summary_Patient_{patient_id}") and f.endswith(".pdf"):
-                full_path = os.path.join(summary_folder, f)
-                if os.path.isfile(full_path):
-                    files.append({"type": "summary", "name": f, "path": full_path})
+    summary_prefix = f"Clinical_Summary_Patient_{patient_id}"
+    for entry in _sorted_pdf_entries(get_patient_summary_folder(patient_id)):
+        if entry.name.startswith(summary_prefix):
+            files.append({"type": "summary", "name": entry.name, "path": entry.path})
 
     return jsonify({"patient_id": patient_id, "files": files})
 
@@ -69,37 +69,38 @@ def _compact_value(value: Any, max_text: int, max_bio: int, key: str | None = No
 
 # ─── LOG COMPACTION ────────────────────────────────────────────────────────────
 
+_HISTORY_SEP_RE = re.compile(r"\n?-{10,}\n?")
+_HISTORY_FIELD_RE = re.compile(r"^(USER FEEDBACK|AI CHANGES):(.*)$", re.MULTILINE)
+_EARLIER_FEEDBACK_RE = re.compile(r"\s*[─-]+ Earlier Feedback [─-]+\s*", re.IGNORECASE)
+
+
+def _read_text(path: str) -> str | None:
+    """Returns the file's text, or None if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except Exception:
+        return None
+
+
 def _split_history_entries(text: str) -> list[str]:
     """Splits history log by the standard separator line."""
-    parts = re.split(r"\n?-{10,}\n?", text)
+    parts = _HISTORY_SEP_RE.split(text)
     return [p.strip() for p in parts if p.strip()]
 
 
 def _compact_history_entry(entry: str, max_feedback: int, max_text: int) -> str:
-    """Truncates specific blocks within a single history entry."""
-    lines = entry.splitlines()
-    compacted = []
-    for line in lines:
-        if line.startswith("USER FEEDBACK:"):
-            val = line[len("USER FEEDBACK:"):].strip()
-            compacted.append(f"USER FEEDBACK: {_truncate(val, max_feedback)}")
-        elif line.startswith("AI CHANGES:"):
-            val = line[len("AI CHANGES:"):].strip()
-            compacted.append(f"AI CHANGES: {_truncate(val, max_text)}")
-        else:
-            compacted.append(line)
-    return "\n".join(compacted)
+    """Truncates specific blocks within a single history entry (single regex pass)."""
+    def _sub(m):
+        limit = max_feedback if m.group(1) == "USER FEEDBACK" else max_text
+        return f"{m.group(1)}: {_truncate(m.group(2).strip(), limit)}"
+    return _HISTORY_FIELD_RE.sub(_sub, entry)
 
 
 def _compact_history_log(log_path: str, max_entries: int, max_feedback: int, max_text: int, dry_run: bool) -> bool:
     """Reads, compacts, and optionally writes a patient history log."""
-    if not os.path.exists(log_path):
-        return False
-    
-    try:
-        with open(log_path, "r", encoding="utf-8") as f:
-            content = f.read()
-    except Exception:
+    content = _read_text(log_path)
+    if content is None:
         return False
 
     entries = _split_history_entries(content)
@@ -136,21 +137,13 @@ def _compact_patient_record_feedback(path: str, max_feedback: int, dry_run: bool
     Specifically targets the 'GENERATION FEEDBACK LOG' section in -record.txt.
     Prunes 'Earlier Feedback' completely and truncates the current block.
     """
-    if not os.path.exists(path):
-        return False
-    
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
-    except Exception:
-        return False
-
-    if "GENERATION FEEDBACK LOG" not in content:
+    content = _read_text(path)
+    if content is None or "GENERATION FEEDBACK LOG" not in content:
         return False
 
     # 1. Strip all "Earlier Feedback" to prevent infinite growth
     # Uses a broad pattern to match dashes or spaces around the text
-    split_parts = re.split(r"\s*[─-]+ Earlier Feedback [─-]+\s*", content, flags=re.IGNORECASE)
+    split_parts = _EARLIER_FEEDBACK_RE.split(content)
     content = split_parts[0].rstrip() + "\n"
 
     lines = content.splitlines()
@@ -1,5 +1,8 @@
 import os
 import json
+import time
+import hashlib
+import functools
 from openai import OpenAI
 import vertexai
 from vertexai.generative_models import GenerativeModel, GenerationConfig
@@ -15,6 +18,7 @@ from . import models
 from . import prompts
 from . import enrichment
 from . import quality
+from ..core.config import OUTPUT_DIR
 
 # ─── Load Environment ────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -126,8 +130,13 @@ def _strip_json_fences(text: str) -> str:
 
 
 def _parse_vertex_response(resp, model_class, existing_persona=None):
+    """Parse a raw Vertex AI GenerateContent response into a Pydantic model."""
+    return _parse_payload_text(resp.text, model_class, existing_persona)
+
+
+def _parse_payload_text(text: str, model_class, existing_persona=None):
     """
-    Parse a raw Vertex AI GenerateContent response into a Pydantic model.
+    Parse a raw JSON model response (Vertex AI or Batch API output) into a Pydantic model.
 
     Handles:
     - Markdown JSON fences
@@ -137,7 +146,7 @@ def _parse_vertex_response(resp, model_class, existing_persona=None):
 
     Returns the parsed Pydantic object.
     """
-    raw_text = _strip_json_fences(resp.text)
+    raw_text = _strip_json_fences(text)
     data = json.loads(raw_text)
 
     # Unwrap list responses
@@ -186,30 +195,38 @@ def check_connection() -> bool:
         print(f" FAILED! ❌\n   ⚠️  Connection Error: {e}")
         return False
 
-def generate_clinical_data(
+_TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "templates")
+
+
+@functools.lru_cache(maxsize=64)
+def _read_document_template(path: str, mtime_ns: int):
+    """Parsed JSON template, keyed on mtime so edits are picked up. Treat as read-only."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _build_clinical_data_prompt(
     case_details: dict,
     patient_state: dict,
     document_plan: dict,
     user_feedback: str = "",
     history_context: str = "",
     existing_persona: Optional[Dict] = None,
-) -> models.ClinicalDataPayload:
-    """
-    Calls AI to generate clinical data (Persona + Documents) based on the patient state and plan.
-    When existing_persona is provided and the AI omits patient_persona, it is used as fallback.
-    """
-    
-    # 1. Load actual JSON templates from disk
+    excluded_names: Optional[List[str]] = None,
+) -> str:
+    """Load the planned JSON templates and render the main clinical-data user prompt."""
+    # 1. Load actual JSON templates (parsed once per file across a batch)
     loaded_templates = {}
-    templates_dir = os.path.join(os.path.dirname(__file__), "..", "..", "templates")
     for tmpl_file in document_plan.get("document_templates", []):
-        tmpl_path = os.path.join(templates_dir, tmpl_file)
-        if os.path.exists(tmpl_path):
-            try:
-                with open(tmpl_path, "r", encoding="utf-8") as f:
-                    loaded_templates[tmpl_file] = json.load(f)
-            except Exception as e:
-                print(f"⚠️ Failed to load template {tmpl_file}: {e}")
+        tmpl_path = os.path.join(_TEMPLATES_DIR, tmpl_file)
+        try:
+            mtime_ns = os.stat(tmpl_path).st_mtime_ns
+        except OSError:
+            continue
+        try:
+            loaded_templates[tmpl_file] = _read_document_template(tmpl_path, mtime_ns)
+        except Exception as e:
+            print(f"⚠️ Failed to load template {tmpl_file}: {e}")
                 
     # 2. Update document_plan with actual templates
     full_document_plan = {
@@ -225,7 +242,128 @@ def generate_clinical_data(
         document_plan=full_document_plan,
         user_feedback=user_feedback,
         history_context=history_context,
-        existing_persona=existing_persona
+        existing_persona=existing_persona,
+        excluded_names=excluded_names,
+    )
+    return prompt
+
+
+# ─── Clinical-data response cache ────────────────────────────────────────────
+# Opt-in (PDG_AI_CACHE=true): re-running a patient with identical inputs (e.g.
+# resuming an interrupted '*' batch) reuses the stored payload instead of paying
+# for another generation. Off by default because it also freezes the prompt's
+# deliberate randomness across runs. Entries are written only once the workflow
+# has accepted a payload (see store_clinical_data_cache), so a payload rejected
+# downstream is regenerated on the next attempt.
+AI_CACHE_ENABLED = os.getenv("PDG_AI_CACHE", "false").lower() == "true"
+AI_CACHE_DIR = os.path.join(OUTPUT_DIR, "cache", "clinical_data")
+
+
+def _clinical_data_cache_key(gen_kwargs: dict) -> str:
+    # The taken-names list grows with every patient; a cached name that is now taken
+    # is caught by the workflow's name reservation instead.
+    inputs = {k: v for k, v in gen_kwargs.items() if k != "excluded_names"}
+    material = json.dumps(
+        {"provider": PROVIDER, "model": MODEL_NAME, "inputs": inputs},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def _read_cached_payload(key: str) -> Optional[models.ClinicalDataPayload]:
+    cache_path = os.path.join(AI_CACHE_DIR, f"{key}.json")
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return models.ClinicalDataPayload.model_validate_json(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"   ⚠️  Ignoring unreadable AI cache entry {key}: {e}")
+        return None
+
+
+def _write_cached_payload(key: str, payload: models.ClinicalDataPayload):
+    try:
+        os.makedirs(AI_CACHE_DIR, exist_ok=True)
+        cache_path = os.path.join(AI_CACHE_DIR, f"{key}.json")
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload.model_dump_json())
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"   ⚠️  Could not write AI cache entry: {e}")
+
+
+def generate_clinical_data(
+    case_details: dict,
+    patient_state: dict,
+    document_plan: dict,
+    user_feedback: str = "",
+    history_context: str = "",
+    existing_persona: Optional[Dict] = None,
+    use_cache: Optional[bool] = None,
+    excluded_names: Optional[List[str]] = None,
+) -> models.ClinicalDataPayload:
+    """
+    Calls AI to generate clinical data (Persona + Documents) based on the patient state and plan.
+    When existing_persona is provided and the AI omits patient_persona, it is used as fallback.
+    excluded_names (names already taken) are listed in the prompt for new personas.
+    When use_cache (default AI_CACHE_ENABLED) is True, identical inputs are served
+    from the on-disk response cache; callers store accepted payloads with
+    store_clinical_data_cache.
+    """
+    gen_kwargs = {
+        "case_details": case_details,
+        "patient_state": patient_state,
+        "document_plan": document_plan,
+        "user_feedback": user_feedback,
+        "history_context": history_context,
+        "existing_persona": existing_persona,
+        "excluded_names": excluded_names,
+    }
+    if use_cache is None:
+        use_cache = AI_CACHE_ENABLED
+    if not use_cache:
+        return _generate_clinical_data_live(**gen_kwargs)
+
+    key = _clinical_data_cache_key(gen_kwargs)
+    cached = _read_cached_payload(key)
+    if cached is not None:
+        print("   ♻️  Reusing cached AI response (identical inputs).")
+        return cached, {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cached": True}
+
+    return _generate_clinical_data_live(**gen_kwargs)
+
+
+def store_clinical_data_cache(gen_kwargs: dict, payload: models.ClinicalDataPayload):
+    """Cache payload for gen_kwargs after the workflow has accepted it (no-op unless AI_CACHE_ENABLED)."""
+    if not AI_CACHE_ENABLED or payload is None:
+        return
+    key = _clinical_data_cache_key(gen_kwargs)
+    if not os.path.exists(os.path.join(AI_CACHE_DIR, f"{key}.json")):
+        _write_cached_payload(key, payload)
+
+
+def _generate_clinical_data_live(
+    case_details: dict,
+    patient_state: dict,
+    document_plan: dict,
+    user_feedback: str = "",
+    history_context: str = "",
+    existing_persona: Optional[Dict] = None,
+    excluded_names: Optional[List[str]] = None,
+):
+    """Uncached clinical-data generation; see generate_clinical_data."""
+    
+    prompt = _build_clinical_data_prompt(
+        case_details=case_details,
+        patient_state=patient_state,
+        document_plan=document_plan,
+        user_feedback=user_feedback,
+        history_context=history_context,
+        existing_persona=existing_persona,
+        excluded_names=excluded_names,
     )
 
     # Build prompt with an explicit instruction to always include documents
@@ -371,8 +509,219 @@ def generate_clinical_data(
         raise e
 
 
+@functools.lru_cache(maxsize=1)
+def _payload_schema_hint() -> str:
+    """JSON schema of ClinicalDataPayload for the raw-JSON system prompts (static per process)."""
+    return json.dumps(models.ClinicalDataPayload.model_json_schema())
+
+
+def generate_clinical_data_multi(requests_by_id: Dict[str, Dict]) -> Dict[str, tuple]:
+    """
+    Generates clinical data for several patients in ONE chat-completions call
+    (OpenAI only). The system prompt and schema are sent once; the model returns
+    {"patients": [{"patient_id": ..., "payload": {...}}, ...]}.
+
+    Args:
+        requests_by_id: Maps patient ID to generate_clinical_data kwargs.
+
+    Returns:
+        {patient_id: (ClinicalDataPayload or None, usage_stats)}. Patients the
+        model dropped or returned unparseable map to (None, usage_stats).
+    """
+    if PROVIDER != "openai":
+        raise RuntimeError("Multi-patient generation is only supported for LLM_PROVIDER=openai")
+
+    schema_hint = _payload_schema_hint()
+    system_content = (
+        f"{prompts.SYSTEM_PROMPT}\n\n"
+        f"You will receive several independent patient cases. Respond ONLY with a JSON object "
+        f'of the form {{"patients": [{{"patient_id": "<id>", "payload": <object>}}, ...]}} with '
+        f"exactly one entry per case, where each payload matches this JSON schema:\n{schema_hint}"
+    )
+    cases = [
+        {"patient_id": str(p_id), "instructions": _build_clinical_data_prompt(**gen_kwargs)}
+        for p_id, gen_kwargs in requests_by_id.items()
+    ]
+
+    print(f"   🤖 Calling {MODEL_NAME} for {len(cases)} patient(s) in one request…")
+    completion = client.client.chat.completions.create(
+        model=MODEL_NAME,
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": json.dumps(cases)},
+        ],
+    )
+
+    # Token usage is shared by the group; attribute it evenly per patient
+    usage = getattr(completion, "usage", None)
+    share = max(1, len(cases))
+    usage_stats = {
+        "prompt_tokens": (usage.prompt_tokens if usage else 0) // share,
+        "completion_tokens": (usage.completion_tokens if usage else 0) // share,
+        "total_tokens": (usage.total_tokens if usage else 0) // share,
+    }
+
+    results = {str(p_id): (None, usage_stats) for p_id in requests_by_id}
+    entries = json.loads(_strip_json_fences(completion.choices[0].message.content or "{}")).get("patients", [])
+    for entry in entries:
+        p_id = str(entry.get("patient_id", ""))
+        gen_kwargs = requests_by_id.get(p_id)
+        if gen_kwargs is None:
+            continue
+        try:
+            response_obj = _parse_payload_text(
+                json.dumps(entry.get("payload")), models.ClinicalDataPayload, gen_kwargs.get("existing_persona")
+            )
+            response_obj = quality.ensure_persona_quality(
+                response_obj, gen_kwargs.get("case_details"), gen_kwargs.get("patient_state")
+            )
+            results[p_id] = (response_obj, usage_stats)
+        except Exception as e:
+            print(f"   ⚠️  Grouped result for {p_id} could not be parsed: {e}")
+    return results
+
+
+# Give up on (and cancel) a Batch API job after this many seconds; the provider's
+# completion window is 24h, so the default leaves an hour of slack.
+BATCH_MAX_WAIT = float(os.getenv("PDG_BATCH_MAX_WAIT", str(25 * 3600)) or 25 * 3600)
+
+
+def submit_clinical_data_batch(requests_by_id: Dict[str, Dict]) -> str:
+    """
+    Submit one OpenAI Batch API job covering several patients.
+
+    Args:
+        requests_by_id: Maps custom_id (patient ID) to generate_clinical_data kwargs.
+
+    Returns:
+        The batch ID to pass to collect_clinical_data_batch.
+    """
+    if PROVIDER != "openai":
+        raise RuntimeError("Batch API submission is only supported for LLM_PROVIDER=openai")
+
+    raw_client = client.client  # underlying OpenAI client behind instructor
+    schema_hint = _payload_schema_hint()
+    system_content = (
+        f"{prompts.SYSTEM_PROMPT}\n\n"
+        f"Respond ONLY with a JSON object matching this JSON schema:\n{schema_hint}"
+    )
+
+    lines = []
+    for custom_id, gen_kwargs in requests_by_id.items():
+        prompt = _build_clinical_data_prompt(**gen_kwargs)
+        lines.append(json.dumps({
+            "custom_id": str(custom_id),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": MODEL_NAME,
+                "response_format": {"type": "json_object"},
+                "messages": [
+                    {"role": "system", "content": system_content},
+                    {"role": "user", "content": prompt},
+                ],
+            },
+        }))
+
+    payload = ("\n".join(lines) + "\n").encode("utf-8")
+    batch_file = raw_client.files.create(file=("clinical_data_batch.jsonl", payload), purpose="batch")
+    batch = raw_client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"   📦 Submitted Batch API job {batch.id} ({len(lines)} patient(s))")
+    return batch.id
+
+
+def _cancel_batch(raw_client, batch_id: str):
+    try:
+        raw_client.batches.cancel(batch_id)
+        print(f"   ⛔ Cancelled Batch API job {batch_id}")
+    except Exception as e:
+        print(f"   ⚠️  Could not cancel Batch API job {batch_id}: {e}")
+
+
+def collect_clinical_data_batch(
+    batch_id: str,
+    requests_by_id: Dict[str, Dict],
+    poll_interval: float = 30.0,
+    max_wait: Optional[float] = None,
+    cancel_check: callable = None,
+) -> Dict[str, tuple]:
+    """
+    Poll a Batch API job until it finishes and parse each line of its output.
+
+    The job is cancelled and an error raised when it is still running after
+    max_wait seconds (default BATCH_MAX_WAIT), when cancel_check() returns True,
+    or on Ctrl-C. Lines whose payload fails ClinicalDataPayload validation map
+    to None so the caller can regenerate those patients individually.
+
+    Returns:
+        {custom_id: (ClinicalDataPayload or None, usage_stats)}
+    """
+    raw_client = client.client
+    deadline = time.monotonic() + (BATCH_MAX_WAIT if max_wait is None else max_wait)
+    try:
+        while True:
+            batch = raw_client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+            if cancel_check and cancel_check():
+                _cancel_batch(raw_client, batch_id)
+                raise RuntimeError(f"Batch {batch_id} cancelled by request")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                _cancel_batch(raw_client, batch_id)
+                raise TimeoutError(f"Batch {batch_id} still '{batch.status}' after max_wait; gave up")
+            print(f"   ⏳ Batch {batch_id}: {batch.status}…")
+            time.sleep(min(poll_interval, remaining))
+    except KeyboardInterrupt:
+        _cancel_batch(raw_client, batch_id)
+        raise
+
+    results = {}
+    if not batch.output_file_id:
+        return results
+
+    output_text = raw_client.files.content(batch.output_file_id).text
+    for line in output_text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = record.get("custom_id")
+        gen_kwargs = requests_by_id.get(custom_id) or {}
+        body = (record.get("response") or {}).get("body") or {}
+        usage = body.get("usage") or {}
+        usage_stats = {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+        }
+        try:
+            content = body["choices"][0]["message"]["content"]
+            response_obj = _parse_payload_text(
+                content, models.ClinicalDataPayload, gen_kwargs.get("existing_persona")
+            )
+            response_obj = quality.ensure_persona_quality(
+                response_obj, gen_kwargs.get("case_details"), gen_kwargs.get("patient_state")
+            )
+            results[custom_id] = (response_obj, usage_stats)
+        except Exception as e:
+            print(f"   ⚠️  Batch result for {custom_id} could not be parsed: {e}")
+            results[custom_id] = (None, usage_stats)
+    return results
+
+
 def generate_clinical_image(context: str, image_type: str, output_path: str = None) -> str:
     """Generates a synthetic medical image based on clinical context using AI."""
+    # Nothing to render: skip the prompt and the paid image call
+    if not context or not image_type:
+        return None
+
     # Get prompt from centralized prompts module
     prompt = prompts.get_image_generation_prompt(context, image_type)
     
@@ -436,6 +785,9 @@ def fix_document_content(content: str, errors: List[str]) -> str:
     Returns:
         The repaired document string, or the original if repair fails.
     """
+    if not errors:
+        return content
+
     try:
         repair_system = "You are a document repair bot. Output only the fixed text, no explanations."
         prompt = prompts.get_document_repair_prompt(content, errors)
@@ -13,6 +13,10 @@ Edit these prompts carefully to modify AI behavior.
 """
 
 import datetime
+import functools
+import json
+import random
+import re
 
 # ============================================================================
 # SYSTEM PROMPT - Core AI Behavior
@@ -145,6 +149,8 @@ F. **GEOGRAPHIC CONSTRAINT (MANDATORY)**:
 # - Document Formatting: Critical for validation - do not change markers
 # - Persona Requirements: Add/remove required patient fields
 
+_RE_REJECTION_OUTCOME = re.compile(r"(reject|rejection|deny|denial|low\s+probability)", re.IGNORECASE)
+
 def _build_clinical_logic_instruction(case_details: dict) -> str:
     """
     Build the Clinical Logic Application instruction (prompt instruction #2).
@@ -154,9 +160,8 @@ def _build_clinical_logic_instruction(case_details: dict) -> str:
     and returns a sophisticated injection block designed to embed nuanced,
     cross-referential inconsistencies rather than obvious surface-level gaps.
     """
-    import re as _re
     outcome = str(case_details.get("outcome", "") or "")
-    if _re.search(r"(reject|rejection|deny|denial|low\s+probability)", outcome, _re.IGNORECASE):
+    if _RE_REJECTION_OUTCOME.search(outcome):
         return get_rejection_gap_instruction(case_details)
     return (
         "If Target is Approval or High Probability → ENSURE strong supporting evidence exists. "
@@ -166,7 +171,8 @@ def _build_clinical_logic_instruction(case_details: dict) -> str:
     )
 
 def get_clinical_data_prompt(case_details: dict, patient_state: dict, document_plan: dict, user_feedback: str = "",
-                             history_context: str = "", existing_persona: dict = None) -> str:
+                             history_context: str = "", existing_persona: dict = None,
+                             excluded_names: list = None) -> str:
     """
     Generates the main prompt for clinical data generation.
     
@@ -177,20 +183,21 @@ def get_clinical_data_prompt(case_details: dict, patient_state: dict, document_p
         user_feedback: Optional user corrections/instructions
         history_context: Previous interaction history
         existing_persona: Optional existing patient persona dictionary
+        excluded_names: Names already taken by other patients (new personas must avoid them)
     
     Returns:
         Complete prompt string
     """
     
-    import json
-    import random
     state_str = json.dumps(patient_state, indent=2)
     plan_str = json.dumps(document_plan, indent=2)
     feedback_instruction = get_feedback_instruction(user_feedback)
     
     # 1. Handle Random Character Universe (Only for new patients)
     diversity_instruction = ""
-    if not existing_persona:
+    if not existing_persona and excluded_names:
+        diversity_instruction = get_new_patient_constraint(random.choice(CHARACTER_UNIVERSES), excluded_names)
+    elif not existing_persona:
         universe = random.choice(CHARACTER_UNIVERSES)
         diversity_instruction = f"""
     **PERSONA DIVERSITY INSTRUCTION**:
@@ -498,9 +505,11 @@ def get_existing_patient_constraint(existing_persona: dict, case_details: dict)
     WHEN TO USE: Patient already exists, updating their records.
     EFFECT: Locks ALL persona fields including medications/allergies/vaccinations/therapies.
     """
+    get = existing_persona.get
+
     # Build locked medication list
     med_lock = ""
-    meds = existing_persona.get('medications', [])
+    meds = get('medications', [])
     if meds:
         med_lines = []
         for m in meds:
@@ -509,7 +518,7 @@ def get_existing_patient_constraint(existing_persona: dict, case_details: dict)
         med_lock = "\n    - Medications (LOCK EXACTLY):\n" + "\n".join(med_lines)
 
     allergy_lock = ""
-    allergies = existing_persona.get('allergies', [])
+    allergies = get('allergies', [])
     if allergies:
         a_lines = []
         for a in allergies:
@@ -518,7 +527,7 @@ def get_existing_patient_constraint(existing_persona: dict, case_details: dict)
         allergy_lock = "\n    - Allergies (LOCK EXACTLY):\n" + "\n".join(a_lines)
 
     vax_lock = ""
-    vaccinations = existing_persona.get('vaccinations', [])
+    vaccinations = get('vaccinations', [])
     if vaccinations:
         v_lines = []
         for v in vaccinations:
@@ -527,7 +536,7 @@ def get_existing_patient_constraint(existing_persona: dict, case_details: dict)
         vax_lock = "\n    - Vaccinations (LOCK EXACTLY):\n" + "\n".join(v_lines)
 
     therapy_lock = ""
-    therapies = existing_persona.get('therapies', [])
+    therapies = get('therapies', [])
     if therapies:
         t_lines = []
         for t in therapies:
@@ -536,7 +545,7 @@ def get_existing_patient_constraint(existing_persona: dict, case_details: dict)
         therapy_lock = "\n    - Therapies (LOCK EXACTLY):\n" + "\n".join(t_lines)
 
     encounter_lock = ""
-    encounters = existing_persona.get('encounters', [])
+    encounters = get('encounters', [])
     if encounters:
         e_lines = []
         for e in encounters:
@@ -545,7 +554,7 @@ def get_existing_patient_constraint(existing_persona: dict, case_details: dict)
         encounter_lock = "\n    - Encounters (REPRODUCE EXACTLY, APPEND NEW):\n" + "\n".join(e_lines)
 
     image_lock = ""
-    images = existing_persona.get('images', [])
+    images = get('images', [])
     if images:
         i_lines = []
         for i in images:
@@ -554,7 +563,7 @@ def get_existing_patient_constraint(existing_persona: dict, case_details: dict)
         image_lock = "\n    - Images (REPRODUCE EXACTLY, APPEND NEW):\n" + "\n".join(i_lines)
         
     report_lock = ""
-    reports = existing_persona.get('reports', [])
+    reports = get('reports', [])
     if reports:
         r_lines = []
         for r in reports:
@@ -563,7 +572,7 @@ def get_existing_patient_constraint(existing_persona: dict, case_details: dict)
         report_lock = "\n    - Reports (REPRODUCE EXACTLY, APPEND NEW):\n" + "\n".join(r_lines)
 
     procedure_lock = ""
-    procedures = existing_persona.get('procedures', [])
+    procedures = get('procedures', [])
     if procedures:
         p_lines = []
         for p in procedures:
@@ -572,20 +581,22 @@ def get_existing_patient_constraint(existing_persona: dict, case_details: dict)
         procedure_lock = "\n    - Procedures (REPRODUCE EXACTLY, APPEND NEW):\n" + "\n".join(p_lines)
 
     behavioral_lock = ""
-    b_notes = existing_persona.get('behavioral_notes', '')
+    b_notes = get('behavioral_notes', '')
     if b_notes:
         behavioral_lock = f"\n    - Behavioral Notes (LOCK EXACTLY): {b_notes}"
 
+    provider = get('provider') or {}
+
     return f"""
     **STRICT IDENTITY LOCK (EXISTING PATIENT) — CONSISTENCY ENFORCEMENT:**
     This patient already exists in the database. 
     You MUST reproduce the following core demographic and baseline clinical values verbatim:
-    - Name: {existing_persona.get('first_name')} {existing_persona.get('last_name')}
-    - DOB: {existing_persona.get('dob')}
-    - Gender: {existing_persona.get('gender')}
-    - Address: {existing_persona.get('address')}
-    - Telecom: {existing_persona.get('telecom')}
-    - Provider: {(existing_persona.get('provider') or dict()).get('generalPractitioner')} ({(existing_persona.get('provider') or dict()).get('managingOrganization')}) [NPI: {(existing_persona.get('provider') or dict()).get('formatted_npi')}]{med_lock}{allergy_lock}{vax_lock}{therapy_lock}{encounter_lock}{image_lock}{report_lock}{procedure_lock}{behavioral_lock}
+    - Name: {get('first_name')} {get('last_name')}
+    - DOB: {get('dob')}
+    - Gender: {get('gender')}
+    - Address: {get('address')}
+    - Telecom: {get('telecom')}
+    - Provider: {provider.get('generalPractitioner')} ({provider.get('managingOrganization')}) [NPI: {provider.get('formatted_npi')}]{med_lock}{allergy_lock}{vax_lock}{therapy_lock}{encounter_lock}{image_lock}{report_lock}{procedure_lock}{behavioral_lock}
     
     *Exception*: You MUST generate NEW encounters, vital signs, and adjust the bio narrative to logically support any new requested reports or user feedback.
     - Bio Narrative Strategy: Keep the *style* of the existing bio but update the clinical narrative to match the CURRENT procedure ({case_details['procedure']}) and any newly generated reports.
@@ -626,6 +637,7 @@ def get_new_patient_constraint(selected_universe: str, excluded_names: list = No
 # USER FEEDBACK FORMATTING
 # ============================================================================
 
+@functools.lru_cache(maxsize=256)
 def get_feedback_instruction(user_feedback: str) -> str:
     """
     Formats user feedback for inclusion in prompts.
@@ -662,6 +674,7 @@ def get_feedback_instruction(user_feedback: str) -> str:
 # - Restrict unwanted elements (faces, text, watermarks)
 # - Request high contrast for clinical clarity
 
+@functools.lru_cache(maxsize=256)
 def get_image_generation_prompt(context: str, image_type: str) -> str:
     """
     Generates prompt for medical image synthesis.
@@ -698,6 +711,18 @@ OUTPUT: Just the raw, high-fidelity scan image on a deep black background, mimic
 # 
 # PURPOSE: Fixes formatting issues automatically without regenerating entire document.
 # COMMON FIXES: Missing metadata blocks, incorrect markers, forbidden formatting
+# The fixed instructions come first and the per-document errors/content last,
+# so every repair call shares the same prompt prefix (provider prefix caching).
+
+DOCUMENT_REPAIR_INSTRUCTIONS = """Fix the Clinical Document content below to resolve the specific validation errors listed.
+
+REPAIR INSTRUCTIONS:
+1. Fix ONLY the listed errors
+2. Maintain all clinical content
+3. Do not add markdown code blocks
+4. Return ONLY the corrected content string
+5. Preserve the document structure and formatting
+"""
 
 def get_document_repair_prompt(content: str, errors: list) -> str:
     """
@@ -710,25 +735,22 @@ def get_document_repair_prompt(content: str, errors: list) -> str:
     WHEN THIS RUNS: After doc_validator.py detects issues
     
     Returns:
-        Repair instruction prompt
+        Repair instruction prompt (DOCUMENT_REPAIR_INSTRUCTIONS + errors + content)
     """
-    errors_str = "\n".join([f"- {err}" for err in errors])
-    
-    return f"""Fix the following Clinical Document content to resolve these specific validation errors:
+    # Retries often resend the same content/errors pair; cache on a hashable key
+    return _document_repair_prompt(content, tuple(str(err) for err in errors))
 
+@functools.lru_cache(maxsize=32)
+def _document_repair_prompt(content: str, errors: tuple) -> str:
+    errors_str = "- " + "\n- ".join(errors) if errors else ""
+    
+    return f"""{DOCUMENT_REPAIR_INSTRUCTIONS}
 ERRORS TO FIX:
 {errors_str}
 
 ORIGINAL CONTENT:
 {content}
 
-REPAIR INSTRUCTIONS:
-1. Fix ONLY the listed errors
-2. Maintain all clinical content
-3. Do not add markdown code blocks
-4. Return ONLY the corrected content string
-5. Preserve the document structure and formatting
-
 RETURN ONLY THE FIXED CONTENT (no explanations, no code blocks)."""
 
 # ============================================================================
@@ -1154,14 +1176,12 @@ def _select_gap_archetypes(n: int = 3) -> list[dict]:
       - No two archetypes share the same 'id'
       - Total n is randomized between 2 and 4 unless explicitly overridden
     """
-    import random as _random
-
     pool = GAP_ARCHETYPE_POOL
-    n = _random.randint(2, 4)
+    n = random.randint(2, 4)
 
     # Must-have: one high-impact archetype from TE or PC dimensions
     high_impact = [a for a in pool if a["dimension"] in ("Treatment-Escalation", "Policy-Criteria")]
-    must_have = _random.choice(high_impact)
+    must_have = random.choice(high_impact)
 
     remaining_pool = [a for a in pool if a["id"] != must_have["id"]]
     fill_count = n - 1
@@ -1169,12 +1189,12 @@ def _select_gap_archetypes(n: int = 3) -> list[dict]:
     # Try to get at least one from a different dimension than must_have
     diff_dim = [a for a in remaining_pool if a["dimension"] != must_have["dimension"]]
     if len(diff_dim) >= fill_count:
-        fill = _random.sample(diff_dim, fill_count)
+        fill = random.sample(diff_dim, fill_count)
     else:
-        fill = _random.sample(remaining_pool, fill_count)
+        fill = random.sample(remaining_pool, fill_count)
 
     selected = [must_have] + fill
-    _random.shuffle(selected)
+    random.shuffle(selected)
     return selected
 
 def get_rejection_gap_instruction(case_details: dict) -> str:
@@ -1252,13 +1272,14 @@ Outcome: A documentation set that appears credible to a surface-level review but
 # ============================================================================
 # List of fictional universes to source patient names from.
 # 
-# TO ADD MORE UNIVERSES: Simply append to this list (comma-separated).
+# TO ADD MORE UNIVERSES: Simply add to this tuple (comma-separated).
 # EXAMPLES: "The Wire", "Stranger Things", "Avatar: The Last Airbender"
+# Read-only at runtime (random.choice in get_clinical_data_prompt), hence a tuple.
 
-CHARACTER_UNIVERSES = [
+CHARACTER_UNIVERSES = (
     "Seinfeld", "The Office", "Parks and Rec", "Star Wars", "Marvel", 
     "Harry Potter", "Friends", "Lord of the Rings", "Breaking Bad", 
     "Game of Thrones", "Succession", "The Sopranos", "Grey's Anatomy", 
     "House MD", "Scrubs", "2 Broke Girls", "The Big Bang Theory", 
     "Brooklyn 99", "Superstore"
-]
+)
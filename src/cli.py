@@ -1,7 +1,17 @@
-from . import workflow
-from .data import loader as data_loader
-from .core import patient_db
-from .ai import client as ai_engine
+import argparse
+import asyncio
+import json
+import os
+
+from .utils import io_backend
+from .utils.lazy_import import lazy_module
+from .core.config import OUTPUT_DIR
+
+# Heavy modules (AI SDKs, pandas, reportlab) load on first use so --help stays fast
+workflow = lazy_module(f"{__package__}.workflow")
+data_loader = lazy_module(f"{__package__}.data.loader")
+patient_db = lazy_module(f"{__package__}.core.patient_db")
+ai_engine = lazy_module(f"{__package__}.ai.client")
 
 _MODE_MAP = {
     "1": {"persona": True,  "reports": True,  "summary": True},
@@ -21,6 +31,152 @@ _MODE_LABELS = {
 }
 
 
+# Max patients in flight during '*' batch runs (AI round-trips dominate wall time)
+BATCH_CONCURRENCY = max(1, int(os.getenv("PDG_BATCH_CONCURRENCY", "4") or "4"))
+# Route '*' runs through the provider Batch API (OpenAI only; up to 24h turnaround)
+USE_BATCH_API = os.getenv("PDG_USE_BATCH_API", "false").lower() == "true"
+# Patients packed into one clinical-data request during '*' runs (1 = one call per patient)
+MULTI_PATIENT_GROUP = max(1, int(os.getenv("PDG_MULTI_PATIENT_GROUP", "1") or "1"))
+
+
+async def _run_batch(
+    patient_ids: list,
+    feedback: str,
+    current_names: list,
+    generation_mode: dict,
+    cases: dict,
+    concurrency: int | None = None,
+    on_done=None,
+) -> int:
+    """
+    Run process_patient_workflow for every ID with at most `concurrency`
+    (default BATCH_CONCURRENCY) patients in flight. Each new persona's name is
+    reserved in current_names by the workflow before it is saved, so concurrent
+    patients see each other's names; on_done(p_id) is called for each success.
+    """
+    sem = asyncio.Semaphore(concurrency or BATCH_CONCURRENCY)
+
+    async def _run_one(p_id):
+        async with sem:
+            print(f"\n▶️  Processing {p_id}…")
+            try:
+                return p_id, await asyncio.to_thread(
+                    workflow.process_patient_workflow,
+                    p_id,
+                    feedback=feedback,
+                    excluded_names=current_names,
+                    generation_mode=generation_mode,
+                    case_data=cases.get(p_id),
+                )
+            except Exception as e:
+                print(f"   ❌ Patient {p_id} failed: {e}")
+                return p_id, None
+
+    processed = 0
+    for fut in asyncio.as_completed([asyncio.create_task(_run_one(p_id)) for p_id in patient_ids]):
+        p_id, new_name = await fut
+        if new_name and on_done:
+            on_done(p_id)
+        processed += 1
+    return processed
+
+
+# ─── HEADLESS WORKLIST MODE ──────────────────────────────────────────────────
+
+PROGRESS_PATH = os.path.join(OUTPUT_DIR, "state", "progress.json")
+
+
+def _load_progress(worklist_path: str) -> set:
+    """Patient IDs already completed for this worklist in an earlier (interrupted) run."""
+    try:
+        with open(PROGRESS_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError, ValueError):
+        return set()
+    if data.get("worklist") != os.path.abspath(worklist_path):
+        return set()
+    return set(data.get("completed", []))
+
+
+def _save_progress(worklist_path: str, completed: set):
+    """Atomically persist the completed IDs so a restarted run resumes after them."""
+    os.makedirs(os.path.dirname(PROGRESS_PATH), exist_ok=True)
+    tmp_path = f"{PROGRESS_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"worklist": os.path.abspath(worklist_path), "completed": sorted(completed)}, f, indent=2)
+    os.replace(tmp_path, PROGRESS_PATH)
+
+
+def _read_worklist(path: str) -> list:
+    """One patient ID per line; blank lines and '#' comments are ignored."""
+    with open(path, "r", encoding="utf-8") as f:
+        ids = [line.split("#", 1)[0].strip() for line in f]
+    return list(dict.fromkeys(pid for pid in ids if pid))
+
+
+def run_worklist(worklist_path: str, generation_mode: dict, concurrency: int | None = None,
+                 use_batch_api: bool = False, feedback: str = "") -> int:
+    """
+    Non-interactive batch: process every ID in the worklist file that is not
+    already complete, recording progress in PROGRESS_PATH after each success.
+    Returns the number of patients processed.
+    """
+    worklist_ids = _read_worklist(worklist_path)
+    completed = _load_progress(worklist_path)
+    cases = data_loader.load_all_patient_cases()
+    current_names = patient_db.get_all_patient_names()
+
+    pending_ids = []
+    for p_id in worklist_ids:
+        if p_id in completed:
+            print(f"   ⏭️  Skipping {p_id} (completed in a previous run)")
+            continue
+        if workflow.check_patient_sync_status(p_id, generation_mode):
+            print(f"   ⏭️  Skipping {p_id} (already complete)")
+            continue
+        pending_ids.append(p_id)
+
+    print(f"\n📄 Worklist {worklist_path}: {len(pending_ids)} of {len(worklist_ids)} patient(s) pending.")
+    if not pending_ids:
+        return 0
+
+    def _mark_done(p_id):
+        completed.add(p_id)
+        _save_progress(worklist_path, completed)
+
+    if use_batch_api and ai_engine.PROVIDER == "openai":
+        workflow.process_patients_via_batch_api(
+            pending_ids, feedback, generation_mode, cases, excluded_names=current_names
+        )
+        done = 0
+        for p_id in pending_ids:
+            if workflow.check_patient_sync_status(p_id, generation_mode):
+                _mark_done(p_id)
+                done += 1
+        return done
+
+    return asyncio.run(
+        _run_batch(pending_ids, feedback, current_names, generation_mode, cases,
+                   concurrency=concurrency, on_done=_mark_done)
+    )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Clinical Data Generator CLI.")
+    parser.add_argument("--worklist", metavar="PATH",
+                        help="File with one patient ID per line; runs headless instead of the REPL.")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help=f"Patients in flight for --worklist runs (default {BATCH_CONCURRENCY}).")
+    parser.add_argument("--batch-api", action="store_true",
+                        help="Submit --worklist generation through the OpenAI Batch API.")
+    parser.add_argument("--mode", choices=sorted(k for k in _MODE_MAP if k), default="1",
+                        help="What to generate for --worklist runs (same menu as the REPL; default 1).")
+    parser.add_argument("--feedback", default="", help="Feedback applied to every --worklist patient.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the AI, even when PDG_AI_CACHE=true enables the response cache.")
+    return parser.parse_args(argv)
+
+
 def _prompt_generation_mode() -> dict:
     """Ask the user which document types to generate and return a mode dict."""
     print("\n📋 What to generate?")
@@ -31,13 +187,36 @@ def _prompt_generation_mode() -> dict:
     return _MODE_MAP.get(choice, _MODE_MAP[""])
 
 
-def main():
+def main(argv=None):
+    args = _parse_args(argv)
     print("\n🚀 Clinical Data Generator — Modular & Interactive")
 
+    if args.no_cache:
+        ai_engine.AI_CACHE_ENABLED = False
+
+    if io_backend.IO_BACKEND == "threads":
+        if io_backend.threaded_writes_supported():
+            print(f"   💽 PDG_IO=threads: PDF writes run on {io_backend.IO_QUEUE_DEPTH} background threads.")
+        else:
+            print("   ⚠️  PDG_IO=threads requested but os.pwrite is unavailable here; using synchronous writes.")
+
     if not ai_engine.check_connection():
         print("\n❌ AI connection failed. Check credentials/internet.")
         return
 
+    if args.worklist:
+        if "LOG_LEVEL" not in os.environ:
+            workflow.set_doc_detail_logs(False)
+        processed = run_worklist(
+            args.worklist,
+            dict(_MODE_MAP[args.mode]),
+            concurrency=max(1, args.concurrency) if args.concurrency else None,
+            use_batch_api=args.batch_api or USE_BATCH_API,
+            feedback=args.feedback,
+        )
+        print(f"\n✅ Worklist complete. Processed {processed} patient(s).")
+        return
+
     while True:
         print("\n" + "=" * 60)
         print("🎯 Enter Patient ID  (or 	'*' for batch, 'q' to quit)")
@@ -64,25 +243,45 @@ def main():
         # ── BATCH: ALL PATIENTS ────────────────────────────────────────────────
         if base_input == "*":
             print("\n🔄 Batch mode: all patients…")
-            all_ids       = data_loader.get_all_patient_ids()
+            cases         = data_loader.load_all_patient_cases()
+            all_ids       = list(cases)
             generation_mode = _prompt_generation_mode()
             current_names = patient_db.get_all_patient_names()
-            processed = 0
 
+            pending_ids = []
             for p_id in all_ids:
                 if workflow.check_patient_sync_status(p_id, generation_mode):
                     print(f"   ⏭️  Skipping {p_id} (already complete)")
                     continue
-                print(f"\n▶️  Processing {p_id}…")
-                new_name = workflow.process_patient_workflow(
-                    p_id,
-                    feedback=feedback,
-                    excluded_names=current_names,
-                    generation_mode=generation_mode,
-                )
-                if new_name:
-                    current_names.append(new_name)
-                processed += 1
+                pending_ids.append(p_id)
+
+            # Concurrent patients interleave their output; keep per-document lines
+            # off unless LOG_LEVEL was set explicitly.
+            quiet_docs = "LOG_LEVEL" not in os.environ
+            if quiet_docs:
+                previous_detail = workflow.set_doc_detail_logs(False)
+
+            try:
+                if USE_BATCH_API and ai_engine.PROVIDER == "openai":
+                    print(f"   📦 Submitting {len(pending_ids)} patient(s) via Batch API…")
+                    # Names are reserved in current_names by the workflow as each patient finalizes
+                    processed = len(workflow.process_patients_via_batch_api(
+                        pending_ids, feedback, generation_mode, cases, excluded_names=current_names
+                    ))
+                elif MULTI_PATIENT_GROUP > 1 and ai_engine.PROVIDER == "openai":
+                    print(f"   🧺 Running {len(pending_ids)} patient(s), {MULTI_PATIENT_GROUP} per request…")
+                    processed = len(workflow.process_patients_grouped(
+                        pending_ids, feedback, generation_mode, cases,
+                        group_size=MULTI_PATIENT_GROUP, excluded_names=current_names,
+                    ))
+                else:
+                    print(f"   ⚙️  Running {len(pending_ids)} patient(s), up to {BATCH_CONCURRENCY} at a time…")
+                    processed = asyncio.run(
+                        _run_batch(pending_ids, feedback, current_names, generation_mode, cases)
+                    )
+            finally:
+                if quiet_docs:
+                    workflow.set_doc_detail_logs(previous_detail)
 
             print(f"\n✅ Batch complete. Processed {processed} patient(s).")
             continue
@@ -95,14 +294,12 @@ def main():
 
             for idx, p_id in enumerate(patient_ids, 1):
                 print(f"\n▶️  [{idx}/{len(patient_ids)}] Patient {p_id}…")
-                new_name = workflow.process_patient_workflow(
+                workflow.process_patient_workflow(
                     p_id,
                     feedback,
                     excluded_names=current_names,
                     generation_mode=generation_mode,
                 )
-                if new_name:
-                    current_names.append(new_name)
 
             print(f"\n✅ Batch complete. {len(patient_ids)} patient(s) processed.")
             continue
@@ -115,13 +312,18 @@ def main():
             print("\n💡 Feedback / Instructions (optional — press Enter to skip)")
             feedback = input("   > ").strip()
 
-        current_names = patient_db.get_all_patient_names()
+        current_names, existing_patient = patient_db.snapshot(p_id)
         workflow.process_patient_workflow(
             p_id,
             feedback,
             excluded_names=current_names,
             generation_mode=generation_mode,
+            existing_patient=existing_patient,
         )
 
         if workflow.check_patient_sync_status(p_id, generation_mode):
             print("   ✅ Verification: documents present in output directories.")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ OUTPUT_DIR = os.getenv("OUTPUT_DIR") or os.path.join(_project_root, "generated_o
 PATIENT_DATA_DIR = os.path.join(OUTPUT_DIR, "patient-data")
 SUMMARY_DIR = os.path.join(OUTPUT_DIR, "summary")
 DEBUG_DIR = os.path.join(OUTPUT_DIR, "debug")
+MAX_SUPPORTING_DOCUMENTS = 5
 
 
 def ensure_output_dirs():
@@ -128,5 +129,3 @@ __all__ = [
     "get_patient_debug_folder",
     "MAX_SUPPORTING_DOCUMENTS",
 ]
-
-MAX_SUPPORTING_DOCUMENTS = 5
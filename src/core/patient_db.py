@@ -1,11 +1,20 @@
+import copy
 import json
 import os
+import threading
 from typing import Optional, Dict
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "patients_db.json")
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 LEGACY_DB_PATH = os.path.join(PROJECT_ROOT, "core", "patients_db.json")
 
+# Serialises read-modify-write cycles when patients are processed concurrently
+_DB_LOCK = threading.RLock()
+
+# Parsed DB plus its name list, keyed by the file's st_mtime_ns. Other writers
+# (e.g. purge_manager) edit the JSON directly, so the mtime is the source of truth.
+_DB_CACHE = {"mtime_ns": None, "data": {}, "names": []}
+
 
 def _migrate_legacy_db() -> bool:
     """Migrate legacy patient DB from project_root/core into src/core if present."""
@@ -45,54 +54,97 @@ def _init_db():
         with open(DB_PATH, "w", encoding="utf-8") as f:
             json.dump({}, f)
 
+def _names_from(data: Dict) -> list[str]:
+    names = []
+    for pid, p_data in data.items():
+        fname = p_data.get('first_name', '')
+        lname = p_data.get('last_name', '')
+        if fname and lname:
+            names.append(f"{fname} {lname}")
+    return names
+
+
+def _store_cache(data: Dict):
+    """Remember data as the current DB contents (caller holds _DB_LOCK)."""
+    _DB_CACHE["mtime_ns"] = os.stat(DB_PATH).st_mtime_ns
+    _DB_CACHE["data"] = data
+    _DB_CACHE["names"] = _names_from(data)
+
+
+def _read_db() -> Dict:
+    """
+    Returns the parsed DB, re-reading the file only when its mtime changed.
+    Caller must hold _DB_LOCK and must not mutate the result.
+    """
+    _init_db()
+    if _DB_CACHE["mtime_ns"] == os.stat(DB_PATH).st_mtime_ns:
+        return _DB_CACHE["data"]
+    with open(DB_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    _store_cache(data)
+    return data
+
+
 def load_patient(patient_id: str) -> Optional[Dict]:
     """
     Loads patient data (name, db, gender, persona) from the central JSON DB.
     Returns None if not found.
     """
-    _init_db()
-    try:
-        with open(DB_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, ValueError):
-        # Handle corrupted or empty JSON file
-        print(f"   ⚠️  Warning: patients_db.json was corrupted. Reinitializing...")
-        with open(DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump({}, f)
-        data = {}
+    with _DB_LOCK:
+        try:
+            data = _read_db()
+        except (json.JSONDecodeError, ValueError):
+            # Handle corrupted or empty JSON file
+            print(f"   ⚠️  Warning: patients_db.json was corrupted. Reinitializing...")
+            with open(DB_PATH, 'w', encoding='utf-8') as f:
+                json.dump({}, f)
+            data = {}
+            _store_cache(data)
     
-    # Handle both string/int keys
-    key = str(patient_id)
-    return data.get(key)
+        # Handle both string/int keys
+        key = str(patient_id)
+        record = data.get(key)
+        return copy.deepcopy(record) if record is not None else None
 
 def save_patient(patient_id: str, patient_data: Dict):
     """
     Saves or updates patient data in the central JSON DB.
     patient_data should include: name, dob, gender, persona_content, etc.
     """
-    _init_db()
-    
-    # Read strict
-    try:
-        with open(DB_PATH, 'r', encoding='utf-8') as f:
-            current_db = json.load(f)
-    except (json.JSONDecodeError, ValueError):
-        # Handle corrupted or empty JSON file
-        current_db = {}
-    
-    # Update
-    key = str(patient_id)
-    if key not in current_db:
-        current_db[key] = {}
-    
-    current_db[key].update(patient_data)
-    
-    # Write back
-    with open(DB_PATH, 'w', encoding='utf-8') as f:
-        json.dump(current_db, f, indent=2)
+    with _DB_LOCK:
+        _init_db()
+        
+        # Read strict
+        try:
+            current_db = dict(_read_db())
+        except (json.JSONDecodeError, ValueError):
+            # Handle corrupted or empty JSON file
+            current_db = {}
+        
+        # Update (copy the record so the cached dict is never mutated in place)
+        key = str(patient_id)
+        current_db[key] = {**current_db.get(key, {}), **patient_data}
+        
+        # Write back
+        with open(DB_PATH, 'w', encoding='utf-8') as f:
+            json.dump(current_db, f, indent=2)
+        _store_cache(current_db)
     
     print(f"      💾 Patient {patient_id} ({patient_data.get('name', 'Unknown')}) saved to Core DB.")
 
+def snapshot(patient_id: str) -> tuple[list[str], Optional[Dict]]:
+    """
+    Returns (all 'First Last' names, this patient's record or None) from a
+    single consistent read of the DB — the REPL needs both for every run.
+    """
+    with _DB_LOCK:
+        try:
+            data = _read_db()
+        except (json.JSONDecodeError, ValueError):
+            return [], None
+        record = data.get(str(patient_id))
+        return list(_DB_CACHE["names"]), (copy.deepcopy(record) if record is not None else None)
+
 def get_patient_name(patient_id: str) -> Optional[str]:
     """Loads a patient and returns their full name."""
     p = load_patient(patient_id)
@@ -105,17 +157,9 @@ def get_all_patient_names() -> list[str]:
     Returns a list of all 'First Last' names currently in the DB.
     Used to prevent duplicate personas.
     """
-    _init_db()
     try:
-        with open(DB_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        names = []
-        for pid, p_data in data.items():
-            fname = p_data.get('first_name', '')
-            lname = p_data.get('last_name', '')
-            if fname and lname:
-                names.append(f"{fname} {lname}")
-        return names
+        with _DB_LOCK:
+            _read_db()
+            return list(_DB_CACHE["names"])
     except Exception:
         return []
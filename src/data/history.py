@@ -10,11 +10,11 @@ def get_history(patient_id: str) -> str:
     """
     log_dir = get_patient_logs_folder(patient_id)
     log_path = os.path.join(log_dir, f"{patient_id}.txt")
-    if os.path.exists(log_path):
+    try:
         with open(log_path, 'r', encoding='utf-8') as f:
             return f.read()
-
-    return ""
+    except FileNotFoundError:
+        return ""
 
 def append_history(patient_id: str, feedback: str, changes_summary: str):
     """
@@ -22,16 +22,18 @@ def append_history(patient_id: str, feedback: str, changes_summary: str):
     FORMAT: [MM-DD-YYYY HH:MM] Feedback: <text> | Changes: <text>
     """
     log_dir = get_patient_logs_folder(patient_id)
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-
     log_path = os.path.join(log_dir, f"{patient_id}.txt")
     timestamp = datetime.now().strftime("%m-%d-%Y %H:%M:%S")
     
-    entry = f"\n--------------------------------------------------\n"
-    entry += f"RUN TIMESTAMP: {timestamp}\n"
-    entry += f"USER FEEDBACK: {feedback if feedback else 'None'}\n"
-    entry += f"AI CHANGES: {changes_summary}\n"
+    entry = (
+        f"\n--------------------------------------------------\n"
+        f"RUN TIMESTAMP: {timestamp}\n"
+        f"USER FEEDBACK: {feedback if feedback else 'None'}\n"
+        f"AI CHANGES: {changes_summary}\n"
+    )
     
+    # Open per entry: a kept-open handle would outlive purge/archive of the logs folder
+    # (and block them on Windows).
+    os.makedirs(log_dir, exist_ok=True)
     with open(log_path, 'a', encoding='utf-8') as f:
         f.write(entry)
@@ -2,6 +2,7 @@ import os
 import re
 import json
 import datetime
+import functools
 import pandas as pd
 
 # Use absolute paths relative to project root for resource files
@@ -120,55 +121,79 @@ def _normalize_id(raw_val) -> str:
     except:
         return str(raw_val).strip()
 
+def _row_to_case(p_id: str, row) -> dict:
+    """Helper: Builds the case details dict for a matched plan row."""
+    procedure = str(row.get('Procedure', '')) or str(row.get('Code', 'Unknown'))
+    if not procedure.strip(): procedure = "Unknown"
+    cpt_code = _extract_cpt_code(row.get('CPT Code', ''), procedure, row.get('Test Case Details', ''))
+    department = _normalize_text(row.get('Department', ''))
+    test_case_number = _normalize_text(row.get('Test Case #', ''))
+    expected_outcome = _normalize_text(row.get('Expected Result', 'Unknown'))
+    details = _normalize_text(row.get('Test Case Details', 'No details provided'))
+
+    return {
+        "id": p_id,
+        "test_case_number": test_case_number,
+        "department": department,
+        "procedure": procedure,
+        "cpt_code": cpt_code,
+        "outcome": expected_outcome,
+        "details": details,
+    }
+
+def _sort_key(x):
+    try: return int(x)
+    except: return float('inf')
+
+
+@functools.lru_cache(maxsize=1)
+def _load_plan(mtime: float) -> dict:
+    """
+    Parses every sheet of the Excel plan once into {patient_id: case_details}.
+    Keyed by the file's mtime so the cache drops itself when the plan is edited.
+    The first matching row wins; IDs are sorted numerically.
+    """
+    cases = {}
+    xl = pd.ExcelFile(INPUT_EXCEL)
+    for sheet in xl.sheet_names:
+        df = pd.read_excel(xl, sheet_name=sheet)
+        df.columns = df.columns.astype(str).str.strip()
+
+        # Forward-fill specifically for merged columns (Test Case #, Procedure, Code, Details)
+        cols_to_ffill = ['Test Case #', 'Department', 'CPT Code', 'Procedure', 'Code', 'Test Case Details']
+        existing_cols = [c for c in cols_to_ffill if c in df.columns]
+        if existing_cols:
+            df[existing_cols] = df[existing_cols].ffill()
+
+        id_col = _get_patient_id_column(df)
+        if id_col not in df.columns:
+            continue
+
+        for _, row in df.iterrows():
+            p_id = _normalize_id(row.get(id_col, ''))
+            if not p_id or str(p_id).lower() in ['nan', 'none', ''] or p_id in cases:
+                continue
+            cases[p_id] = _row_to_case(p_id, row)
+
+    return {p_id: cases[p_id] for p_id in sorted(cases, key=_sort_key)}
+
+
+def _plan() -> dict:
+    """Returns the cached plan mapping, re-parsing only if the Excel file changed."""
+    return _load_plan(os.path.getmtime(INPUT_EXCEL))
+
+
 def load_patient_case(target_id: str):
     """
-    Scans the Excel file (all sheets) for the specific Patient ID.
+    Looks up the specific Patient ID in the (cached) Excel plan.
     Returns a dictionary of case details or None if not found.
     """
     if not os.path.exists(INPUT_EXCEL):
         raise FileNotFoundError(f"Excel file {INPUT_EXCEL} not found.")
 
     try:
-        xl = pd.ExcelFile(INPUT_EXCEL)
-        for sheet in xl.sheet_names:
-            df = pd.read_excel(INPUT_EXCEL, sheet_name=sheet)
-            df.columns = df.columns.astype(str).str.strip()
-            
-            # Forward-fill specifically for merged columns (Test Case #, Procedure, Code, Details)
-            cols_to_ffill = ['Test Case #', 'Department', 'CPT Code', 'Procedure', 'Code', 'Test Case Details']
-            existing_cols = [c for c in cols_to_ffill if c in df.columns]
-            if existing_cols:
-                df[existing_cols] = df[existing_cols].ffill()
-            
-            id_col = _get_patient_id_column(df)
-            if id_col not in df.columns:
-                continue
-            
-            # Iterate
-            for _, row in df.iterrows():
-                p_id = _normalize_id(row.get(id_col, ''))
-                
-                if p_id == str(target_id):
-                    # Found Match
-                    procedure = str(row.get('Procedure', '')) or str(row.get('Code', 'Unknown'))
-                    if not procedure.strip(): procedure = "Unknown"
-                    cpt_code = _extract_cpt_code(row.get('CPT Code', ''), procedure, row.get('Test Case Details', ''))
-                    department = _normalize_text(row.get('Department', ''))
-                    test_case_number = _normalize_text(row.get('Test Case #', ''))
-                    expected_outcome = _normalize_text(row.get('Expected Result', 'Unknown'))
-                    details = _normalize_text(row.get('Test Case Details', 'No details provided'))
-
-                    return {
-                        "id": p_id,
-                        "test_case_number": test_case_number,
-                        "department": department,
-                        "procedure": procedure,
-                        "cpt_code": cpt_code,
-                        "outcome": expected_outcome,
-                        "details": details,
-                    }
-        return None
-
+        case = _plan().get(str(target_id))
+        return dict(case) if case else None
     except Exception as e:
         print(f"Error reading Excel: {e}")
         return None
@@ -181,39 +206,29 @@ def get_case_details(patient_id: str) -> dict | None:
 
 def get_all_patient_ids() -> list:
     """
-    Scans the Excel file and returns a sorted list of ALL valid patient IDs found.
+    Returns a sorted list of ALL valid patient IDs found in the Excel plan.
     """
-    found_ids = set()
     if not os.path.exists(INPUT_EXCEL):
         return []
 
     try:
-        xl = pd.ExcelFile(INPUT_EXCEL)
-        for sheet in xl.sheet_names:
-            df = pd.read_excel(INPUT_EXCEL, sheet_name=sheet)
-            df.columns = df.columns.astype(str).str.strip()
-            
-            # Forward-fill specifically for merged columns
-            cols_to_ffill = ['Test Case #', 'Department', 'CPT Code', 'Procedure', 'Code', 'Test Case Details']
-            existing_cols = [c for c in cols_to_ffill if c in df.columns]
-            if existing_cols:
-                df[existing_cols] = df[existing_cols].ffill()
-            
-            id_col = _get_patient_id_column(df)
-            if id_col not in df.columns:
-                continue
-            
-            for _, row in df.iterrows():
-                # Check for valid ID
-                p_id = _normalize_id(row.get(id_col, ''))
-                if p_id and str(p_id).lower() not in ['nan', 'none', '']:
-                    found_ids.add(p_id)
-                    
-        def sort_key(x):
-            try: return int(x)
-            except: return float('inf')
-            
-        return sorted(list(found_ids), key=sort_key)
+        return list(_plan())
     except Exception as e:
         print(f"Error scanning IDs: {e}")
         return []
+
+
+def load_all_patient_cases() -> dict:
+    """
+    Returns {patient_id: case_details} for every valid patient ID, ordered
+    like get_all_patient_ids(). The first matching row wins, mirroring
+    load_patient_case().
+    """
+    if not os.path.exists(INPUT_EXCEL):
+        return {}
+
+    try:
+        return {p_id: dict(case) for p_id, case in _plan().items()}
+    except Exception as e:
+        print(f"Error loading cases: {e}")
+        return {}
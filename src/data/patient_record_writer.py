@@ -28,12 +28,17 @@ from datetime import datetime
 from ..core.config import get_patient_records_folder
 
 
+# Separator rules are fixed strings; build them once instead of per section.
+_HR_RULE = "=" * 70 + "\n"
+_SECTION_RULE = "─" * 70
+
+
 def _hr(width: int = 70) -> str:
-    return "=" * width + "\n"
+    return _HR_RULE if width == 70 else "=" * width + "\n"
 
 
 def _section(title: str) -> str:
-    return f"\n{'─' * 70}\n  {title.upper()}\n{'─' * 70}\n"
+    return f"\n{_SECTION_RULE}\n  {title.upper()}\n{_SECTION_RULE}\n"
 
 
 def _val(label: str, value, indent: int = 2) -> str:
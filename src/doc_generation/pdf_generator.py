@@ -1,4 +1,8 @@
+import atexit
+import io
 import re
+import functools
+import threading
 import html
 import os
 import json
@@ -9,6 +13,15 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 
+from ..utils import io_backend, file_utils
+
+# The markdown patterns below use the third-party `regex` engine when it is
+# installed (faster on lazy `.*?` alternations); the syntax is plain `re`.
+try:
+    import regex as _md_re
+except ImportError:
+    _md_re = re
+
 _REPORT_META_SKIP_KEYS = {
     "sections",
     "title",
@@ -23,6 +36,213 @@ _REPORT_META_SKIP_KEYS = {
     "title_hint",
 }
 
+# Report palette
+_COL_DARK_BLUE = colors.HexColor("#34495e")
+_COL_NAVY = colors.HexColor("#2c3e50")
+_COL_RED = colors.HexColor("#e74c3c")
+_COL_LIGHT_GRAY = colors.HexColor("#ecf0f1")
+_COL_AMBER = colors.HexColor("#f39c12")
+_COL_GREEN = colors.HexColor("#27ae60")
+_COL_LIGHT_BLUE = colors.HexColor("#f0f7fb")
+_COL_ORANGE = colors.HexColor("#e67e22")
+_COL_BORDER_GRAY = colors.HexColor("#bdc3c7")
+_COL_PALE_BLUE = colors.HexColor("#e8f4f8")
+_COL_BLUE = colors.HexColor("#3498db")
+_COL_PALE_YELLOW = colors.HexColor("#fff3cd")
+_COL_TABLE_HEADER = colors.HexColor("#f2f2f2")
+_COL_PALE_GREEN = colors.HexColor("#e8f5e9")
+
+
+# ReportLab style objects are immutable once built, so the sample sheet and
+# each builder's derived styles are created once per process and reused.
+@functools.lru_cache(maxsize=1)
+def _sample_styles():
+    return getSampleStyleSheet()
+
+
+@functools.lru_cache(maxsize=1)
+def _patient_pdf_styles():
+    styles = _sample_styles()
+    col_dark_blue = _COL_DARK_BLUE
+    col_gray = colors.gray
+    style_tit = ParagraphStyle('cpdf_MainTitle', parent=styles['Heading1'], textColor=col_dark_blue,
+                               borderPadding=0, borderWidth=0, alignment=1)
+    style_sub = ParagraphStyle('cpdf_SubTitle', parent=styles['Normal'], fontSize=9, textColor=col_gray, alignment=0)
+    style_sub_right = ParagraphStyle('cpdf_SubTitleRight', parent=styles['Normal'], fontSize=9, textColor=col_dark_blue, alignment=2)
+    style_normal = ParagraphStyle('cpdf_Justify', parent=styles['Normal'], alignment=4, leading=14)
+    style_sec_h = ParagraphStyle('cpdf_SectionH', parent=styles['Normal'], fontName='Helvetica-Bold',
+                                 fontSize=10, textColor=col_dark_blue, spaceBefore=10, spaceAfter=3, leading=13)
+    return style_tit, style_sub, style_sub_right, style_normal, style_sec_h
+
+
+@functools.lru_cache(maxsize=1)
+def _annotator_styles():
+    """Shared 'ann_*' styles used by the concise and annotator summary PDFs."""
+    styles = _sample_styles()
+    col_primary = _COL_NAVY
+    col_secondary = _COL_RED
+    col_light_bg = _COL_LIGHT_GRAY
+
+    style_title = ParagraphStyle("ann_MainTitle", parent=styles["Heading1"],
+                                textColor=col_primary, fontSize=20, alignment=1,
+                                spaceAfter=10, spaceBefore=0)
+    style_subtitle = ParagraphStyle("ann_SubTitle", parent=styles["Normal"],
+                                   textColor=col_secondary, fontSize=12, alignment=1,
+                                   fontName="Helvetica-Bold", spaceAfter=20)
+    style_h2 = ParagraphStyle("ann_SecTitle", parent=styles["Heading2"],
+                             textColor=col_primary, backColor=col_light_bg,
+                             borderPadding=8, borderLeftWidth=4, borderColor=col_secondary,
+                             spaceBefore=15, spaceAfter=10)
+    style_h3 = ParagraphStyle("ann_SubSecTitle", parent=styles["Heading3"],
+                             textColor=col_secondary, spaceBefore=10, spaceAfter=5)
+    style_normal = ParagraphStyle("ann_Body", parent=styles["Normal"],
+                                 leading=14, fontSize=10, spaceAfter=6)
+    style_bullet = ParagraphStyle("ann_Bullet", parent=style_normal,
+                                 leftIndent=20, bulletIndent=10)
+    style_redflag = ParagraphStyle("ann_redflag", parent=style_bullet, textColor=_COL_AMBER)
+    return style_title, style_subtitle, style_h2, style_h3, style_normal, style_bullet, style_redflag
+
+
+@functools.lru_cache(maxsize=1)
+def _annotator_extra_styles():
+    """Annotator-guide-only styles: approval/denial outcome colours and the footer."""
+    style_normal = _annotator_styles()[4]
+    style_outcome_ok = ParagraphStyle("ann_outcome", parent=style_normal, textColor=_COL_GREEN)
+    style_outcome_warn = ParagraphStyle("ann_outcome", parent=style_normal, textColor=_COL_AMBER)
+    style_footer = ParagraphStyle("ann_footer", parent=style_normal,
+                                  fontSize=8, textColor=colors.grey, alignment=1)
+    return style_outcome_ok, style_outcome_warn, style_footer
+
+
+@functools.lru_cache(maxsize=8)
+def _summary_styles(primary_hex: str, secondary_hex: str):
+    """'summ_*' styles; keyed by the template's colours since those can vary."""
+    styles = _sample_styles()
+    col_primary = colors.HexColor(primary_hex)
+    col_secondary = colors.HexColor(secondary_hex)
+    col_light_blue = _COL_LIGHT_BLUE
+    style_title = ParagraphStyle('summ_MainTitle', parent=styles['Heading1'], textColor=col_primary, 
+                               borderPadding=10, borderWidth=0, borderBottomWidth=2, borderColor=col_primary)
+    style_h2 = ParagraphStyle('summ_SecTitle', parent=styles['Heading2'], textColor=col_secondary, backColor=col_light_blue,
+                              borderPadding=8, borderWidth=0, borderLeftWidth=4, borderColor=col_secondary, spaceBefore=20)
+    style_normal = ParagraphStyle('summ_Normal', parent=styles['Normal'])
+    style_bullet = ParagraphStyle('ann_bullet', leftIndent=20, parent=style_normal)
+    return style_title, style_h2, style_normal, style_bullet
+
+
+@functools.lru_cache(maxsize=1)
+def _persona_styles():
+    styles = _sample_styles()
+    col_header = _COL_NAVY
+    col_accent = _COL_ORANGE
+    col_bg = _COL_LIGHT_GRAY
+    style_tit = ParagraphStyle('persona_MainTitle', parent=styles['Heading1'], textColor=col_header, 
+                               alignment=1, fontSize=24, spaceAfter=20)
+    style_h2 = ParagraphStyle('persona_SecTitle', parent=styles['Heading2'], textColor=col_header, backColor=col_bg,
+                              borderPadding=6, spaceBefore=15, spaceAfter=10)
+    style_h3 = ParagraphStyle('persona_SubTitle', parent=styles['Heading3'], textColor=col_accent, spaceBefore=10)
+    style_normal = ParagraphStyle('persona_Body', parent=styles['Normal'], leading=14, fontSize=10)
+    style_label = ParagraphStyle('persona_Lbl', parent=styles['Normal'], fontName='Helvetica-Bold', fontSize=10)
+    style_pid = ParagraphStyle('persona_pid', parent=style_normal, alignment=1, fontSize=12)
+    style_bullet = ParagraphStyle('persona_bull', parent=style_normal, leftIndent=15)
+    return style_tit, style_h2, style_h3, style_normal, style_label, style_pid, style_bullet
+
+
+# Table styles shared by every PDF (TableStyle is read-only once applied)
+_HEADER_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('LINEBELOW', (0,0), (-1,-1), 1, _COL_BORDER_GRAY),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 10),
+])
+
+_CASE_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0,0), (-1,-1), _COL_LIGHT_GRAY),
+    ("GRID", (0,0), (-1,-1), 1, colors.grey),
+    ("VALIGN", (0,0), (-1,-1), "TOP"),
+    ("TOPPADDING", (0,0), (-1,-1), 8),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 8),
+    ("WORDWRAP", (0,0), (-1,-1), True),
+])
+
+_PROC_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,-1), _COL_PALE_BLUE),
+    ('BOX', (0,0), (-1,-1), 1, _COL_BLUE),
+    ('LEFTPADDING', (0,0), (-1,-1), 10),
+    ('RIGHTPADDING', (0,0), (-1,-1), 10),
+    ('TOPPADDING', (0,0), (-1,-1), 10),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 10),
+    ('WORDWRAP', (0,0), (-1,-1), True),
+])
+
+_PA_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (0,-1), _COL_PALE_YELLOW),
+    ('GRID', (0,0), (-1,-1), 1, colors.grey),
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
+    ('WORDWRAP', (0,0), (-1,-1), True),
+])
+
+_DOC_REF_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0,0), (-1,0), _COL_DARK_BLUE),
+    ("TEXTCOLOR", (0,0), (-1,0), colors.white),
+    ("FONTNAME", (0,0), (-1,0), "Helvetica-Bold"),
+    ("GRID", (0,0), (-1,-1), 0.5, colors.grey),
+    ("VALIGN", (0,0), (-1,-1), "TOP"),
+    ("TOPPADDING", (0,0), (-1,-1), 6),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 6),
+    ("WORDWRAP", (0,0), (-1,-1), True),
+])
+
+_DIAG_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), _COL_TABLE_HEADER),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.black),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0,0), (-1,0), 8),
+    ('TOPPADDING', (0,0), (-1,-1), 4),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('WORDWRAP', (0,0), (-1,-1), True),
+])
+
+_FINDINGS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), _COL_TABLE_HEADER),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('TOPPADDING', (0,0), (-1,-1), 4),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+    ('WORDWRAP', (0,0), (-1,-1), True),
+])
+
+_PERSONA_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,-1), 9),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+    ('BACKGROUND', (0,0), (-1,0), _COL_LIGHT_GRAY),
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('WORDWRAP', (0,0), (-1,-1), True),
+])
+
+_SOCIAL_HISTORY_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('BACKGROUND', (0, 0), (0, -1), _COL_PALE_BLUE),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('WORDWRAP', (0,0), (-1,-1), True),
+])
+
+_VITALS_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('BACKGROUND', (0, 0), (0, -1), _COL_PALE_GREEN),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('WORDWRAP', (0,0), (-1,-1), True),
+])
+
+
 def _as_dict_content(content):
     if isinstance(content, dict):
         return content
@@ -51,12 +271,20 @@ def _shorten(text: str, max_chars: int) -> str:
     return (t[: max(0, max_chars - 1)].rstrip() + "…") if max_chars > 1 else "…"
 
 
+def _shorten_flat(text: str, max_chars: int) -> str:
+    """_shorten(text.strip().replace("\\n", " "), max_chars), but slices before rewriting newlines."""
+    t = text.strip()
+    if max_chars <= 1 or len(t) <= max_chars:
+        return _shorten(t.replace("\n", " "), max_chars)
+    return t[: max_chars - 1].replace("\n", " ").rstrip() + "…"
+
+
 def _extract_report_highlights(content, max_bullets: int = 4, max_chars: int = 160) -> list[str]:
     data = _as_dict_content(content)
     if not isinstance(data, dict):
         # fall back to plain text, but keep it very short
         if isinstance(content, str) and content.strip():
-            return [_shorten(content.strip().replace("\n", " "), max_chars)]
+            return [_shorten_flat(content, max_chars)]
         return []
 
     highlights: list[str] = []
@@ -65,9 +293,8 @@ def _extract_report_highlights(content, max_bullets: int = 4, max_chars: int = 1
         if val is None:
             return
         if isinstance(val, str):
-            s = val.strip().replace("\n", " ")
-            if s:
-                highlights.append(_shorten(s, max_chars))
+            if val.strip():
+                highlights.append(_shorten_flat(val, max_chars))
         elif isinstance(val, list):
             parts = []
             for item in val[:2]:
@@ -130,18 +357,62 @@ def _extract_report_highlights(content, max_bullets: int = 4, max_chars: int = 1
 
 
 def _ensure_folder(path: str):
-    if not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
+    file_utils.ensure_dir(path)
+
+_RE_BOLD = _md_re.compile(r'\*\*(.*?)\*\*|__(.*?)__')
+_RE_BLANK_LINES = re.compile(r'\n\s*\n')
+
+# str.translate tables for single-pass character swaps
+_SAFE_NAME_TBL = str.maketrans({' ': '_', '/': '-'})
+_TITLE_SEP_TBL = str.maketrans({'_': ' ', '-': ' '})
+_UNDERSCORE_TBL = str.maketrans({'_': ' '})
+
+# Header lines (an optional leading rule is dropped, and blank/rule lines after
+# the '#' marker are skipped), horizontal rules, then **bold** / __bold__.
+_RE_CLINICAL = _md_re.compile(
+    r'^(?:-{3,})?#+(?:\s|^-{3,})*(?P<head>.*)|(?P<hr>^-{3,})|\*\*(.*?)\*\*|__(.*?)__',
+    _md_re.MULTILINE
+)
+
+# Same rules applied to a block of already-stripped lines: header content stops
+# at the end of its own line, matching a per-line format_clinical_text call.
+_RE_CLINICAL_LINES = _md_re.compile(
+    r'^(?:-{3,})?#+[^\S\n]*(?P<head>.*)|(?P<hr>^-{3,})|\*\*(.*?)\*\*|__(.*?)__',
+    _md_re.MULTILINE
+)
+
+# Markup wrapped around '#' headers; the persona bio keys its header style off the prefix
+_HEADER_OPEN = '<b><font size=12>'
+_HEADER_CLOSE = '</font></b><br/>'
+
+def _bold_sub(m):
+    inner = m.group(1) if m.group(1) is not None else m.group(2)
+    # Nested markers of the other kind (e.g. **__x__**) are still converted
+    return f'<b>{_RE_BOLD.sub(_bold_sub, inner)}</b>'
+
+def _clinical_sub(m):
+    if m.group('hr') is not None:
+        return ''
+    if m.group('head') is not None:
+        return _HEADER_OPEN + _RE_BOLD.sub(_bold_sub, m.group('head')) + _HEADER_CLOSE
+    inner = m.group(3) if m.group(3) is not None else m.group(4)
+    return f'<b>{_RE_BOLD.sub(_bold_sub, inner)}</b>'
 
 def format_clinical_text(text: str) -> str:
     if not text: return ""
-    
-    text = re.sub(r'^-{3,}', '', text, flags=re.MULTILINE)
-    text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-    text = re.sub(r'__(.*?)__', r'<b>\1</b>', text)
-    text = re.sub(r'^(#+)\s*(.*)', r'<b><font size=12>\2</font></b><br/>', text, flags=re.MULTILINE)
-    
-    return text.strip()
+    # Plain prose has nothing to convert; test for whole marker sequences so
+    # hyphenated words and snake_case identifiers still take the fast path.
+    if '*' not in text and '__' not in text and '#' not in text and '---' not in text:
+        return text.strip()
+    # Rules, bold markers and '#' headers in a single pass over the text
+    return _RE_CLINICAL.sub(_clinical_sub, text).strip()
+
+def format_clinical_lines(text: str) -> list:
+    """format_clinical_text() for every non-blank line of text, done in one regex pass."""
+    joined = "\n".join(ln for ln in (raw.strip() for raw in text.split('\n')) if ln)
+    if not joined:
+        return []
+    return [ln.strip() for ln in _RE_CLINICAL_LINES.sub(_clinical_sub, joined).split('\n')]
 
 def format_report_content(content):
     try:
@@ -237,7 +508,7 @@ def _clean_doc_title(title_hint: str, doc_type_fallback: str = "") -> str:
     # Strip file-ID prefix e.g. DOC-221-v1-001-
     raw = re.sub(r'^DOC-\d+-v\d+-\d+-', '', raw)
     # Replace underscores/dashes with spaces
-    raw = raw.replace('_', ' ').replace('-', ' ')
+    raw = raw.translate(_TITLE_SEP_TBL)
     # Remove common AI-residue suffixes
     raw = re.sub(
         r'\s+(supporting document|for prior authorization|for PA|with contrast|related to|prepared for|supporting pa|per request).*$',
@@ -245,18 +516,19 @@ def _clean_doc_title(title_hint: str, doc_type_fallback: str = "") -> str:
     )
     return raw.strip().title()
 
+_RE_SECTION_MARKER = re.compile(r'\[[A-Z][A-Z_ ]+\]')
+_RE_SECTION_LABEL = re.compile(r'^\[([A-Z][A-Z_ ]*)\]\s*$', re.MULTILINE)
+
 def _parse_formatted_sections(content_str: str) -> list:
     """
     Parse content from format_clinical_document() which uses [SECTION_LABEL] markers.
     Returns list of (label_or_None, body) tuples. Skips REPORT_METADATA block.
     """
-    import re as _re
-    if '[REPORT_METADATA]' not in content_str and not _re.search(r'\[[A-Z][A-Z_ ]+\]', content_str):
+    if '[REPORT_METADATA]' not in content_str and not _RE_SECTION_MARKER.search(content_str):
         return [(None, content_str)]  # plain text, no markers
 
     sections = []
-    pattern = _re.compile(r'^\[([A-Z][A-Z_ ]*)\]\s*$', _re.MULTILINE)
-    matches = list(pattern.finditer(content_str))
+    matches = list(_RE_SECTION_LABEL.finditer(content_str))
     for idx, m in enumerate(matches):
         label = m.group(1).strip()
         start = m.end()
@@ -306,19 +578,10 @@ def create_patient_pdf(patient_id: str, doc_type: str, content: str, patient_per
 
     file_path = os.path.join(patient_folder, filename)
     
-    doc = SimpleDocTemplate(file_path, pagesize=letter, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
-    styles = getSampleStyleSheet()
-    
-    col_dark_blue = colors.HexColor("#34495e")
-    col_gray = colors.gray
-    
-    style_tit = ParagraphStyle('cpdf_MainTitle', parent=styles['Heading1'], textColor=col_dark_blue,
-                               borderPadding=0, borderWidth=0, alignment=1)
-    style_sub = ParagraphStyle('cpdf_SubTitle', parent=styles['Normal'], fontSize=9, textColor=col_gray, alignment=0)
-    style_sub_right = ParagraphStyle('cpdf_SubTitleRight', parent=styles['Normal'], fontSize=9, textColor=col_dark_blue, alignment=2)
-    style_normal = ParagraphStyle('cpdf_Justify', parent=styles['Normal'], alignment=4, leading=14)
-    style_sec_h = ParagraphStyle('cpdf_SectionH', parent=styles['Normal'], fontName='Helvetica-Bold',
-                                 fontSize=10, textColor=col_dark_blue, spaceBefore=10, spaceAfter=3, leading=13)
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
+    styles = _sample_styles()
+    style_tit, style_sub, style_sub_right, style_normal, style_sec_h = _patient_pdf_styles()
 
     Story = []
 
@@ -382,11 +645,7 @@ def create_patient_pdf(patient_id: str, doc_type: str, content: str, patient_per
         ]
 
         header_table = Table([[header_left, header_right]], colWidths=[3.5*inch, 3.5*inch])
-        header_table.setStyle(TableStyle([
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ('LINEBELOW', (0,0), (-1,-1), 1, colors.HexColor("#bdc3c7")),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 10),
-        ]))
+        header_table.setStyle(_HEADER_TABLE_STYLE)
         Story.append(header_table)
         Story.append(Spacer(1, 20))
 
@@ -403,12 +662,18 @@ def create_patient_pdf(patient_id: str, doc_type: str, content: str, patient_per
         Story.append(Paragraph(clean_title, styles['Heading1']))
         Story.append(Spacer(1, 20))
     
-    if image_path and os.path.exists(image_path):
-        Story.append(Paragraph("<b>Attached Clinical Imaging:</b>", styles["Heading3"]))
-        Story.append(Spacer(1, 5))
-        img = Image(image_path, width=4*inch, height=3*inch, kind='proportional')
-        Story.append(img)
-        Story.append(Spacer(1, 15))
+    if image_path:
+        # EAFP: lazy=0 opens the file now, so a missing image is skipped here
+        # instead of failing doc.build() later.
+        try:
+            img = Image(image_path, width=4*inch, height=3*inch, kind='proportional', lazy=0)
+        except OSError:
+            img = None
+        if img is not None:
+            Story.append(Paragraph("<b>Attached Clinical Imaging:</b>", styles["Heading3"]))
+            Story.append(Spacer(1, 5))
+            Story.append(img)
+            Story.append(Spacer(1, 15))
 
     # Render content body – parse [SECTION_LABEL] markers into styled headings
     sections = _parse_formatted_sections(content) if isinstance(content, str) else [(None, str(content))]
@@ -416,16 +681,24 @@ def create_patient_pdf(patient_id: str, doc_type: str, content: str, patient_per
         if label:
             section_display = label.replace('_', ' ').title()
             Story.append(Paragraph(section_display, style_sec_h))
-        body_fmt = format_clinical_text(body).replace('\n', '<br/>')
-        try:
-            Story.append(Paragraph(body_fmt, style_normal))
-        except ValueError:
-            Story.append(Paragraph(html.escape(body).replace('\n', '<br/>'), style_normal))
+        # One Paragraph per blank-line block keeps each parse (and any
+        # malformed-markup fallback) local to that block.
+        for b_idx, block in enumerate(_RE_BLANK_LINES.split(body)):
+            if not block.strip():
+                continue
+            if b_idx:
+                Story.append(Spacer(1, style_normal.leading))
+            block_fmt = format_clinical_text(block).replace('\n', '<br/>')
+            try:
+                Story.append(Paragraph(block_fmt, style_normal))
+            except ValueError:
+                Story.append(Paragraph(html.escape(block).replace('\n', '<br/>'), style_normal))
         Story.append(Spacer(1, 6))
 
     Story.append(Spacer(1, 6))
             
     doc.build(Story)
+    io_backend.write_bytes(file_path, pdf_buffer.getbuffer())
     return file_path
 
 def get_clinical_image(doc_title: str):
@@ -436,46 +709,25 @@ def create_concise_summary_pdf(patient_id: str, concise_summary, case_details: d
         from ..core.config import OUTPUT_DIR
         output_folder = os.path.join(OUTPUT_DIR, "summary")
 
-    os.makedirs(output_folder, exist_ok=True)
+    _ensure_folder(output_folder)
 
     output_path = os.path.join(output_folder, f"Clinical_Summary_Patient_{patient_id}-v{version}.pdf")
     file_path = output_path
 
-    if os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-            print(f"      🔄 Replaced existing summary")
-        except Exception as e:
-            print(f"      ⚠️  Could not remove old summary: {e}")
+    try:
+        os.remove(file_path)
+        print(f"      🔄 Replaced existing summary")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"      ⚠️  Could not remove old summary: {e}")
 
-    doc = SimpleDocTemplate(file_path, pagesize=letter,
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter,
                             rightMargin=50, leftMargin=50,
                             topMargin=50, bottomMargin=50)
 
-    styles = getSampleStyleSheet()
-
-    col_primary = colors.HexColor("#2c3e50")
-    col_secondary = colors.HexColor("#e74c3c")
-    col_light_bg = colors.HexColor("#ecf0f1")
-
-    style_title = ParagraphStyle("ann_MainTitle", parent=styles["Heading1"],
-                                textColor=col_primary, fontSize=20, alignment=1,
-                                spaceAfter=10, spaceBefore=0)
-
-    style_subtitle = ParagraphStyle("ann_SubTitle", parent=styles["Normal"],
-                                   textColor=col_secondary, fontSize=12, alignment=1,
-                                   fontName="Helvetica-Bold", spaceAfter=20)
-
-    style_h2 = ParagraphStyle("ann_SecTitle", parent=styles["Heading2"],
-                             textColor=col_primary, backColor=col_light_bg,
-                             borderPadding=8, borderLeftWidth=4, borderColor=col_secondary,
-                             spaceBefore=15, spaceAfter=10)
-
-    style_normal = ParagraphStyle("ann_Body", parent=styles["Normal"],
-                                 leading=14, fontSize=10, spaceAfter=6)
-
-    style_bullet = ParagraphStyle("ann_Bullet", parent=style_normal,
-                                 leftIndent=20, bulletIndent=10)
+    style_title, style_subtitle, style_h2, _, style_normal, style_bullet, _ = _annotator_styles()
 
     Story = []
 
@@ -568,6 +820,7 @@ def create_concise_summary_pdf(patient_id: str, concise_summary, case_details: d
     add_verification_section("Clinical Timeline Strength", getattr(summary, "clinical_timeline_strength", None), 10)
 
     doc.build(Story)
+    io_backend.write_bytes(file_path, pdf_buffer.getbuffer())
     return file_path
 
 
@@ -576,51 +829,27 @@ def create_annotator_summary_pdf(patient_id: str, annotator_summary, case_detail
         from ..core.config import OUTPUT_DIR
         output_folder = os.path.join(OUTPUT_DIR, "summary")
 
-    os.makedirs(output_folder, exist_ok=True)
+    _ensure_folder(output_folder)
 
     output_path = os.path.join(output_folder, f"Annotator_Summary_Patient_{patient_id}-v{version}.pdf")
     file_path = output_path
     
-    if os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-            print(f"      🔄 Replaced existing summary")
-        except Exception as e:
-            print(f"      ⚠️  Could not remove old summary: {e}")
+    try:
+        os.remove(file_path)
+        print(f"      🔄 Replaced existing summary")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"      ⚠️  Could not remove old summary: {e}")
     
-    doc = SimpleDocTemplate(file_path, pagesize=letter,
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter,
                             rightMargin=50, leftMargin=50,
                             topMargin=50, bottomMargin=50)
 
-    styles = getSampleStyleSheet()
-    
-    col_primary = colors.HexColor("#2c3e50")
-    col_secondary = colors.HexColor("#e74c3c")
-    col_success = colors.HexColor("#27ae60")
-    col_warning = colors.HexColor("#f39c12")
-    col_light_bg = colors.HexColor("#ecf0f1")
-    
-    style_title = ParagraphStyle("ann_MainTitle", parent=styles["Heading1"], 
-                                textColor=col_primary, fontSize=20, alignment=1,
-                                spaceAfter=10, spaceBefore=0)
-    
-    style_subtitle = ParagraphStyle("ann_SubTitle", parent=styles["Normal"],
-                                   textColor=col_secondary, fontSize=12, alignment=1,
-                                   fontName="Helvetica-Bold", spaceAfter=20)
-    
-    style_h2 = ParagraphStyle("ann_SecTitle", parent=styles["Heading2"], 
-                             textColor=col_primary, backColor=col_light_bg,
-                             borderPadding=8, borderLeftWidth=4, borderColor=col_secondary,
-                             spaceBefore=15, spaceAfter=10)
-    
-    style_h3 = ParagraphStyle("ann_SubSecTitle", parent=styles["Heading3"],
-                             textColor=col_secondary, spaceBefore=10, spaceAfter=5)
-    
-    style_normal = ParagraphStyle("ann_Body", parent=styles["Normal"], 
-                                 leading=14, fontSize=10, spaceAfter=6)
-    
-    style_bullet = ParagraphStyle("ann_Bullet", parent=style_normal, 
-                                 leftIndent=20, bulletIndent=10)
+    (style_title, style_subtitle, style_h2, style_h3,
+     style_normal, style_bullet, style_redflag) = _annotator_styles()
+    style_outcome_ok, style_outcome_warn, style_footer = _annotator_extra_styles()
     
     Story = []
 
@@ -628,8 +857,6 @@ def create_annotator_summary_pdf(patient_id: str, annotator_summary, case_detail
     Story.append(Paragraph(f"Patient ID: {patient_id} | For Internal QA Use Only", style_subtitle))
     Story.append(Spacer(1, 10))
     
-    import re
-    
     target_cpt = "N/A"
     target_cpt_desc = "N/A"
     all_cpt_codes = []
@@ -681,8 +908,7 @@ def create_annotator_summary_pdf(patient_id: str, annotator_summary, case_detail
     case_overview_data = [
         [Paragraph("<b>Expected Outcome:</b>", style_normal), 
          Paragraph(f"<b>{annotator_summary.verification_pointers.expected_outcome}</b>", 
-                  ParagraphStyle("ann_outcome", parent=style_normal, 
-                                textColor=col_success if "approval" in annotator_summary.verification_pointers.expected_outcome.lower() else col_warning))]
+                  style_outcome_ok if "approval" in annotator_summary.verification_pointers.expected_outcome.lower() else style_outcome_warn)]
     ]
     
     if hasattr(annotator_summary.verification_pointers, "notes") and annotator_summary.verification_pointers.notes:
@@ -693,14 +919,7 @@ def create_annotator_summary_pdf(patient_id: str, annotator_summary, case_detail
         ])
     
     case_table = Table(case_overview_data, colWidths=[2*inch, 4.5*inch])
-    case_table.setStyle(TableStyle([
-        ("BACKGROUND", (0,0), (-1,-1), col_light_bg),
-        ("GRID", (0,0), (-1,-1), 1, colors.grey),
-        ("VALIGN", (0,0), (-1,-1), "TOP"),
-        ("TOPPADDING", (0,0), (-1,-1), 8),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 8),
-        ("WORDWRAP", (0,0), (-1,-1), True),
-    ]))
+    case_table.setStyle(_CASE_TABLE_STYLE)
     Story.append(case_table)
     Story.append(Spacer(1, 15))
     
@@ -726,15 +945,7 @@ def create_annotator_summary_pdf(patient_id: str, annotator_summary, case_detail
         
         proc_box = Paragraph(proc_info_text, style_normal)
         proc_table = Table([[proc_box]], colWidths=[6.5*inch])
-        proc_table.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,-1), colors.HexColor("#e8f4f8")),
-            ("BOX", (0,0), (-1,-1), 1, colors.HexColor("#3498db")),
-            ("LEFTPADDING", (0,0), (-1,-1), 10),
-            ("RIGHTPADDING", (0,0), (-1,-1), 10),
-            ("TOPPADDING", (0,0), (-1,-1), 10),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 10),
-            ("WORDWRAP", (0,0), (-1,-1), True),
-        ]))
+        proc_table.setStyle(_PROC_TABLE_STYLE)
         Story.append(proc_table)
         Story.append(Spacer(1, 15))
         
@@ -761,13 +972,7 @@ def create_annotator_summary_pdf(patient_id: str, annotator_summary, case_detail
         ]
         
         pa_table = Table(pa_data, colWidths=[2*inch, 4.5*inch])
-        pa_table.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (0,-1), colors.HexColor("#fff3cd")),
-            ("GRID", (0,0), (-1,-1), 1, colors.grey),
-            ("VALIGN", (0,0), (-1,-1), "TOP"),
-            ("FONTNAME", (0,0), (0,-1), "Helvetica-Bold"),
-            ("WORDWRAP", (0,0), (-1,-1), True),
-        ]))
+        pa_table.setStyle(_PA_TABLE_STYLE)
         Story.append(pa_table)
         Story.append(Spacer(1, 20))
         
@@ -813,7 +1018,7 @@ def create_annotator_summary_pdf(patient_id: str, annotator_summary, case_detail
         Story.append(Paragraph("<b>Red Flags to Watch For:</b>", style_h3))
         for flag in vp.red_flags:
             Story.append(Paragraph(f"⚠ {flag}", 
-                                 ParagraphStyle("ann_redflag", parent=style_bullet, textColor=col_warning)))
+                                 style_redflag))
         Story.append(Spacer(1, 8))
     
     if vp.document_references and len(vp.document_references) > 0:
@@ -831,42 +1036,206 @@ def create_annotator_summary_pdf(patient_id: str, annotator_summary, case_detail
         
         if len(doc_ref_data) > 1:
             doc_ref_table = Table(doc_ref_data, colWidths=[2*inch, 4.5*inch])
-            doc_ref_table.setStyle(TableStyle([
-                ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#34495e")),
-                ("TEXTCOLOR", (0,0), (-1,0), colors.white),
-                ("FONTNAME", (0,0), (-1,0), "Helvetica-Bold"),
-                ("GRID", (0,0), (-1,-1), 0.5, colors.grey),
-                ("VALIGN", (0,0), (-1,-1), "TOP"),
-                ("TOPPADDING", (0,0), (-1,-1), 6),
-                ("BOTTOMPADDING", (0,0), (-1,-1), 6),
-                ("WORDWRAP", (0,0), (-1,-1), True),
-            ]))
+            doc_ref_table.setStyle(_DOC_REF_TABLE_STYLE)
             Story.append(doc_ref_table)
     
     Story.append(Spacer(1, 15))
     
     footer_text = f"<i>Generated: {datetime.now().strftime('%m-%d-%Y %H:%M')} | This document is for internal QA purposes only</i>"
-    Story.append(Paragraph(footer_text, 
-                          ParagraphStyle("ann_footer", parent=style_normal, 
-                                        fontSize=8, textColor=colors.grey, alignment=1)))
+    Story.append(Paragraph(footer_text, style_footer))
 
     doc.build(Story)
+    io_backend.write_bytes(file_path, pdf_buffer.getbuffer())
     return file_path
 
+def _table_cell(value, style, wrap_at: int = 25):
+    """Paragraph for long or marked-up cell text (needs wrapping/parsing); plain string otherwise."""
+    text = str(value)
+    if len(text) > wrap_at or '<' in text or '&' in text:
+        return Paragraph(text, style)
+    return text
+
+
+_SUMMARY_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "templates", "summary_template.json")
+
+
+@functools.lru_cache(maxsize=4)
+def _read_summary_template(path: str, mtime_ns):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"   ⚠️  Warning: Could not load summary template: {e}. Using defaults.")
+        return {"sections": [], "styling": {}}
+
+
+def _load_summary_template(path: str) -> dict:
+    """Return the parsed summary template, re-reading only when the file changes."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _read_summary_template(os.path.abspath(path), mtime_ns)
+
+
+# --- Summary PDF section renderers (keyed by template section name) ---
+
+def _render_patient_details(Story, template, summary_data, styles):
+    _, style_h2, style_normal, _ = styles
+    # Patient Details Section
+    patient_details = template.get('patient_details', {})
+    # Merge with actual data
+    name = summary_data.get('name', patient_details.get('name', 'Unknown'))
+    dob = summary_data.get('dob', patient_details.get('dob', 'N/A'))
+    gender = summary_data.get('gender', patient_details.get('gender', 'N/A'))
+    mrn = summary_data.get('mrn', patient_details.get('mrn', 'N/A'))
+
+    Story.append(Paragraph("<b>Patient Details</b>", style_h2))
+    Story.append(Spacer(1, 10))
+
+    details_text = f"""
+    <b>Name:</b> {name}<br/>
+    <b>Date of Birth:</b> {dob}<br/>
+    <b>Gender:</b> {gender}<br/>
+    <b>MRN:</b> {mrn}
+    """
+    Story.append(Paragraph(details_text, style_normal))
+    Story.append(Spacer(1, 10))
+
+
+def _render_diagnoses(Story, template, summary_data, styles):
+    _, style_h2, style_normal, _ = styles
+    # Diagnoses Table
+    Story.append(Paragraph("Current Diagnoses", style_h2))
+    Story.append(Spacer(1, 10))
+
+    diag_template = template.get('diagnoses', {})
+    columns = diag_template.get('columns', ['code', 'condition', 'status', 'date_recorded'])
+
+    # Build table headers
+    headers = [col.replace('_', ' ').title() for col in columns]
+    table_data = [headers]
+
+    # Get data from summary_data or template
+    diagnoses = summary_data.get('diagnoses', diag_template.get('data', []))
+    for diag in diagnoses:
+        row = []
+        for col in columns:
+            row.append(_table_cell(diag.get(col, 'N/A'), style_normal))
+        table_data.append(row)
+
+    if len(table_data) > 1:
+        t_diag = Table(table_data, colWidths=[0.8*inch, 3.5*inch, 1*inch, 1.2*inch])
+        t_diag.setStyle(_DIAG_TABLE_STYLE)
+        Story.append(t_diag)
+        Story.append(Spacer(1, 10))
+
+
+def _render_encounters_documentation(Story, template, summary_data, styles):
+    _, style_h2, style_normal, _ = styles
+    # Encounters & Documentation
+    Story.append(Paragraph("Clinical Encounters & Documentation", style_h2))
+    Story.append(Spacer(1, 10))
+
+    encounters = template.get('encounters_documentation', {})
+    narrative = encounters.get('narrative_summary', '')
+    if narrative:
+        Story.append(Paragraph(narrative, style_normal))
+        Story.append(Spacer(1, 10))
+
+    # Key findings table
+    key_findings = encounters.get('key_findings', [])
+    if key_findings:
+        Story.append(Paragraph("<b>Key Findings:</b>", style_normal))
+        Story.append(Spacer(1, 5))
+
+        findings_data = [['Test', 'Date', 'Result']]
+        for finding in key_findings:
+            row = [
+                _table_cell(finding.get('test', 'N/A'), style_normal),
+                _table_cell(finding.get('date', 'N/A'), style_normal),
+                _table_cell(finding.get('result', 'N/A'), style_normal)
+            ]
+            findings_data.append(row)
+
+        t_findings = Table(findings_data, colWidths=[1.2*inch, 1*inch, 4.3*inch])
+        t_findings.setStyle(_FINDINGS_TABLE_STYLE)
+        Story.append(t_findings)
+        Story.append(Spacer(1, 10))
+
+
+def _render_contact_provider(Story, template, summary_data, styles):
+    _, style_h2, style_normal, _ = styles
+    # Contact & Provider Information
+    Story.append(Paragraph("Contact & Provider Information", style_h2))
+    Story.append(Spacer(1, 10))
+
+    contact_info = template.get('contact_provider', {})
+    provider_text = f"""
+    <b>Provider:</b> {contact_info.get('provider', 'N/A')}<br/>
+    <b>Facility:</b> {contact_info.get('facility', 'N/A')}<br/>
+    <b>Address:</b> {contact_info.get('address', 'N/A')}<br/>
+    <b>Phone:</b> {contact_info.get('phone', 'N/A')}
+    """
+    Story.append(Paragraph(provider_text, style_normal))
+    Story.append(Spacer(1, 10))
+
+
+def _render_treatment_plan(Story, template, summary_data, styles):
+    _, style_h2, style_normal, _ = styles
+    # Treatment Plan
+    Story.append(Paragraph("Proposed Treatment Plan", style_h2))
+    Story.append(Spacer(1, 10))
+
+    treatment = template.get('treatment_plan', {})
+    procedure = summary_data.get('procedure', treatment.get('procedure', 'N/A'))
+    outcome = summary_data.get('outcome', treatment.get('outcome', 'N/A'))
+
+    plan_text = f"""
+    <b>Procedure:</b> {procedure}<br/>
+    <b>Outcome:</b> {outcome}
+    """
+    Story.append(Paragraph(plan_text, style_normal))
+    Story.append(Spacer(1, 10))
+
+
+def _render_clinical_rationale(Story, template, summary_data, styles):
+    _, style_h2, style_normal, style_bullet = styles
+    # Clinical Rationale (NEW SECTION)
+    Story.append(Paragraph("Clinical Rationale", style_h2))
+    Story.append(Spacer(1, 10))
+
+    rationale = template.get('clinical_rationale', {})
+    justification = rationale.get('justification_text', '')
+    if justification:
+        Story.append(Paragraph(justification, style_normal))
+        Story.append(Spacer(1, 10))
+
+    # Bullet points for clinical necessity
+    necessity_points = rationale.get('clinical_necessity_points', [])
+    if necessity_points:
+        Story.append(Paragraph("<b>Clinical Necessity:</b>", style_normal))
+        for point in necessity_points:
+            Story.append(Paragraph(f"• {point}", style_bullet))
+        Story.append(Spacer(1, 10))
+
+
+_SECTION_HANDLERS = {
+    'patient_details': _render_patient_details,
+    'diagnoses': _render_diagnoses,
+    'encounters_documentation': _render_encounters_documentation,
+    'contact_provider': _render_contact_provider,
+    'treatment_plan': _render_treatment_plan,
+    'clinical_rationale': _render_clinical_rationale,
+}
+
+
 def create_patient_summary_pdf(patient_id, summary_data, output_folder: str = None):
     """
     Creates a highly styled Clinical Summary PDF using the template structure.
     """
-    import json
-    
-    # Load template
-    template_path = os.path.join(os.path.dirname(__file__), "templates", "summary_template.json")
-    try:
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template = json.load(f)
-    except Exception as e:
-        print(f"   ⚠️  Warning: Could not load summary template: {e}. Using defaults.")
-        template = {"sections": [], "styling": {}}
+    # Load template (parsed once per file version; treat as read-only)
+    template = _load_summary_template(_SUMMARY_TEMPLATE_PATH)
     
     # 1. Folder Management
     if output_folder:
@@ -880,28 +1249,18 @@ def create_patient_summary_pdf(patient_id, summary_data, output_folder: str = No
     filename = f"Clinical_Summary_Patient_{patient_id}.pdf"
     file_path = os.path.join(output_dir, filename)
     
-    doc = SimpleDocTemplate(file_path, pagesize=letter,
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter,
                             rightMargin=50, leftMargin=50,
                             topMargin=50, bottomMargin=50)
 
-    # Styles
-    styles = getSampleStyleSheet()
-    
-    # Get colors from template or use defaults
+    # Styles (cached per template colour pair)
     styling = template.get('styling', {})
-    col_primary = colors.HexColor(styling.get('primary_color', '#27ae60'))
-    col_secondary = colors.HexColor(styling.get('secondary_color', '#2980b9'))
-    col_accent = colors.HexColor(styling.get('accent_color', '#34495e'))
-    col_light_blue = colors.HexColor("#f0f7fb")
-    
-    # Custom Styles
-    style_title = ParagraphStyle('summ_MainTitle', parent=styles['Heading1'], textColor=col_primary, 
-                               borderPadding=10, borderWidth=0, borderBottomWidth=2, borderColor=col_primary)
-    
-    style_h2 = ParagraphStyle('summ_SecTitle', parent=styles['Heading2'], textColor=col_secondary, backColor=col_light_blue,
-                              borderPadding=8, borderWidth=0, borderLeftWidth=4, borderColor=col_secondary, spaceBefore=20)
-    
-    style_normal = ParagraphStyle('summ_Normal', parent=styles['Normal'])
+    styles = _summary_styles(
+        styling.get('primary_color', '#27ae60'),
+        styling.get('secondary_color', '#2980b9'),
+    )
+    style_title = styles[0]
 
     Story = []
     
@@ -912,159 +1271,59 @@ def create_patient_summary_pdf(patient_id, summary_data, output_folder: str = No
     
     # Process sections dynamically based on template
     sections = template.get('sections', [])
-    
     for section_name in sections:
-        if section_name == 'patient_details':
-            # Patient Details Section
-            patient_details = template.get('patient_details', {})
-            # Merge with actual data
-            name = summary_data.get('name', patient_details.get('name', 'Unknown'))
-            dob = summary_data.get('dob', patient_details.get('dob', 'N/A'))
-            gender = summary_data.get('gender', patient_details.get('gender', 'N/A'))
-            mrn = summary_data.get('mrn', patient_details.get('mrn', 'N/A'))
-            
-            Story.append(Paragraph("<b>Patient Details</b>", style_h2))
-            Story.append(Spacer(1, 10))
-            
-            details_text = f"""
-            <b>Name:</b> {name}<br/>
-            <b>Date of Birth:</b> {dob}<br/>
-            <b>Gender:</b> {gender}<br/>
-            <b>MRN:</b> {mrn}
-            """
-            Story.append(Paragraph(details_text, style_normal))
-            Story.append(Spacer(1, 10))
-            
-        elif section_name == 'diagnoses':
-            # Diagnoses Table
-            Story.append(Paragraph("Current Diagnoses", style_h2))
-            Story.append(Spacer(1, 10))
-            
-            diag_template = template.get('diagnoses', {})
-            columns = diag_template.get('columns', ['code', 'condition', 'status', 'date_recorded'])
-            
-            # Build table headers
-            headers = [col.replace('_', ' ').title() for col in columns]
-            table_data = [headers]
-            
-            # Get data from summary_data or template
-            diagnoses = summary_data.get('diagnoses', diag_template.get('data', []))
-            for diag in diagnoses:
-                row = []
-                for col in columns:
-                    cell_text = str(diag.get(col, 'N/A'))
-                    # Wrap in Paragraph for text wrapping
-                    row.append(Paragraph(cell_text, style_normal))
-                table_data.append(row)
-            
-            if len(table_data) > 1:
-                t_diag = Table(table_data, colWidths=[0.8*inch, 3.5*inch, 1*inch, 1.2*inch])
-                t_diag.setStyle(TableStyle([
-                    ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#f2f2f2")),
-                    ('TEXTCOLOR', (0,0), (-1,0), colors.black),
-                    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                    ('BOTTOMPADDING', (0,0), (-1,0), 8),
-                    ('TOPPADDING', (0,0), (-1,-1), 4),
-                    ('BOTTOMPADDING', (0,0), (-1,-1), 4),
-                    ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-                    ('VALIGN', (0,0), (-1,-1), 'TOP'),
-                    ('WORDWRAP', (0,0), (-1,-1), True),
-                ]))
-                Story.append(t_diag)
-                Story.append(Spacer(1, 10))
-            
-        elif section_name == 'encounters_documentation':
-            # Encounters & Documentation
-            Story.append(Paragraph("Clinical Encounters & Documentation", style_h2))
-            Story.append(Spacer(1, 10))
-            
-            encounters = template.get('encounters_documentation', {})
-            narrative = encounters.get('narrative_summary', '')
-            if narrative:
-                Story.append(Paragraph(narrative, style_normal))
-                Story.append(Spacer(1, 10))
-            
-            # Key findings table
-            key_findings = encounters.get('key_findings', [])
-            if key_findings:
-                Story.append(Paragraph("<b>Key Findings:</b>", style_normal))
-                Story.append(Spacer(1, 5))
-                
-                findings_data = [['Test', 'Date', 'Result']]
-                for finding in key_findings:
-                    row = [
-                        Paragraph(str(finding.get('test', 'N/A')), style_normal),
-                        Paragraph(str(finding.get('date', 'N/A')), style_normal),
-                        Paragraph(str(finding.get('result', 'N/A')), style_normal)
-                    ]
-                    findings_data.append(row)
-                
-                t_findings = Table(findings_data, colWidths=[1.2*inch, 1*inch, 4.3*inch])
-                t_findings.setStyle(TableStyle([
-                    ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#f2f2f2")),
-                    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                    ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-                    ('VALIGN', (0,0), (-1,-1), 'TOP'),
-                    ('TOPPADDING', (0,0), (-1,-1), 4),
-                    ('BOTTOMPADDING', (0,0), (-1,-1), 4),
-                    ('WORDWRAP', (0,0), (-1,-1), True),
-                ]))
-                Story.append(t_findings)
-                Story.append(Spacer(1, 10))
-        
-        elif section_name == 'contact_provider':
-            # Contact & Provider Information
-            Story.append(Paragraph("Contact & Provider Information", style_h2))
-            Story.append(Spacer(1, 10))
-            
-            contact_info = template.get('contact_provider', {})
-            provider_text = f"""
-            <b>Provider:</b> {contact_info.get('provider', 'N/A')}<br/>
-            <b>Facility:</b> {contact_info.get('facility', 'N/A')}<br/>
-            <b>Address:</b> {contact_info.get('address', 'N/A')}<br/>
-            <b>Phone:</b> {contact_info.get('phone', 'N/A')}
-            """
-            Story.append(Paragraph(provider_text, style_normal))
-            Story.append(Spacer(1, 10))
-            
-        elif section_name == 'treatment_plan':
-            # Treatment Plan
-            Story.append(Paragraph("Proposed Treatment Plan", style_h2))
-            Story.append(Spacer(1, 10))
-            
-            treatment = template.get('treatment_plan', {})
-            procedure = summary_data.get('procedure', treatment.get('procedure', 'N/A'))
-            outcome = summary_data.get('outcome', treatment.get('outcome', 'N/A'))
-            
-            plan_text = f"""
-            <b>Procedure:</b> {procedure}<br/>
-            <b>Outcome:</b> {outcome}
-            """
-            Story.append(Paragraph(plan_text, style_normal))
-            Story.append(Spacer(1, 10))
-            
-        elif section_name == 'clinical_rationale':
-            # Clinical Rationale (NEW SECTION)
-            Story.append(Paragraph("Clinical Rationale", style_h2))
-            Story.append(Spacer(1, 10))
-            
-            rationale = template.get('clinical_rationale', {})
-            justification = rationale.get('justification_text', '')
-            if justification:
-                Story.append(Paragraph(justification, style_normal))
-                Story.append(Spacer(1, 10))
-            
-            # Bullet points for clinical necessity
-            necessity_points = rationale.get('clinical_necessity_points', [])
-            if necessity_points:
-                Story.append(Paragraph("<b>Clinical Necessity:</b>", style_normal))
-                for point in necessity_points:
-                    Story.append(Paragraph(f"• {point}", ParagraphStyle('ann_bullet', leftIndent=20, parent=style_normal)))
-                Story.append(Spacer(1, 10))
+        handler = _SECTION_HANDLERS.get(section_name)
+        if handler:
+            handler(Story, template, summary_data, styles)
 
     doc.build(Story)
+    io_backend.write_bytes(file_path, pdf_buffer.getbuffer())
     return file_path
 
+# Face-sheet rows as (label, attribute, default) for the persona PDF
+_CONTACT_FIELDS = (
+    ("Relationship:", "relationship", "N/A"),
+    ("Name:", "name", "N/A"),
+    ("Telecom:", "telecom", "N/A"),
+    ("Address:", "address", "N/A"),
+    ("Gender:", "gender", "N/A"),
+    ("Organization:", "organization", "N/A"),
+    ("Period Start:", "period_start", "N/A"),
+    ("Period End:", "period_end", "ongoing"),
+)
+
+_PROVIDER_FIELDS = (
+    ("General Practitioner:", "generalPractitioner", "N/A"),
+    ("Managing Organization:", "managingOrganization", "N/A"),
+    ("NPI:", "formatted_npi", "N/A"),
+)
+
+_PAYER_FIELDS = (
+    ("Payer ID:", "payer_id", "N/A"),
+    ("Payer Name:", "payer_name", "N/A"),
+    ("Provider Abbrev:", "provider_abbreviation", "N/A"),
+    ("Provider Policy URL:", "provider_policy_url", "N/A"),
+    ("Plan Name:", "plan_name", "N/A"),
+    ("Plan Type:", "plan_type", "N/A"),
+    ("Plan ID:", "plan_id", "N/A"),
+    ("Plan Policy URL:", "plan_policy_url", "N/A"),
+    ("Member ID:", "member_id", "N/A"),
+    ("Policy Number:", "policy_number", "N/A"),
+    ("Effective Date:", "effective_date", "N/A"),
+    ("Termination Date:", "termination_date", "ongoing"),
+    ("Copay:", "copay_amount", "N/A"),
+    ("Deductible:", "deductible_amount", "N/A"),
+)
+
+
+def _field_rows(obj, fields) -> list:
+    """Expand (label, attr, default) specs against obj's field dict (one dict, no per-field getattr)."""
+    values = getattr(obj, "__dict__", None)
+    if values is None:
+        return [[lbl, getattr(obj, attr, default)] for lbl, attr, default in fields]
+    return [[lbl, values.get(attr, default)] for lbl, attr, default in fields]
+
+
 def create_persona_pdf(patient_id: str, patient_name: str, persona: object, generated_reports: list = None, image_map: dict = None, mrn: str = "N/A", output_folder: str = "documents/personas", version: str = "1"):
     """
     Generates a comprehensive Patient Master Record from Structured Data.
@@ -1074,35 +1333,20 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
     - **Clinical Assets**: Reports & Images.
     """
     persona_folder = output_folder
-    os.makedirs(output_folder, exist_ok=True)
-    safe_name = patient_name.replace(' ', '_').replace('/', '-')
+    _ensure_folder(output_folder)
+    safe_name = patient_name.translate(_SAFE_NAME_TBL)
     filename = f"{patient_id}-{safe_name}-persona-v{version}.pdf"
     file_path = os.path.join(persona_folder, filename)
 
-    doc = SimpleDocTemplate(file_path, pagesize=letter, rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=40)
-    styles = getSampleStyleSheet()
-    
-    # Premium Colors
-    col_header = colors.HexColor("#2c3e50") # Dark Blue
-    col_accent = colors.HexColor("#e67e22") # Orange
-    col_bg = colors.HexColor("#ecf0f1")
-    
-    style_tit = ParagraphStyle('persona_MainTitle', parent=styles['Heading1'], textColor=col_header, 
-                               alignment=1, fontSize=24, spaceAfter=20)
-    
-    style_h2 = ParagraphStyle('persona_SecTitle', parent=styles['Heading2'], textColor=col_header, backColor=col_bg,
-                              borderPadding=6, spaceBefore=15, spaceAfter=10)
-    
-    style_h3 = ParagraphStyle('persona_SubTitle', parent=styles['Heading3'], textColor=col_accent, spaceBefore=10)
-    
-    style_normal = ParagraphStyle('persona_Body', parent=styles['Normal'], leading=14, fontSize=10)
-    style_label = ParagraphStyle('persona_Lbl', parent=styles['Normal'], fontName='Helvetica-Bold', fontSize=10)
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter, rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=40)
+    style_tit, style_h2, style_h3, style_normal, style_label, style_pid, style_bullet = _persona_styles()
     
     Story = []
 
     # --- HEADER ---
     Story.append(Paragraph(f"CONFIDENTIAL PATIENT MASTER RECORD", style_tit))
-    Story.append(Paragraph(f"<b>PATIENT ID: {patient_id}  |  MRN: {mrn}</b>", ParagraphStyle('persona_pid', parent=style_normal, alignment=1, fontSize=12)))
+    Story.append(Paragraph(f"<b>PATIENT ID: {patient_id}  |  MRN: {mrn}</b>", style_pid))
     Story.append(Spacer(1, 15))
     
     # --- FACE SHEET (Structured Data) ---
@@ -1140,16 +1384,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
         [Paragraph("<b>EMERGENCY CONTACT</b>", style_label), ""],
     ]
     if c:
-        data_contact.extend([
-            ["Relationship:", getattr(c, 'relationship', 'N/A')],
-            ["Name:", getattr(c, 'name', 'N/A')],
-            ["Telecom:", getattr(c, 'telecom', 'N/A')],
-            ["Address:", getattr(c, 'address', 'N/A')],
-            ["Gender:", getattr(c, 'gender', 'N/A')],
-            ["Organization:", getattr(c, 'organization', 'N/A')],
-            ["Period Start:", getattr(c, 'period_start', 'N/A')],
-            ["Period End:", getattr(c, 'period_end', 'ongoing')],
-        ])
+        data_contact += _field_rows(c, _CONTACT_FIELDS)
     else:
         data_contact.append(["Details:", "Not Provided"])
     
@@ -1159,11 +1394,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
         [Paragraph("<b>PRIMARY PROVIDER</b>", style_label), ""],
     ]
     if pr:
-        data_provider.extend([
-            ["General Practitioner:", getattr(pr, 'generalPractitioner', 'N/A')],
-            ["Managing Organization:", getattr(pr, 'managingOrganization', 'N/A')],
-            ["NPI:", getattr(pr, 'formatted_npi', 'N/A')],
-        ])
+        data_provider += _field_rows(pr, _PROVIDER_FIELDS)
     else:
         data_provider.append(["Details:", "Not Provided"])
     
@@ -1173,35 +1404,11 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
         [Paragraph("<b>INSURANCE / PAYER</b>", style_label), ""],
     ]
     if payer:
-        data_payer.extend([
-            ["Payer ID:", getattr(payer, 'payer_id', 'N/A')],
-            ["Payer Name:", getattr(payer, 'payer_name', 'N/A')],
-            ["Provider Abbrev:", getattr(payer, 'provider_abbreviation', 'N/A')],
-            ["Provider Policy URL:", getattr(payer, 'provider_policy_url', 'N/A')],
-            ["Plan Name:", getattr(payer, 'plan_name', 'N/A')],
-            ["Plan Type:", getattr(payer, 'plan_type', 'N/A')],
-            ["Plan ID:", getattr(payer, 'plan_id', 'N/A')],
-            ["Plan Policy URL:", getattr(payer, 'plan_policy_url', 'N/A')],
-            ["Member ID:", getattr(payer, 'member_id', 'N/A')],
-            ["Policy Number:", getattr(payer, 'policy_number', 'N/A')],
-            ["Effective Date:", getattr(payer, 'effective_date', 'N/A')],
-            ["Termination Date:", getattr(payer, 'termination_date', 'ongoing')],
-            ["Copay:", getattr(payer, 'copay_amount', 'N/A')],
-            ["Deductible:", getattr(payer, 'deductible_amount', 'N/A')],
-        ])
-
+        data_payer += _field_rows(payer, _PAYER_FIELDS)
     else:
         data_payer.append(["Details:", "Not Provided"])
     
     # --- BUILD TABLES ---
-    table_style = TableStyle([
-        ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-        ('BACKGROUND', (0,0), (-1,0), col_bg),
-        ('VALIGN', (0,0), (-1,-1), 'TOP'),
-        ('WORDWRAP', (0,0), (-1,-1), True),
-    ])
     
     for data_block, title in [
         (data_identity, "Identity"),
@@ -1215,7 +1422,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
                 if isinstance(cell, str):
                     row[i] = Paragraph(f"<b>{cell}</b>" if i == 0 else cell, style_label if i == 0 else style_normal)
         t = Table(data_block, colWidths=[1.8*inch, 4.5*inch])
-        t.setStyle(table_style)
+        t.setStyle(_PERSONA_TABLE_STYLE)
         Story.append(t)
         Story.append(Spacer(1, 8))
     Story.append(Spacer(1, 20))
@@ -1246,15 +1453,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
         
         proc_box = Paragraph(proc_info_text, style_normal)
         proc_table = Table([[proc_box]], colWidths=[6.5*inch])
-        proc_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,-1), colors.HexColor("#e8f4f8")),
-            ('BOX', (0,0), (-1,-1), 1, colors.HexColor("#3498db")),
-            ('LEFTPADDING', (0,0), (-1,-1), 10),
-            ('RIGHTPADDING', (0,0), (-1,-1), 10),
-            ('TOPPADDING', (0,0), (-1,-1), 10),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 10),
-            ('WORDWRAP', (0,0), (-1,-1), True),
-        ]))
+        proc_table.setStyle(_PROC_TABLE_STYLE)
         Story.append(proc_table)
         Story.append(Spacer(1, 15))
         
@@ -1275,13 +1474,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
                     row[i] = Paragraph(f"<b>{cell}</b>" if i == 0 else cell, style_label if i == 0 else style_normal)
         
         pa_table = Table(pa_data, colWidths=[2*inch, 4.5*inch])
-        pa_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (0,-1), colors.HexColor("#fff3cd")),
-            ('GRID', (0,0), (-1,-1), 1, colors.grey),
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
-            ('WORDWRAP', (0,0), (-1,-1), True),
-        ]))
+        pa_table.setStyle(_PA_TABLE_STYLE)
         Story.append(pa_table)
         Story.append(Spacer(1, 20))
         section_number = 3  # Next section will be III
@@ -1318,7 +1511,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
                 ])
             med_data[0] = [Paragraph(f"<b>{h}</b>", style_label) for h in med_data[0]]
             t = Table(med_data, colWidths=[1.8*inch, 0.6*inch, 1.2*inch, 1.3*inch, 1.5*inch])
-            t.setStyle(table_style)
+            t.setStyle(_PERSONA_TABLE_STYLE)
             Story.append(t)
             Story.append(Spacer(1, 10))
             
@@ -1336,7 +1529,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
                 ])
             alg_data[0] = [Paragraph(f"<b>{h}</b>", style_label) for h in alg_data[0]]
             t = Table(alg_data, colWidths=[2.0*inch, 2.0*inch, 1.2*inch, 1.2*inch])
-            t.setStyle(table_style)
+            t.setStyle(_PERSONA_TABLE_STYLE)
             Story.append(t)
             Story.append(Spacer(1, 10))
             
@@ -1354,7 +1547,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
                 ])
             vax_data[0] = [Paragraph(f"<b>{h}</b>", style_label) for h in vax_data[0]]
             t = Table(vax_data, colWidths=[2.0*inch, 1.0*inch, 1.5*inch, 1.9*inch])
-            t.setStyle(table_style)
+            t.setStyle(_PERSONA_TABLE_STYLE)
             Story.append(t)
             Story.append(Spacer(1, 10))
 
@@ -1379,7 +1572,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
                 ])
             th_data[0] = [Paragraph(f"<b>{h}</b>", style_label) for h in th_data[0]]
             t = Table(th_data, colWidths=[1.4*inch, 1.2*inch, 1.5*inch, 1.0*inch, 1.3*inch])
-            t.setStyle(table_style)
+            t.setStyle(_PERSONA_TABLE_STYLE)
             Story.append(t)
 
             Story.append(Spacer(1, 10))
@@ -1416,14 +1609,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
                     if isinstance(cell, str):
                         row[i] = Paragraph(f"<b>{cell}</b>" if i == 0 else cell, style_label if i == 0 else style_normal)
             t = Table(sh_data, colWidths=[2.2*inch, 4.2*inch])
-            t.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('WORDWRAP', (0,0), (-1,-1), True),
-            ]))
+            t.setStyle(_SOCIAL_HISTORY_TABLE_STYLE)
             Story.append(t)
             Story.append(Spacer(1, 10))
 
@@ -1448,14 +1634,7 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
                     if isinstance(cell, str):
                         row[i] = Paragraph(f"<b>{cell}</b>" if i == 0 else cell, style_label if i == 0 else style_normal)
             t = Table(vs_data, colWidths=[2.2*inch, 4.2*inch])
-            t.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f5e9')),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('WORDWRAP', (0,0), (-1,-1), True),
-            ]))
+            t.setStyle(_VITALS_TABLE_STYLE)
             Story.append(t)
             Story.append(Spacer(1, 10))
 
@@ -1472,20 +1651,20 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
     Story.append(Paragraph(f"{section_roman}. MEDICAL BIOGRAPHY & HISTORY", style_h2))
     
     if p.bio_narrative:
-        for line in p.bio_narrative.split('\n'):
-            line = line.strip()
-            if not line: continue
-            
-            # Use our Regex Formatter!
-            line = format_clinical_text(line)
-            
-            if line.startswith('<b><font size=12>'): # It was a header
-                 Story.append(Paragraph(line, style_h3))
+        # Whole bio formatted in one pass; style picked per resulting line and
+        # the flowables added to the story in one extend.
+        bio_flowables = []
+        add, para, spacer = bio_flowables.append, Paragraph, Spacer
+        for line in format_clinical_lines(p.bio_narrative):
+            if line.startswith(_HEADER_OPEN): # It was a header
+                style = style_h3
             elif line.startswith('• '):
-                 Story.append(Paragraph(line, ParagraphStyle('persona_bull', parent=style_normal, leftIndent=15)))
+                style = style_bullet
             else:
-                 Story.append(Paragraph(line, style_normal))
-            Story.append(Spacer(1, 4))
+                style = style_normal
+            add(para(line, style))
+            add(spacer(1, 4))
+        Story.extend(bio_flowables)
         
     Story.append(Spacer(1, 20))
 
@@ -1500,19 +1679,105 @@ def create_persona_pdf(patient_id: str, patient_name: str, persona: object, gene
         Story.append(Paragraph("Full report PDFs contain complete details. Key findings are summarized below.", style_normal))
         Story.append(Spacer(1, 10))
 
+        add, para, escape = Story.append, Paragraph, html.escape
         for rep in (generated_reports or [])[:max_items]:
-            rep_title = rep.title_hint.replace('_', ' ').upper()
-            rep_date = _extract_report_date_hint(getattr(rep, "content", None))
+            rep_title = rep.title_hint.translate(_UNDERSCORE_TBL).upper()
+            # Parse JSON content once for both the date hint and the highlights
+            rep_content = getattr(rep, "content", None)
+            rep_data = _as_dict_content(rep_content)
+            if rep_data is not None:
+                rep_content = rep_data
+            rep_date = _extract_report_date_hint(rep_content)
             rep_header = f"► {rep_title}" + (f"  ({rep_date})" if rep_date else "")
-            Story.append(Paragraph(rep_header, style_h3))
+            add(para(rep_header, style_h3))
 
-            bullets = _extract_report_highlights(getattr(rep, "content", None), max_bullets=max_bullets, max_chars=max_chars)
+            bullets = _extract_report_highlights(rep_content, max_bullets=max_bullets, max_chars=max_chars)
             if not bullets:
                 bullets = ["See report PDF for details."]
             for b in bullets:
-                Story.append(Paragraph(f"• {html.escape(str(b))}", ParagraphStyle('persona_bull_s3', parent=style_normal, leftIndent=15)))
+                add(para(f"• {escape(str(b))}", style_bullet))
 
-            Story.append(Spacer(1, 10))
+            add(Spacer(1, 10))
 
     doc.build(Story)
+    io_backend.write_bytes(file_path, pdf_buffer.getbuffer())
     return file_path
+
+
+_BATCH_BUILDERS = {
+    "report": "create_patient_pdf",
+    "persona": "create_persona_pdf",
+    "concise_summary": "create_concise_summary_pdf",
+    "annotator_summary": "create_annotator_summary_pdf",
+    "patient_summary": "create_patient_summary_pdf",
+}
+
+
+def _pdf_worker(job: dict):
+    """Process-pool entry point: build one PDF and make sure its bytes are on disk."""
+    kwargs = dict(job)
+    builder = globals()[_BATCH_BUILDERS[kwargs.pop("kind", "report")]]
+    path = builder(**kwargs)
+    failures = io_backend.flush_writes()
+    if failures:
+        raise next(iter(failures.values()))
+    return path
+
+
+_PDF_POOL = None
+_PDF_POOL_WORKERS = 0
+_PDF_POOL_LOCK = threading.Lock()
+
+
+def _pdf_pool(workers: int):
+    """Process pool shared by every batch in this process (worker start-up is paid once)."""
+    global _PDF_POOL, _PDF_POOL_WORKERS
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None or _PDF_POOL_WORKERS != workers:
+            if _PDF_POOL is not None:
+                _PDF_POOL.shutdown(wait=False)
+            else:
+                atexit.register(shutdown_pdf_pool)
+            _PDF_POOL = ProcessPoolExecutor(max_workers=workers)
+            _PDF_POOL_WORKERS = workers
+        return _PDF_POOL
+
+
+def shutdown_pdf_pool():
+    """Stop the shared PDF worker processes (registered with atexit on first use)."""
+    global _PDF_POOL, _PDF_POOL_WORKERS
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is not None:
+            _PDF_POOL.shutdown(wait=True)
+        _PDF_POOL, _PDF_POOL_WORKERS = None, 0
+
+
+def create_pdfs_batch(jobs: list, max_workers: int = None) -> list:
+    """
+    Build independent PDFs across worker processes.
+
+    Each job is the keyword arguments of one builder plus an optional "kind"
+    ("report" by default; see _BATCH_BUILDERS). Arguments must be picklable.
+    Returns one entry per job, in order: the written path, or the exception
+    that job raised. Workers are kept alive between calls, so patients in one
+    run share the same pool; each worker builds its style caches lazily once.
+    """
+    if not jobs:
+        return []
+    from concurrent.futures.process import BrokenProcessPool
+
+    pool = _pdf_pool(max_workers or os.cpu_count() or 1)
+    futures = [pool.submit(_pdf_worker, job) for job in jobs]
+    results = []
+    for fut in futures:
+        try:
+            results.append(fut.result())
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed by the OS); start fresh next batch.
+            shutdown_pdf_pool()
+            results.append(e)
+        except Exception as e:
+            results.append(e)
+    return results
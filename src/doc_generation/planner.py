@@ -9,16 +9,12 @@ RULES_PATH = os.path.join(_BASE_DIR, "templates", "document_plan_rules.json")
 
 def ensure_debug_dir():
     try:
-        if not os.path.exists(DEBUG_DIR):
-            try:
-                os.makedirs(DEBUG_DIR, exist_ok=True)
-            except Exception as e:
-                # Ignore errors here to prevent blocking main flow
-                pass
-        elif not os.path.isdir(DEBUG_DIR):
-            print(f"⚠️ Warning: {DEBUG_DIR} is not a directory.")
+        os.makedirs(DEBUG_DIR, exist_ok=True)
+    except FileExistsError:
+        print(f"⚠️ Warning: {DEBUG_DIR} is not a directory.")
     except Exception as e:
-        print(f"⚠️ Could not ensure debug dir: {e}")
+        # Ignore errors here to prevent blocking main flow
+        pass
 
 def load_rules() -> Dict:
     """Loads document plan rules from the templates directory."""
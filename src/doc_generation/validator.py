@@ -1,5 +1,8 @@
 import re
 import json
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, List, Any
 
@@ -219,6 +222,45 @@ def validate_structure(document_text: Any) -> tuple[bool, list[str]]:
 
     return True, []
 
+# Bump whenever validate_structure's rules change so cached verdicts are discarded
+VALIDATOR_VERSION = "3"
+
+_VALIDATION_CACHE_MAX = 1024
+_validation_cache: "OrderedDict[bytes, tuple[bool, tuple[str, ...]]]" = OrderedDict()
+_validation_cache_lock = threading.Lock()
+
+def _content_key(document_text: str) -> bytes:
+    """16-byte BLAKE2b digest of the text, salted with VALIDATOR_VERSION."""
+    return hashlib.blake2b(
+        document_text.encode("utf-8", "surrogatepass"), digest_size=16, person=VALIDATOR_VERSION.encode()
+    ).digest()
+
+def validate_structure_cached(document_text: Any) -> tuple[bool, tuple[str, ...]]:
+    """
+    Memoized validate_structure for string content (identical boilerplate docs,
+    fix-retry path). Entries are keyed by a content digest so the cache never
+    pins full document bodies. Errors come back as a tuple so cached values
+    stay immutable.
+    """
+    if not isinstance(document_text, str):
+        is_valid, errors = validate_structure(document_text)
+        return is_valid, tuple(errors)
+
+    key = _content_key(document_text)
+    with _validation_cache_lock:
+        hit = _validation_cache.get(key)
+        if hit is not None:
+            _validation_cache.move_to_end(key)
+            return hit
+
+    is_valid, errors = validate_structure(document_text)
+    verdict = (is_valid, tuple(errors))
+    with _validation_cache_lock:
+        _validation_cache[key] = verdict
+        if len(_validation_cache) > _VALIDATION_CACHE_MAX:
+            _validation_cache.popitem(last=False)
+    return verdict
+
 def sanitize_narrative(text: str, identity_map: dict) -> str:
     """
     Scrub identity leaks from narrative text.
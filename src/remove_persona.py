@@ -1,24 +1,36 @@
+import os
 import sys
 import argparse
-from purge_manager import purge_patient
+
+# Run as a script (python src/remove_persona.py): make the `src` package importable
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils.purge_manager import purge_patient, purge_patients
 
 def main():
-    parser = argparse.ArgumentParser(description="Completely remove all data and history for a specific persona.")
-    parser.add_argument("patient_id", nargs="?", help="The ID of the patient/persona to remove.")
-    parser.add_argument("--force", "-f", action="store_true", help="Force removal without asking for confirmation.")
-    
+    parser = argparse.ArgumentParser(description="Completely remove all data and history for one or more personas.")
+    parser.add_argument("patient_ids", nargs="*", metavar="patient_id", help="ID(s) of the patient/persona to remove.")
+    parser.add_argument("--force", "-f", "--yes", "-y", action="store_true", help="Force removal without asking for confirmation.")
+
     args = parser.parse_args()
-    
-    patient_id = args.patient_id
-    if not patient_id:
-        patient_id = input("Enter Patient ID to remove: ").strip()
-        
-    if not patient_id:
+
+    patient_ids = args.patient_ids
+    if not patient_ids:
+        entered = input("Enter Patient ID(s) to remove (comma-separated): ").strip()
+        patient_ids = [p.strip() for p in entered.split(",") if p.strip()]
+
+    if not patient_ids:
         print("Error: Patient ID is required.")
         sys.exit(1)
-        
-    print(f"Starting removal process for patient '{patient_id}'...")
-    purge_patient(patient_id, force=args.force)
+
+    if len(patient_ids) == 1:
+        print(f"Starting removal process for patient '{patient_ids[0]}'...")
+        purge_patient(patient_ids[0], force=args.force)
+    else:
+        # One confirmation and one Patient DB rewrite for the whole batch
+        print(f"Starting removal process for {len(patient_ids)} patients...")
+        purge_patients(patient_ids, force=args.force)
     print("Removal process complete.")
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 import os
 import re
 import shutil
+import threading
+import time
 
 import datetime
 
@@ -11,6 +13,79 @@ from ..core.config import (
     get_patient_archive_folder,
 )
 
+# Per-process cache of directory listings: path -> (st_mtime_ns, pdf names, sub-directories).
+# A directory's mtime changes whenever an entry is added, removed or renamed,
+# so a matching mtime means the cached listing is still accurate -- unless the
+# change landed in the same timestamp tick as the scan. As in git's "racy" index
+# rule, a listing whose mtime is within _RACY_WINDOW_NS of the scan is not cached
+# (filesystem timestamps can be as coarse as 2s, e.g. FAT).
+_DIR_LISTING_CACHE: dict[str, tuple[int, list[str], list[str]]] = {}
+_DIR_LISTING_LOCK = threading.Lock()
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _iter_pdf_names(folder: str):
+    """Yield PDF file names under folder (recursively), reusing cached listings."""
+    stack = [folder]
+    while stack:
+        d = stack.pop()
+        try:
+            mtime_ns = os.stat(d).st_mtime_ns
+        except OSError:
+            with _DIR_LISTING_LOCK:
+                _DIR_LISTING_CACHE.pop(d, None)
+            continue
+        with _DIR_LISTING_LOCK:
+            cached = _DIR_LISTING_CACHE.get(d)
+        if cached is None or cached[0] != mtime_ns:
+            scan_ns = time.time_ns()
+            pdfs, subdirs = [], []
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.endswith(".pdf"):
+                            pdfs.append(entry.name)
+            except OSError:
+                continue
+            cached = (mtime_ns, pdfs, subdirs)
+            with _DIR_LISTING_LOCK:
+                if mtime_ns < scan_ns - _RACY_WINDOW_NS:
+                    _DIR_LISTING_CACHE[d] = cached
+                else:
+                    _DIR_LISTING_CACHE.pop(d, None)
+        yield from cached[1]
+        stack.extend(cached[2])
+
+
+def invalidate_listing_cache(folder: str | None = None):
+    """Drop the cached listing for folder, or every cached listing when folder is None."""
+    with _DIR_LISTING_LOCK:
+        if folder is None:
+            _DIR_LISTING_CACHE.clear()
+        else:
+            _DIR_LISTING_CACHE.pop(folder, None)
+
+
+def ensure_dir(path: str):
+    """os.makedirs(path, exist_ok=True). Not memoised: folders can vanish under a
+    long-running process (purge, archive moves, manual deletes)."""
+    os.makedirs(path, exist_ok=True)
+
+
+def _matching_pdf_names(patient_id: str, prefix_patterns: list[str]):
+    prefixes = tuple(prefix_patterns)
+    for d in (get_patient_report_folder(patient_id), get_patient_summary_folder(patient_id)):
+        for fname in _iter_pdf_names(d):
+            if fname.startswith(prefixes):
+                yield fname
+
+
+# "-v<major>" marker in versioned output names, e.g. DOC-221-v2.1-003-....pdf
+_RE_MAJOR_VERSION = re.compile(r"-v(\d+)")
+
+
 def get_latest_major_version(patient_id: str) -> int:
     """
     Scan the document directories for existing files for this patient.
@@ -27,19 +102,10 @@ def get_latest_major_version(patient_id: str) -> int:
         f"Concise_Summary_Patient_{patient_id}",
     ]
     
-    dirs_to_check = [
-        get_patient_report_folder(patient_id),
-        get_patient_summary_folder(patient_id)
-    ]
-    
-    for d in dirs_to_check:
-        if os.path.isdir(d):
-            for root, _, files in os.walk(d):
-                for fname in files:
-                    if fname.endswith(".pdf") and any(fname.startswith(p) for p in prefix_patterns):
-                        m = re.search(r"-v(\d+)", fname)
-                        if m:
-                            max_v = max(max_v, int(m.group(1)))
+    for fname in _matching_pdf_names(patient_id, prefix_patterns):
+        m = _RE_MAJOR_VERSION.search(fname)
+        if m:
+            max_v = max(max_v, int(m.group(1)))
                             
     return max_v
 
@@ -57,20 +123,12 @@ def get_document_minor_version(patient_id: str, major_version: int) -> int:
         f"Concise_Summary_Patient_{patient_id}",
     ]
     
-    dirs_to_check = [
-        get_patient_report_folder(patient_id),
-        get_patient_summary_folder(patient_id)
-    ]
-    
-    for d in dirs_to_check:
-        if os.path.isdir(d):
-            for root, _, files in os.walk(d):
-                for fname in files:
-                    if fname.endswith(".pdf") and any(fname.startswith(p) for p in prefix_patterns):
-                        # Pattern extracts the minor version e.g. -v2.1 -> 1
-                        m = re.search(rf"-v{major_version}\.(\d+)", fname)
-                        if m:
-                            max_minor = max(max_minor, int(m.group(1)))
+    # Pattern extracts the minor version e.g. -v2.1 -> 1
+    minor_re = re.compile(rf"-v{major_version}\.(\d+)")
+    for fname in _matching_pdf_names(patient_id, prefix_patterns):
+        m = minor_re.search(fname)
+        if m:
+            max_minor = max(max_minor, int(m.group(1)))
                             
     return max_minor + 1
 
@@ -100,6 +158,7 @@ def _archive_files_in_dir(folder: str, patient_id: str, prefix_patterns: list[st
                 print(f"      ⚠️  Archive move failed for {fname}: {e}")
 
     if moved:
+        invalidate_listing_cache(folder)
         print(f"      📦 Archived {moved} file(s) from {os.path.basename(folder)}/")
 
 
@@ -0,0 +1,102 @@
+"""
+io_backend.py
+=============
+Pluggable writer for generated output files (PDF bytes, images).
+
+Backends (selected via the PDG_IO env var):
+  - "sync"    (default): plain blocking write per file.
+  - "threads": hands each write to a small thread pool (PDG_IO_DEPTH workers,
+               os.pwrite releases the GIL) so bulk PDF output overlaps disk I/O
+               with rendering. Needs POSIX os.pwrite; elsewhere it silently
+               falls back to "sync".
+
+Callers hand over finished bytes with write_bytes() and must call
+flush_writes() before relying on the files being on disk. Pending writes are
+tracked per thread, so concurrent patient workflows (CLI --concurrency, API
+jobs) each flush, and see the failures of, only their own files.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+IO_BACKEND = os.getenv("PDG_IO", "sync").strip().lower()
+IO_QUEUE_DEPTH = max(1, int(os.getenv("PDG_IO_DEPTH", "8") or "8"))
+
+_executor = None
+_lock = threading.Lock()
+_local = threading.local()  # .pending: [(path, future)] queued by this thread
+
+
+def threaded_writes_supported() -> bool:
+    """The threaded backend writes with os.pwrite, which only exists on POSIX."""
+    return hasattr(os, "pwrite")
+
+
+def _use_threaded_writes() -> bool:
+    return IO_BACKEND == "threads" and threaded_writes_supported()
+
+
+def _write_file(path: str, data: bytes):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            offset += os.pwrite(fd, view[offset:], offset)
+    except BaseException:
+        os.close(fd)
+        # Never leave a truncated PDF behind
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+    os.close(fd)
+
+
+def write_bytes(path: str, data: bytes):
+    """
+    Write data (bytes or any buffer, e.g. BytesIO.getbuffer()) to path using the configured backend.
+    Returns the pending Future for an async write, or None once a sync write has finished.
+    """
+    global _executor
+    if not _use_threaded_writes():
+        with open(path, "wb") as f:
+            f.write(data)
+        return None
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=IO_QUEUE_DEPTH, thread_name_prefix="pdg-io")
+    fut = _executor.submit(_write_file, path, data)
+    pending = getattr(_local, "pending", None)
+    if pending is None:
+        pending = _local.pending = []
+    pending.append((path, fut))
+    return fut
+
+
+def flush_writes() -> dict:
+    """
+    Block until every write queued by the calling thread has completed.
+    Returns {path: exception} for the writes that failed (empty when all landed).
+    """
+    pending = getattr(_local, "pending", None)
+    if not pending:
+        return {}
+    _local.pending = []
+    failures = {}
+    for path, fut in pending:
+        try:
+            fut.result()
+        except Exception as e:
+            failures[path] = e
+    return failures
+
+
+__all__ = [
+    "IO_BACKEND",
+    "threaded_writes_supported",
+    "write_bytes",
+    "flush_writes",
+]
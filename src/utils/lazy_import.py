@@ -0,0 +1,57 @@
+"""
+lazy_import.py
+==============
+Deferred module imports for the heavy dependencies (reportlab, OpenAI/Vertex
+SDKs, pandas) so paths that never touch them — `--help`, purge, status checks —
+start quickly.
+
+    pdf_generator = lazy_module("src.doc_generation.pdf_generator")
+    pdf_generator.create_patient_pdf(...)   # imported on first attribute access
+
+The first access imports the real module under a lock, so concurrent batch
+workers never race on a half-initialised import.
+"""
+
+import importlib
+import threading
+
+
+class LazyModule:
+    """Stand-in that imports the named module the first time an attribute is read."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+                module = self._module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        # Proxy state lives in underscore attributes; everything else (e.g. a
+        # module-level flag toggled from the CLI) is set on the real module.
+        if attr.startswith("_"):
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Return a LazyModule for the absolute module name."""
+    return LazyModule(name)
+
+
+__all__ = ["LazyModule", "lazy_module"]
@@ -1,8 +1,11 @@
 import os
 import shutil
-import glob
+import re
 import json
+import fnmatch
+import functools
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from ..core import patient_db
 from ..core.config import (
     OUTPUT_DIR,
@@ -17,6 +20,196 @@ from ..core.config import (
 )
 DB_PATH = patient_db.DB_PATH
 
+# orjson parses/serialises the Patient DB several times faster when installed
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+def _rmtree(path: str) -> bool:
+    """Remove path recursively. Returns False if it did not exist (no separate exists() stat)."""
+    try:
+        shutil.rmtree(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _clear_dir(path: str) -> bool:
+    """Empty path in place (one scandir pass) instead of rmtree + makedirs. False if missing."""
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _remove_file(path: str) -> bool:
+    """os.remove path. Returns False if it did not exist."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+# Bulk deletes of at least this many files overlap their unlink syscalls on a
+# small thread pool (os.remove releases the GIL); smaller batches stay serial.
+_PARALLEL_UNLINK_MIN = 64
+_UNLINK_WORKERS = 8
+
+
+def _remove_files(paths: list[str]) -> tuple[list[str], OSError | None]:
+    """
+    os.remove every path, in parallel for large batches.
+    Returns (removed paths, first failure or None); the serial branch stops at the first failure.
+    """
+    removed = []
+    if len(paths) < _PARALLEL_UNLINK_MIN or os.name == "nt":
+        for p in paths:
+            try:
+                os.remove(p)
+            except OSError as e:
+                return removed, e
+            removed.append(p)
+        return removed, None
+
+    def _try_remove(path: str) -> OSError | None:
+        try:
+            os.remove(path)
+        except OSError as e:
+            return e
+        return None
+
+    first_error = None
+    with ThreadPoolExecutor(max_workers=_UNLINK_WORKERS, thread_name_prefix="pdg-purge") as ex:
+        for p, err in zip(paths, ex.map(_try_remove, paths)):
+            if err is None:
+                removed.append(p)
+            elif first_error is None:
+                first_error = err
+    return removed, first_error
+
+
+def _print_deleted(paths: list[str], label: str = "Deleted"):
+    """Report a batch of deletions with one print (one stdout write + flush) instead of one per file."""
+    if paths:
+        print("\n".join(f"      ✅ {label}: {os.path.basename(p)}" for p in paths))
+
+
+def _delete_and_report(paths: list[str], label: str = "Deleted") -> int:
+    """Remove paths and report the ones that went, then re-raise the first failure (if any)."""
+    removed, error = _remove_files(paths)
+    _print_deleted(removed, label)
+    if error is not None:
+        raise error
+    return len(removed)
+
+
+def _file_names(dirpath: str) -> list[str]:
+    """Names of the regular files directly inside dirpath (one scandir pass; [] if missing)."""
+    try:
+        with os.scandir(dirpath) as it:
+            return [e.name for e in it if e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+@functools.lru_cache(maxsize=None)
+def _pattern_regex(patterns: tuple):
+    """One compiled matcher for a tuple of glob-style filename patterns."""
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+def _patient_files(*patterns: str) -> list[str]:
+    """Paths of files directly inside each patient folder whose names match any pattern.
+
+    One scandir pass per folder against a single cached regex, instead of a
+    glob per folder per pattern. Hidden files are skipped, as glob does.
+    """
+    match = _pattern_regex(patterns).match
+    files = []
+    try:
+        with os.scandir(PATIENT_DATA_DIR) as folders:
+            for folder in folders:
+                if not folder.is_dir():
+                    continue
+                with os.scandir(folder.path) as it:
+                    files.extend(
+                        e.path for e in it
+                        if not e.name.startswith(".") and match(e.name) and e.is_file()
+                    )
+    except FileNotFoundError:
+        pass
+    return files
+
+
+_SUMMARY_PATTERNS = (
+    "Clinical_Summary_Patient_*.pdf",
+    "Annotator_Summary_Patient_*.pdf",
+    "Concise_Summary_Patient_*.pdf",
+)
+
+
+def _load_db() -> dict:
+    # A missing DB raises FileNotFoundError, an IOError, so it also falls through to {}
+    try:
+        if _orjson is not None:
+            with open(DB_PATH, 'rb') as f:
+                return _orjson.loads(f.read())
+        with open(DB_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (ValueError, IOError):
+        # orjson.JSONDecodeError and json.JSONDecodeError both subclass ValueError
+        return {}
+
+
+def _write_db_bytes(payload: bytes):
+    """Replace the DB file atomically: readers see the old or the new JSON, never a partial write."""
+    tmp_path = f"{DB_PATH}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, DB_PATH)
+
+
+def _save_db(data: dict):
+    if _orjson is not None:
+        _write_db_bytes(_orjson.dumps(data, option=_orjson.OPT_INDENT_2))
+    else:
+        _write_db_bytes(json.dumps(data, indent=2).encode('utf-8'))
+
+
+def _reset_db():
+    _write_db_bytes(b"{}")
+
+
+def _remove_db_entries(patient_ids: list[str], mode: str = "delete"):
+    """Drop several patients from the DB with a single read and a single rewrite."""
+    data = _load_db()
+    removed = False
+    for patient_id in patient_ids:
+        key = str(patient_id)
+        if key not in data:
+            print(f"      ℹ️  ID {patient_id} not found in DB.")
+            continue
+        if mode == "archive":
+            archive_dir = _archive_dir_for_patient(patient_id)
+            archive_path = os.path.join(archive_dir, f"patient_{patient_id}_db.json")
+            with open(archive_path, "w", encoding="utf-8") as f:
+                json.dump(data[key], f, indent=2)
+            print(f"      ✅ Archived DB entry: {os.path.basename(archive_path)}")
+        del data[key]
+        removed = True
+        print(f"      ✅ Removed from DB: {patient_id}")
+    if removed:
+        _save_db(data)
+
+
 def confirm_action(message: str, force: bool = False) -> bool:
     """Asks user for confirmation, or skips if force=True."""
     if force: return True
@@ -64,105 +257,95 @@ def purge_patient_selective(patient_id: str, targets: list[str], mode: str = "de
     p_root = get_patient_root(patient_id)
     p_summary = get_patient_summary_folder(patient_id)
 
+    # One directory listing per folder, shared by the report/persona/summary filters
+    root_names = _file_names(p_root) if {"reports", "persona", "summary"} & set(targets) else []
+
     # Reports
     if "reports" in targets:
-        report_files = glob.glob(os.path.join(p_root, f"DOC-{patient_id}-*.pdf"))
+        prefix = f"DOC-{patient_id}-"
+        report_files = [
+            os.path.join(p_root, n) for n in root_names
+            if n.startswith(prefix) and n.endswith(".pdf")
+        ]
         if mode == "archive":
             _archive_files_for_patient(report_files, patient_id, f"{patient_id}_reports")
         else:
-            for f in report_files:
-                os.remove(f)
-                print(f"      ✅ Deleted: {os.path.basename(f)}")
+            _delete_and_report(report_files)
 
     # Personas
     if "persona" in targets:
-        persona_files = glob.glob(os.path.join(p_root, f"{patient_id}-*persona*.pdf"))
+        prefix = f"{patient_id}-"
+        persona_files = [
+            os.path.join(p_root, n) for n in root_names
+            if n.startswith(prefix) and n.endswith(".pdf") and "persona" in n[len(prefix):-4]
+        ]
         if mode == "archive":
             _archive_files_for_patient(persona_files, patient_id, f"{patient_id}_persona")
         else:
-            for f in persona_files:
-                os.remove(f)
-                print(f"      ✅ Deleted: {os.path.basename(f)}")
+            _delete_and_report(persona_files)
 
     # Summaries
     if "summary" in targets:
         # Search both root (legacy) and dedicated summary folder
-        summary_files = glob.glob(os.path.join(p_root, f"Clinical_Summary_Patient_{patient_id}*.pdf"))
-        summary_files.extend(glob.glob(os.path.join(p_root, f"Annotator_Summary_Patient_{patient_id}*.pdf")))
-        summary_files.extend(glob.glob(os.path.join(p_root, f"Concise_Summary_Patient_{patient_id}*.pdf")))
-        if os.path.exists(p_summary):
-            summary_files.extend(glob.glob(os.path.join(p_summary, f"Clinical_Summary_Patient_{patient_id}*.pdf")))
-            summary_files.extend(glob.glob(os.path.join(p_summary, f"Annotator_Summary_Patient_{patient_id}*.pdf")))
-            summary_files.extend(glob.glob(os.path.join(p_summary, f"Concise_Summary_Patient_{patient_id}*.pdf")))
+        prefixes = (
+            f"Clinical_Summary_Patient_{patient_id}",
+            f"Annotator_Summary_Patient_{patient_id}",
+            f"Concise_Summary_Patient_{patient_id}",
+        )
+        summary_files = []
+        for folder, names in ((p_root, root_names), (p_summary, _file_names(p_summary))):
+            summary_files.extend(
+                os.path.join(folder, n) for n in names
+                if n.startswith(prefixes) and n.endswith(".pdf")
+            )
         
         if mode == "archive":
             _archive_files_for_patient(summary_files, patient_id, f"{patient_id}_summary")
         else:
+            deleted = []
             for f in summary_files:
                 try:
                     os.remove(f)
-                    print(f"      ✅ Deleted: {os.path.basename(f)}")
+                    deleted.append(f)
                 except Exception:
                     pass
-                    pass
+            _print_deleted(deleted)
 
     # Logs
     if "logs" in targets:
         logs_dir = get_patient_logs_folder(patient_id)
-        if os.path.exists(logs_dir):
-            if mode == "archive":
+        if mode == "archive":
+            if os.path.isdir(logs_dir):
                 _archive_files_for_patient(
-                    glob.glob(os.path.join(logs_dir, "*")),
+                    [os.path.join(logs_dir, n) for n in _file_names(logs_dir) if not n.startswith(".")],
                     patient_id,
                     f"{patient_id}_logs",
                 )
-            else:
-                shutil.rmtree(logs_dir)
-                print(f"      ✅ Deleted: {logs_dir}/")
+        elif _rmtree(logs_dir):
+            print(f"      ✅ Deleted: {logs_dir}/")
 
     # Debug state
     if "debug" in targets:
         debug_state = os.path.join(DEBUG_DIR, f"patient_state_{patient_id}.json")
-        if os.path.exists(debug_state):
-            if mode == "archive":
+        if mode == "archive":
+            if os.path.exists(debug_state):
                 _archive_files_for_patient([debug_state], patient_id, f"{patient_id}_debug")
-            else:
-                os.remove(debug_state)
-                print(f"      ✅ Deleted: {os.path.basename(debug_state)}")
+        elif _remove_file(debug_state):
+            print(f"      ✅ Deleted: {os.path.basename(debug_state)}")
 
     # Records
     if "records" in targets:
         record_dir = get_patient_records_folder(patient_id)
         record_file = os.path.join(record_dir, f"{patient_id}-record.txt")
-        if os.path.exists(record_file):
-            if mode == "archive":
+        if mode == "archive":
+            if os.path.exists(record_file):
                 _archive_files_for_patient([record_file], patient_id, f"{patient_id}_records")
-            else:
-                os.remove(record_file)
-                print(f"      ✅ Deleted: {os.path.basename(record_file)}")
+        elif _remove_file(record_file):
+            print(f"      ✅ Deleted: {os.path.basename(record_file)}")
 
     # DB entry
     if "db" in targets:
-        data = {}
-        if os.path.exists(DB_PATH):
-            try:
-                with open(DB_PATH, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                data = {}
-        if str(patient_id) in data:
-            if mode == "archive":
-                archive_dir = _archive_dir_for_patient(patient_id)
-                archive_path = os.path.join(archive_dir, f"patient_{patient_id}_db.json")
-                with open(archive_path, "w", encoding="utf-8") as f:
-                    json.dump(data[str(patient_id)], f, indent=2)
-                print(f"      ✅ Archived DB entry: {os.path.basename(archive_path)}")
-            del data[str(patient_id)]
-            with open(DB_PATH, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            print(f"      ✅ Removed from DB: {patient_id}")
-        else:
-            print(f"      ℹ️  ID {patient_id} not found in DB.")
+        _remove_db_entries([patient_id], mode)
 
     print(f"\n   ✨ Patient {patient_id} Purge Complete.")
 
@@ -183,15 +366,12 @@ def purge_all(force: bool = False):
     print("\n   🗑️  Purging ALL Data...")
     
     # 1. Patient Data
-    if os.path.exists(PATIENT_DATA_DIR):
-        shutil.rmtree(PATIENT_DATA_DIR)
-        os.makedirs(PATIENT_DATA_DIR)
+    if _clear_dir(PATIENT_DATA_DIR):
         print(f"      ✅ Deleted: {PATIENT_DATA_DIR}/")
 
     # 5. Patient DB
     try:
-        with open(DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump({}, f)
+        _reset_db()
         print(f"      ✅ Reset: {DB_PATH}")
     except IOError:
         print(f"      ⚠️  Could not reset DB at {DB_PATH}")
@@ -199,12 +379,10 @@ def purge_all(force: bool = False):
     # 2. Additional Folders
     for d in ["logs", "metadata", "archive", "summary"]:
         target_dir = os.path.join(OUTPUT_DIR, d)
-        if os.path.exists(target_dir):
-            shutil.rmtree(target_dir)
+        if _rmtree(target_dir):
             print(f"      ✅ Deleted: {target_dir}/")
     
-    if os.path.exists(DEBUG_DIR):
-        shutil.rmtree(DEBUG_DIR)
+    if _rmtree(DEBUG_DIR):
         print(f"      ✅ Deleted: {DEBUG_DIR}/")
 
     print("\n   ✨ Purge Complete.")
@@ -223,19 +401,14 @@ def purge_personas(force: bool = False):
 
     # 1. DB
     try:
-        with open(DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump({}, f)
+        _reset_db()
         print(f"      ✅ Reset: {DB_PATH}")
     except IOError:
         print(f"      ⚠️  Could not reset DB at {DB_PATH}")
 
     # 2. Personas Files
-    if os.path.exists(PATIENT_DATA_DIR):
-        for folder in os.listdir(PATIENT_DATA_DIR):
-            p_root = os.path.join(PATIENT_DATA_DIR, folder)
-            for f in glob.glob(os.path.join(p_root, "*-persona-*.pdf")):
-                os.remove(f)
-                print(f"      ✅ Deleted: {os.path.basename(f)}")
+    persona_files = _patient_files("*-persona-*.pdf")
+    _delete_and_report(persona_files)
     
     print("\n   ✨ Personas Purged.")
 
@@ -250,17 +423,14 @@ def purge_documents(force: bool = False):
     print("\n   🗑️  Purging Documents (Preserving Personas)...")
     
     if os.path.exists(PATIENT_DATA_DIR):
-        for folder in os.listdir(PATIENT_DATA_DIR):
-            p_root = os.path.join(PATIENT_DATA_DIR, folder)
-            for pattern in ["Clinical_Summary_Patient_*.pdf", "Annotator_Summary_Patient_*.pdf", "Concise_Summary_Patient_*.pdf"]:
-                for f in glob.glob(os.path.join(p_root, pattern)):
-                    os.remove(f)
+        summary_files = _patient_files(*_SUMMARY_PATTERNS)
+        _, error = _remove_files(summary_files)
+        if error is not None:
+            raise error
         
         # Also clear dedicated summary folder
-        if os.path.exists(SUMMARY_DIR):
-            shutil.rmtree(SUMMARY_DIR)
-            os.makedirs(SUMMARY_DIR)
-            
+        _clear_dir(SUMMARY_DIR)
+
         print(f"      ✅ Cleared reports + summaries.")
     
     print("\n   ✨ Documents Purged.")
@@ -277,19 +447,11 @@ def purge_summaries_only(force: bool = False):
     
     count = 0
     # 1. Clear summary PDFs inside patient folders (legacy)
-    if os.path.exists(PATIENT_DATA_DIR):
-        for folder in os.listdir(PATIENT_DATA_DIR):
-            p_root = os.path.join(PATIENT_DATA_DIR, folder)
-            for pattern in ["Clinical_Summary_Patient_*.pdf", "Annotator_Summary_Patient_*.pdf", "Concise_Summary_Patient_*.pdf"]:
-                for f in glob.glob(os.path.join(p_root, pattern)):
-                    os.remove(f)
-                    count += 1
-                    print(f"      ✅ Deleted (legacy): {os.path.basename(f)}")
+    summary_files = _patient_files(*_SUMMARY_PATTERNS)
+    count += _delete_and_report(summary_files, "Deleted (legacy)")
     
     # 2. Clear dedicated summary folder
-    if os.path.exists(SUMMARY_DIR):
-        shutil.rmtree(SUMMARY_DIR)
-        os.makedirs(SUMMARY_DIR)
+    if _clear_dir(SUMMARY_DIR):
         print(f"      ✅ Wiped dedicated summary folder: {SUMMARY_DIR}/")
     
     print(f"\n   ✨ Deleted {count} summary file(s).")
@@ -305,14 +467,8 @@ def purge_reports_only(force: bool = False):
     print("\n   🗑️  Purging Reports Only...")
     
     count = 0
-    if os.path.exists(PATIENT_DATA_DIR):
-        for folder in os.listdir(PATIENT_DATA_DIR):
-            p_root = os.path.join(PATIENT_DATA_DIR, folder)
-            report_files = glob.glob(os.path.join(p_root, "DOC-*.pdf"))
-            for f in report_files:
-                os.remove(f)
-                count += 1
-                print(f"      ✅ Deleted: {os.path.basename(f)}")
+    report_files = _patient_files("DOC-*.pdf")
+    count += _delete_and_report(report_files)
     
     print(f"\n   ✨ Deleted {count} report file(s).")
 
@@ -327,21 +483,38 @@ def purge_reports_and_summaries(force: bool = False):
     print("\n   🗑️  Purging Reports and Summaries...")
     
     if os.path.exists(PATIENT_DATA_DIR):
-        for folder in os.listdir(PATIENT_DATA_DIR):
-            p_root = os.path.join(PATIENT_DATA_DIR, folder)
-            for pattern in ["Clinical_Summary_Patient_*.pdf", "Annotator_Summary_Patient_*.pdf", "Concise_Summary_Patient_*.pdf"]:
-                for f in glob.glob(os.path.join(p_root, pattern)):
-                    os.remove(f)
+        summary_files = _patient_files(*_SUMMARY_PATTERNS)
+        _, error = _remove_files(summary_files)
+        if error is not None:
+            raise error
         
         # Also clear dedicated summary folder
-        if os.path.exists(SUMMARY_DIR):
-            shutil.rmtree(SUMMARY_DIR)
-            os.makedirs(SUMMARY_DIR)
-            
+        _clear_dir(SUMMARY_DIR)
+
         print(f"      ✅ Deleted: reports + summaries.")
     
     print("\n   ✨ Reports and Summaries Purged.")
 
+def purge_patients(patient_ids: list[str], force: bool = False):
+    """
+    Clears all data for several patients (same targets as purge_patient),
+    confirming once and rewriting the Patient DB once for the whole batch.
+    """
+    if not patient_ids:
+        return
+    ids = ", ".join(str(p) for p in patient_ids)
+    if not confirm_action(f"This will delete ALL data for Patient IDs: {ids}.", force=force):
+        print("   ❌ Operation Cancelled.")
+        return
+
+    file_targets = ["persona", "reports", "summary", "logs", "records", "debug"]
+    for patient_id in patient_ids:
+        purge_patient_selective(patient_id, file_targets, mode="delete", force=True)
+
+    print(f"\n   🗑️  Removing {len(patient_ids)} patient(s) from DB...")
+    _remove_db_entries(patient_ids, mode="delete")
+    print("\n   ✨ Batch Purge Complete.")
+
 def purge_patient(patient_id: str, force: bool = False):
     """
     Clears data for a SPECIFIC patient:
@@ -1,20 +1,24 @@
 import json
+import logging
 import os
 import re
 import datetime
 import html as html_lib
+import shutil
+import threading
 import traceback
 import types
+from concurrent.futures import ThreadPoolExecutor
 
 from .data import loader as data_loader
 from .ai import client as ai_engine
-from .doc_generation import pdf_generator
+from .utils.lazy_import import lazy_module
 from .data import history as history_manager
 from .core import patient_db
 from .data import patient_record_writer
 from .core import state as state_manager
 from .doc_generation import planner as document_planner
-from .doc_generation.validator import validate_structure, format_clinical_document
+from .doc_generation.validator import validate_structure_cached, format_clinical_document
 from .core.config import (
     get_patient_report_folder,
     get_patient_persona_folder,
@@ -23,6 +27,52 @@ from .core.config import (
     MAX_SUPPORTING_DOCUMENTS,
 )
 from .utils.file_utils import get_latest_major_version, get_document_minor_version, archive_patient_files, sanitize_filename_component
+from .utils import io_backend
+
+# reportlab is only needed once a PDF is actually built
+pdf_generator = lazy_module(f"{__package__}.doc_generation.pdf_generator")
+
+# Per-document progress lines (image fetched, AI fix applied, file written) are
+# printed only at LOG_LEVEL=INFO or lower; checked before the message is built.
+DOC_DETAIL_LOGS = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper()) in (logging.DEBUG, logging.INFO)
+
+
+def set_doc_detail_logs(enabled: bool) -> bool:
+    """Toggle per-document progress lines; returns the previous setting."""
+    global DOC_DETAIL_LOGS
+    previous, DOC_DETAIL_LOGS = DOC_DETAIL_LOGS, bool(enabled)
+    return previous
+
+# Documents of one patient whose AI fix / image generation may run concurrently
+REPORT_WORKERS = max(1, int(os.getenv("PDG_REPORT_WORKERS", "4") or "4"))
+
+# Worker processes for building a patient's report PDFs; 0/1 builds them serially
+# on the calling thread. ReportLab's layout is CPU-bound, so threads don't help here.
+PDF_PROCESSES = max(0, int(os.getenv("PDG_PDF_PROCESSES", "0") or "0"))
+
+# A new persona whose name is still taken (despite the used-names list in the prompt)
+# is regenerated up to this many times; after that the last payload is kept.
+NAME_CLASH_RETRIES = 1
+# Guards check-and-append on a shared excluded_names list (concurrent '*' batch runs)
+_NAMES_LOCK = threading.Lock()
+
+
+def _reserve_name(excluded_names: list[str], full_name: str) -> bool:
+    """Atomically claim full_name in excluded_names. False if another patient already has it."""
+    key = full_name.strip().lower()
+    with _NAMES_LOCK:
+        if any(n.strip().lower() == key for n in excluded_names):
+            return False
+        excluded_names.append(full_name)
+        return True
+
+
+def _taken_names(excluded_names: list[str] | None) -> list[str] | None:
+    """Snapshot of excluded_names for a prompt (the shared list keeps growing)."""
+    if not excluded_names:
+        return None
+    with _NAMES_LOCK:
+        return list(excluded_names)
 
 
 def _is_policy_criteria_doc(doc) -> bool:
@@ -60,6 +110,87 @@ def _is_core_document(doc) -> bool:
     return False
 
 
+_IMAGING_KEYWORDS = ("ECG", "XRAY", "X-RAY", "MRI", "CT", "ULTRASOUND", "ECHO", "RADIOGRAPH", "SCAN")
+# Word boundaries keep 'CT' from matching 'ACTION'
+_IMAGING_RE = re.compile(r"\b(?:" + "|".join(re.escape(kw) for kw in _IMAGING_KEYWORDS) + r")\b")
+
+
+def _imaging_keyword(title_hint) -> str | None:
+    """
+    Return the imaging keyword for a document title (first in _IMAGING_KEYWORDS
+    order), or None when the title does not describe an imaging study.
+    """
+    found = set(_IMAGING_RE.findall(str(title_hint).upper()))
+    if not found:
+        return None
+    return next(kw for kw in _IMAGING_KEYWORDS if kw in found)
+
+
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def _http_session():
+    """Shared requests.Session with a pooled, retrying adapter for image downloads."""
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=20,
+                pool_maxsize=20,
+                max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+
+def _materialize_generated_image(img_result: str | None, image_path: str) -> str | None:
+    """
+    Make sure the image returned by generate_clinical_image ends up at image_path.
+    URLs are streamed to disk; a local file written elsewhere is hardlinked
+    (falling back to a copy across filesystems) instead of being re-read.
+    """
+    if not img_result:
+        return None
+    try:
+        if img_result.startswith("http"):
+            with _http_session().get(img_result, stream=True, timeout=30) as resp:
+                resp.raise_for_status()
+                resp.raw.decode_content = True
+                with open(image_path, "wb") as handler:
+                    shutil.copyfileobj(resp.raw, handler, length=64 * 1024)
+            return image_path
+        if os.path.abspath(img_result) != os.path.abspath(image_path):
+            try:
+                os.link(img_result, image_path)
+            except OSError:
+                shutil.copy(img_result, image_path)
+        return image_path
+    except Exception as e:
+        print(f"      ⚠️  Could not place generated image at {image_path}: {e}")
+        return None
+
+
+
+
+def _drop_failed_writes(docs_written: list[str]):
+    """Wait for this thread's queued PDF writes and drop any that failed from docs_written."""
+    failures = io_backend.flush_writes()
+    if not failures:
+        return
+    failed = set()
+    for path, err in failures.items():
+        name = os.path.basename(path)
+        failed.add(name)
+        print(f"   ❌ Deferred PDF write failed for {name}: {err}")
+    docs_written[:] = [name for name in docs_written if name not in failed]
 
 
 def _apply_insurance_overrides(persona, patient_state: dict | None):
@@ -184,24 +315,81 @@ def load_existing_context(patient_id: str, generation_mode: dict) -> dict:
     # Load existing reports only when we are NOT regenerating them
     if not generation_mode.get("reports", False):
         patient_report_folder = get_patient_report_folder(patient_id)
-        if os.path.exists(patient_report_folder):
-            report_files = [
-                f for f in os.listdir(patient_report_folder)
-                if f.endswith(".pdf") and f.startswith(f"DOC-{patient_id}-")
-            ]
+        report_prefix = f"DOC-{patient_id}-"
+        try:
+            with os.scandir(patient_report_folder) as it:
+                report_files = [
+                    e.name for e in it
+                    if e.name.endswith(".pdf") and e.name.startswith(report_prefix)
+                ]
             context["reports"] = report_files[:5]  # cap for prompt size
+        except (FileNotFoundError, NotADirectoryError):
+            pass
 
     # Load existing summary only when we are NOT regenerating it
     if not generation_mode.get("summary", False):
         summary_folder = get_patient_summary_folder(patient_id)
-        if os.path.isdir(summary_folder):
-            for f in os.listdir(summary_folder):
-                if f.endswith(".pdf") and f.startswith(f"Clinical_Summary_Patient_{patient_id}"):
-                    context["summary"] = os.path.join(summary_folder, f)
-                    break
+        summary_prefix = f"Clinical_Summary_Patient_{patient_id}"
+        try:
+            with os.scandir(summary_folder) as it:
+                for e in it:
+                    if e.name.endswith(".pdf") and e.name.startswith(summary_prefix):
+                        context["summary"] = e.path
+                        break
+        except (FileNotFoundError, NotADirectoryError):
+            pass
 
     return context
 
+
+_PDF_SUFFIXES = (".pdf",)
+
+
+def _folder_has_pdf(folder: str, prefix: str = "", contains: str = "") -> bool:
+    """
+    Return True if folder holds a PDF whose (case-folded) name starts with
+    prefix and contains the given marker. Missing folders count as empty.
+    """
+    prefix = prefix.lower()
+    contains = contains.lower()
+    lower, endswith, startswith = str.lower, str.endswith, str.startswith
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                low = lower(entry.name)
+                if endswith(low, _PDF_SUFFIXES) and startswith(low, prefix) and contains in low:
+                    return True
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return False
+
+
+def _root_outputs_present(folder: str, patient_id: str, want_persona: bool, want_reports: bool) -> tuple[bool, bool]:
+    """
+    Single scandir pass over the patient root that stops at the first entry
+    completing the requested set. Returns (persona_found, report_found).
+    """
+    need_persona = want_persona
+    need_reports = want_reports
+    report_prefix = f"doc-{patient_id}-".lower()
+    lower, endswith, startswith = str.lower, str.endswith, str.startswith
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                low = lower(entry.name)
+                if not endswith(low, _PDF_SUFFIXES):
+                    continue
+                if need_persona and "-persona" in low:
+                    need_persona = False
+                if need_reports and startswith(low, report_prefix):
+                    need_reports = False
+                if not (need_persona or need_reports):
+                    break
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return want_persona and not need_persona, want_reports and not need_reports
+
+
 def check_patient_sync_status(patient_id: str, generation_mode: dict) -> bool:
     """
     Return True if ALL documents requested in the generation_mode are already present.
@@ -216,35 +404,19 @@ def check_patient_sync_status(patient_id: str, generation_mode: dict) -> bool:
     has_report   = not req_reports
     has_summary  = not req_summary
 
-    # Check Persona
-    if req_persona:
-        persona_folder = get_patient_persona_folder(patient_id)
-        if os.path.isdir(persona_folder):
-            has_persona = any(
-                f.endswith(".pdf") and "-persona" in f
-                for f in os.listdir(persona_folder)
-                if f != "archive"
-            )
-
-    # Check Reports
-    if req_reports:
-        rpt_folder = get_patient_report_folder(patient_id)
-        if os.path.isdir(rpt_folder):
-            has_report = any(
-                f.endswith(".pdf") and f.startswith(f"DOC-{patient_id}-")
-                for f in os.listdir(rpt_folder)
-                if f != "archive"
-            )
+    # Check Persona + Reports (both live in the patient root; scan it once)
+    if req_persona or req_reports:
+        root_folder = get_patient_report_folder(patient_id)
+        found_persona, found_report = _root_outputs_present(
+            root_folder, patient_id, want_persona=req_persona, want_reports=req_reports
+        )
+        has_persona = has_persona or found_persona
+        has_report = has_report or found_report
 
     # Check Summary
     if req_summary:
         summary_folder = get_patient_summary_folder(patient_id)
-        if os.path.isdir(summary_folder):
-            has_summary = any(
-                f.endswith(".pdf") and f.startswith(f"Clinical_Summary_Patient_{patient_id}")
-                for f in os.listdir(summary_folder)
-                if f != "archive"
-            )
+        has_summary = _folder_has_pdf(summary_folder, prefix=f"Clinical_Summary_Patient_{patient_id}")
 
     exists = has_persona and has_report and has_summary
     if not exists:
@@ -256,45 +428,28 @@ def check_patient_sync_status(patient_id: str, generation_mode: dict) -> bool:
         
     return exists
 
-def process_patient_workflow(
+# Marks "not pre-fetched" where None is a meaningful value (no DB record)
+_NOT_LOADED = object()
+
+def prepare_patient_generation(
     patient_id: str,
     feedback: str = "",
-    excluded_names: list[str] = None,
-    generation_mode: dict = None,
-    cancel_check: callable = None,
-    archive_token: str = None,
-) -> str:
+    case_data: dict | None = None,
+    existing_patient=_NOT_LOADED,
+    excluded_names: list[str] | None = None,
+) -> dict | None:
     """
-    Main orchestration for a single patient.
-
-    Args:
-        patient_id:      Patient ID (string).
-        feedback:        Optional free-text AI instructions.
-        excluded_names:  List of names already taken (for uniqueness).
-        generation_mode: Dict with boolean flags 'persona', 'reports', 'summary'.
-                         Defaults to all True.
-
-    Returns:
-        The generated full name if successful, else None.
+    Steps 1–4 of the workflow: load case data, history, existing record,
+    patient state and document plan. Returns a context dict consumed by
+    finalize_patient_workflow (its 'generation_kwargs' feed
+    ai_engine.generate_clinical_data), or None if the patient is unknown.
+    existing_patient may be passed in (e.g. from patient_db.snapshot) to skip the DB read.
+    excluded_names (names already taken) is listed in a new persona's prompt.
     """
-    if excluded_names is None:
-        excluded_names = []
-    if generation_mode is None:
-        generation_mode = {"persona": True, "reports": True, "summary": True}
-
-    # Normalise – ensure all keys present with sane defaults
-    generation_mode = {
-        "persona": generation_mode.get("persona", False),
-        "reports": generation_mode.get("reports", False),
-        "summary": generation_mode.get("summary", False),
-    }
-
-    print(f"\n🚀 Starting Workflow for Patient ID: {patient_id}")
-    print(f"   Mode → Persona:{generation_mode['persona']} | Reports:{generation_mode['reports']} | Summary:{generation_mode['summary']}")
-
     # ── 1. LOAD CASE DATA ──────────────────────────────────────────────────────
     print(f"\n📂 Loading Case Data for ID: {patient_id}…")
-    case_data = data_loader.load_patient_case(patient_id)
+    if case_data is None:
+        case_data = data_loader.load_patient_case(patient_id)
     if not case_data:
         print(f"❌ Patient ID '{patient_id}' not found in Excel plan.")
         return None
@@ -306,7 +461,8 @@ def process_patient_workflow(
         print("   📜 Prior history loaded.")
 
     # ── 3. LOAD EXISTING PATIENT RECORD ───────────────────────────────────────
-    existing_patient = patient_db.load_patient(patient_id)
+    if existing_patient is _NOT_LOADED:
+        existing_patient = patient_db.load_patient(patient_id)
     has_persona = bool(existing_patient and (existing_patient.get("first_name") or existing_patient.get("last_name")))
     if has_persona:
         print(f"   🔄 Existing record: {existing_patient.get('first_name')} {existing_patient.get('last_name')}")
@@ -314,35 +470,55 @@ def process_patient_workflow(
     # ── 4. BUILD PATIENT STATE & DOCUMENT PLAN ─────────────────────────────────
     patient_state = state_manager.build_patient_state(patient_id, case_data)
     document_plan = document_planner.create_and_save_document_plan(patient_id, case_data)
-    # ── 5. AI GENERATION ───────────────────────────────────────────────────────
+    # ── 5. AI GENERATION INPUTS ────────────────────────────────────────────────
     case_details_for_generation = dict(case_data or {})
-    
-    print(f"\n🧠 Generating with AI… (Outcome: {case_data.get('outcome', '?')})")
     feedback = _augment_feedback_with_risk_assessment(feedback, case_details=case_data)
-    
-    if cancel_check and cancel_check():
-        print("   ⛔ Cancellation requested before AI generation.")
-        return None
 
-    try:
-        result, usage = ai_engine.generate_clinical_data(
-            case_details=case_details_for_generation,
-            patient_state=patient_state,
-            document_plan=document_plan,
-            user_feedback=feedback,
-            history_context=history_txt,
-            existing_persona=existing_patient if has_persona else None,
-        )
-        
-        from .doc_generation.validator import validate_npi_consistency
-        npi_valid, npi_errors = validate_npi_consistency(result)
-        if not npi_valid:
-            raise ValueError(f"NPI Consistency Error: {'; '.join(npi_errors)}")
-            
-    except Exception as e:
-        print(f"❌ AI generation failed: {e}")
+    return {
+        "patient_id": patient_id,
+        "case_data": case_data,
+        "feedback": feedback,
+        "patient_state": patient_state,
+        "document_plan": document_plan,
+        "generation_kwargs": {
+            "case_details": case_details_for_generation,
+            "patient_state": patient_state,
+            "document_plan": document_plan,
+            "user_feedback": feedback,
+            "history_context": history_txt,
+            "existing_persona": existing_patient if has_persona else None,
+            "excluded_names": None if has_persona else _taken_names(excluded_names),
+        },
+    }
+
+
+def finalize_patient_workflow(
+    ctx: dict,
+    result,
+    generation_mode: dict,
+    cancel_check: callable = None,
+    archive_token: str = None,
+) -> str:
+    """
+    Post-AI stages of the workflow (NPI check, history, filtering, DB save,
+    versioning, PDF output, patient record) for a context produced by
+    prepare_patient_generation. Returns the full name if successful, else None.
+    """
+    patient_id = ctx["patient_id"]
+    case_data = ctx["case_data"]
+    feedback = ctx["feedback"]
+    patient_state = ctx["patient_state"]
+    document_plan = ctx["document_plan"]
+
+    from .doc_generation.validator import validate_npi_consistency
+    npi_valid, npi_errors = validate_npi_consistency(result)
+    if not npi_valid:
+        print(f"❌ AI generation failed: NPI Consistency Error: {'; '.join(npi_errors)}")
         return None
 
+    # Only payloads that pass validation may be replayed from the response cache
+    ai_engine.store_clinical_data_cache(ctx["generation_kwargs"], result)
+
     # Persist history entry regardless of subsequent steps
     history_manager.append_history(patient_id, feedback, result.changes_summary)
 
@@ -434,7 +610,9 @@ def process_patient_workflow(
     archive_patient_files(patient_id, generation_mode, archive_token=archive_token)
 
     # ── 8. WRITE DOCUMENTS ─────────────────────────────────────────────────────
-    current_year = datetime.datetime.now().year
+    run_started  = datetime.datetime.now()
+    current_year = run_started.year
+    report_date  = run_started.strftime("%m-%d-%Y")
     current_mrn  = f"MRN-{patient_id}-{current_year}"
     docs_written: list[str] = []
 
@@ -476,27 +654,63 @@ def process_patient_workflow(
                 loaded_template_sections.append([])
 
         persist_images = os.getenv("PERSIST_IMAGES", "false").lower() == "true"
+        doc_id_prefix = f"DOC-{patient_id}-v{doc_version_str}-"
+        report_folder_prefix = os.path.join(os.fspath(patient_report_folder), "")
         print(f"   📄 Generating {len(filtered_documents)} report(s) at v{doc_version_str}…")
-        for seq, doc in enumerate(filtered_documents, start=1):
-            if cancel_check and cancel_check():
-                print("   ⛔ Cancellation requested during PDF generation loop.")
-                return None
+
+        # Patient-level header fields shared by every report; only the
+        # accession ID and doc type vary per document.
+        try:
+            persona = result.patient_persona
+            provider_obj = persona.provider if persona else None
+            pa_request = getattr(persona, "pa_request", None) if persona else None
+            facility_obj = getattr(persona, "procedure_facility", None) if persona else None
+            payer_obj = persona.payer if persona else None
+            base_metadata = {
+                "patient_id": patient_id,
+                "mrn": current_mrn,
+                "patient_name": p_full_name or "Unknown",
+                "dob": persona.dob if persona else "",
+                "gender": persona.gender if persona else "",
+                "patient_phone": persona.telecom if persona else "N/A",
+                "report_date": report_date,
+                "provider": (
+                    getattr(pa_request, "requesting_provider", None)
+                    or getattr(provider_obj, "generalPractitioner", None)
+                    or "Unknown"
+                ),
+                "provider_address": getattr(provider_obj, "address", "N/A") if provider_obj else "N/A",
+                "provider_phone": getattr(provider_obj, "phone", "N/A") if provider_obj else "N/A",
+                "facility": (
+                    getattr(facility_obj, "facility_name", None)
+                    or getattr(provider_obj, "managingOrganization", None)
+                    or "Diagnostic Center"
+                ),
+                "plan_type": getattr(payer_obj, "plan_type", "N/A") if payer_obj else "N/A",
+            }
+        except Exception as e:
+            print(f"   ⚠️  Could not build report header metadata: {e}")
+            base_metadata = None
+
+        def _prepare_report(seq, doc):
+            """Validate/repair, format and fetch the image for one report (runs on a worker thread)."""
             try:
                 seq_str            = f"{seq:03d}"
-                doc_identifier     = f"DOC-{patient_id}-v{doc_version_str}-{seq_str}"
+                doc_identifier     = f"{doc_id_prefix}{seq_str}"
                 safe_title_hint = sanitize_filename_component(getattr(doc, "title_hint", "document"))
                 final_filename_base = f"{doc_identifier}-{safe_title_hint}"
 
-                is_valid, errors = validate_structure(doc.content)
+                is_valid, errors = validate_structure_cached(doc.content)
                 if not is_valid:
-                    print(f"      ⚠️  '{doc.title_hint}' invalid: {errors}. Attempting AI fix…")
-                    doc.content = ai_engine.fix_document_content(doc.content, errors)
-                    is_valid, errors = validate_structure(doc.content)
+                    print(f"      ⚠️  '{doc.title_hint}' invalid: {list(errors)}. Attempting AI fix…")
+                    doc.content = ai_engine.fix_document_content(doc.content, list(errors))
+                    is_valid, errors = validate_structure_cached(doc.content)
                     if not is_valid:
                         print(f"      ❌ Fix failed. Marking as NAF.")
                         final_filename_base += "-NAF"
                     else:
-                        print(f"      ✅ AI fixed the document.")
+                        if DOC_DETAIL_LOGS:
+                            print(f"      ✅ AI fixed the document.")
 
                 # V3 Architecture formatting
                 formatted_content = doc.content
@@ -506,42 +720,12 @@ def process_patient_workflow(
                     else:
                         structured_data = json.loads(doc.content)
                     
-                    provider_obj = result.patient_persona.provider if result.patient_persona else None
-                    pa_request = getattr(result.patient_persona, "pa_request", None) if result.patient_persona else None
-                    provider_name = (
-                        getattr(pa_request, "requesting_provider", None)
-                        or getattr(provider_obj, "generalPractitioner", None)
-                        or "Unknown"
-                    )
-                    provider_address = getattr(provider_obj, "address", "N/A") if provider_obj else "N/A"
-                    provider_phone = getattr(provider_obj, "phone", "N/A") if provider_obj else "N/A"
-
-                    facility_obj = getattr(result.patient_persona, "procedure_facility", None) if result.patient_persona else None
-                    facility_name = (
-                        getattr(facility_obj, "facility_name", None)
-                        or getattr(provider_obj, "managingOrganization", None)
-                        or "Diagnostic Center"
-                    )
-                    
-                    patient_phone = result.patient_persona.telecom if result.patient_persona else "N/A"
-                    payer_obj = result.patient_persona.payer if result.patient_persona else None
-                    plan_type = getattr(payer_obj, "plan_type", "N/A") if payer_obj else "N/A"
-
+                    if base_metadata is None:
+                        raise ValueError("patient header metadata unavailable")
                     metadata = {
-                        "patient_id": patient_id,
-                        "mrn": current_mrn,
-                        "patient_name": p_full_name or "Unknown",
-                        "dob": result.patient_persona.dob if result.patient_persona else "",
-                        "gender": result.patient_persona.gender if result.patient_persona else "",
-                        "patient_phone": patient_phone,
-                        "report_date": datetime.datetime.now().strftime("%m-%d-%Y"),
-                        "provider": provider_name,
-                        "provider_address": provider_address,
-                        "provider_phone": provider_phone,
-                        "facility": facility_name,
+                        **base_metadata,
                         "accession_id": f"ACC-{patient_id}-{seq_str}",
                         "doc_type": doc.title_hint,
-                        "plan_type": plan_type
                     }
                     template_sections = (
                         loaded_template_sections[min(seq - 1, len(loaded_template_sections) - 1)]
@@ -560,14 +744,12 @@ def process_patient_workflow(
                     print(f"      ⚠️  Could not format JSON natively, defaulting to AI output text: {e}")
 
                 image_path = None
-                imaging_keywords = ["ECG", "XRAY", "X-RAY", "MRI", "CT", "ULTRASOUND", "ECHO", "RADIOGRAPH", "SCAN"]
-                # Use regex with word boundaries to avoid 'CT' matching 'ACTION'
-                found_keyword = next((kw for kw in imaging_keywords if re.search(rf'\b{kw}\b', str(doc.title_hint).upper())), "Radiograph")
+                found_keyword = _imaging_keyword(doc.title_hint)
                 
-                if any(re.search(rf'\b{kw}\b', str(doc.title_hint).upper()) for kw in imaging_keywords):
-                    print(f"      📸 Imaging document detected '{doc.title_hint}', generating supportive AI visual...")
-                    img_filename = f"{final_filename_base}_img.png"
-                    temp_image_path = os.path.join(patient_report_folder, img_filename)
+                if found_keyword:
+                    if DOC_DETAIL_LOGS:
+                        print(f"      📸 Imaging document detected '{doc.title_hint}', generating supportive AI visual...")
+                    temp_image_path = f"{report_folder_prefix}{final_filename_base}_img.png"
                     
                     # Provide a sanitized, high-fidelity context instead of raw JSON
                     sanitized_hint = doc.title_hint.replace("_", " ").replace("-", " ")
@@ -579,11 +761,46 @@ def process_patient_workflow(
                         output_path=temp_image_path
                     )
                     
-                    if generated_path:
-                        image_path = generated_path
+                    image_path = _materialize_generated_image(generated_path, temp_image_path)
+                    if image_path and DOC_DETAIL_LOGS:
                         print(f"      🖼️  Saved image to {image_path}")
+                return final_filename_base, formatted_content, image_path
+            except Exception as e:
+                print(f"      ❌ Report generation failed for '{getattr(doc, 'title_hint', 'Unknown')}'. Error: {e}")
+                print(traceback.format_exc())
+                return None
 
-                pdf_path = pdf_generator.create_patient_pdf(
+        def _record_report_pdf(doc, image_path, pdf_path):
+            if image_path and not persist_images:
+                try:
+                    os.remove(image_path)
+                except Exception as e:
+                    print(f"      ⚠️  Could not remove temp image {image_path}: {e}")
+            rf = os.path.basename(pdf_path)
+            docs_written.append(rf)
+            if DOC_DETAIL_LOGS:
+                print(f"      ✅ {rf}")
+
+        # Network-bound prep (AI fixes, image generation) overlaps across documents;
+        # PDFs are built in sequence order on this thread, or handed to worker
+        # processes together when PDF_PROCESSES > 1.
+        pdf_jobs = []
+        with ThreadPoolExecutor(max_workers=min(REPORT_WORKERS, len(filtered_documents))) as pool:
+            futures = [
+                pool.submit(_prepare_report, seq, doc)
+                for seq, doc in enumerate(filtered_documents, start=1)
+            ]
+            for doc, fut in zip(filtered_documents, futures):
+                if cancel_check and cancel_check():
+                    print("   ⛔ Cancellation requested during PDF generation loop.")
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+                prepared = fut.result()
+                if prepared is None:
+                    continue
+                final_filename_base, formatted_content, image_path = prepared
+                job = dict(
                     patient_id=patient_id,
                     doc_type=final_filename_base,
                     content=formatted_content,
@@ -593,19 +810,23 @@ def process_patient_workflow(
                     image_path=image_path,
                     version=doc_version_str,
                 )
-                if image_path and not persist_images:
-                    try:
-                        os.remove(image_path)
-                    except Exception as e:
-                        print(f"      ⚠️  Could not remove temp image {image_path}: {e}")
-                rf = os.path.basename(pdf_path)
-                docs_written.append(rf)
-                print(f"      ✅ {rf}")
-            except Exception as e:
-                
-                print(f"      ❌ Report generation failed for '{getattr(doc, 'title_hint', 'Unknown')}'. Error: {e}")
-                print(traceback.format_exc())
-                continue
+                if PDF_PROCESSES > 1:
+                    pdf_jobs.append((doc, job))
+                    continue
+                try:
+                    _record_report_pdf(doc, image_path, pdf_generator.create_patient_pdf(**job))
+                except Exception as e:
+                    print(f"      ❌ Report generation failed for '{getattr(doc, 'title_hint', 'Unknown')}'. Error: {e}")
+                    print(traceback.format_exc())
+                    continue
+
+        if pdf_jobs:
+            built = pdf_generator.create_pdfs_batch([job for _, job in pdf_jobs], max_workers=PDF_PROCESSES)
+            for (doc, job), outcome in zip(pdf_jobs, built):
+                if isinstance(outcome, Exception):
+                    print(f"      ❌ Report generation failed for '{getattr(doc, 'title_hint', 'Unknown')}'. Error: {outcome}")
+                    continue
+                _record_report_pdf(doc, job["image_path"], outcome)
 
     # ── 8c. SUMMARY ────────────────────────────────────────────────────────────
     if generation_mode["summary"]:
@@ -696,6 +917,9 @@ def process_patient_workflow(
         except Exception as e:
             print(f"   ⚠️  Summary generation failed: {e}")
 
+    # Queued PDF writes (PDG_IO=threads) must land before we report/index them
+    _drop_failed_writes(docs_written)
+
     # ── 9. PATIENT TEXT RECORD ─────────────────────────────────────────────────
     if result.patient_persona:
         if cancel_check and cancel_check():
@@ -716,6 +940,243 @@ def process_patient_workflow(
     print(f"\n✅ Workflow complete for patient {patient_id}. {len(docs_written)} document(s) written.")
     return p_full_name
 
+def process_patient_workflow(
+    patient_id: str,
+    feedback: str = "",
+    excluded_names: list[str] = None,
+    generation_mode: dict = None,
+    cancel_check: callable = None,
+    archive_token: str = None,
+    case_data: dict | None = None,
+    existing_patient=_NOT_LOADED,
+) -> str:
+    """
+    Main orchestration for a single patient.
+
+    Args:
+        patient_id:      Patient ID (string).
+        feedback:        Optional free-text AI instructions.
+        excluded_names:  List of names already taken (for uniqueness). A new
+                         persona's name is appended to it, under a lock, once claimed.
+        generation_mode: Dict with boolean flags 'persona', 'reports', 'summary'.
+                         Defaults to all True.
+        case_data:       Pre-loaded case details (batch mode); skips the Excel scan.
+        existing_patient: Pre-fetched DB record (or None if absent); skips the DB read.
+
+    Returns:
+        The generated full name if successful, else None.
+    """
+    if excluded_names is None:
+        excluded_names = []
+    if generation_mode is None:
+        generation_mode = {"persona": True, "reports": True, "summary": True}
+
+    # Normalise – ensure all keys present with sane defaults
+    generation_mode = {
+        "persona": generation_mode.get("persona", False),
+        "reports": generation_mode.get("reports", False),
+        "summary": generation_mode.get("summary", False),
+    }
+
+    print(f"\n🚀 Starting Workflow for Patient ID: {patient_id}")
+    print(f"   Mode → Persona:{generation_mode['persona']} | Reports:{generation_mode['reports']} | Summary:{generation_mode['summary']}")
+
+    ctx = prepare_patient_generation(
+        patient_id, feedback, case_data=case_data, existing_patient=existing_patient,
+        excluded_names=excluded_names,
+    )
+    if ctx is None:
+        return None
+
+    print(f"\n🧠 Generating with AI… (Outcome: {ctx['case_data'].get('outcome', '?')})")
+    if cancel_check and cancel_check():
+        print("   ⛔ Cancellation requested before AI generation.")
+        return None
+
+    gen_kwargs = ctx["generation_kwargs"]
+    try:
+        result, usage = ai_engine.generate_clinical_data(**gen_kwargs)
+    except Exception as e:
+        print(f"❌ AI generation failed: {e}")
+        return None
+
+    if gen_kwargs["existing_persona"] is None:
+        result = _claim_persona_name(gen_kwargs, result, excluded_names)
+
+    return finalize_patient_workflow(
+        ctx,
+        result,
+        generation_mode,
+        cancel_check=cancel_check,
+        archive_token=archive_token,
+    )
+
+def _claim_persona_name(gen_kwargs: dict, result, excluded_names: list[str]):
+    """
+    Reserve a new persona's name in excluded_names before it is persisted, so
+    patients generated concurrently never share one. On a clash the payload is
+    regenerated (at most NAME_CLASH_RETRIES times); if a retry fails, the last
+    good payload is kept. Returns the payload to finalize.
+    """
+    for attempt in range(NAME_CLASH_RETRIES + 1):
+        persona = result.patient_persona if result else None
+        if persona is None:
+            return result
+        full_name = f"{persona.first_name} {persona.last_name}"
+        if _reserve_name(excluded_names, full_name):
+            return result
+        if attempt == NAME_CLASH_RETRIES:
+            break
+        print(f"   🔁 Name '{full_name}' is already used by another patient; regenerating…")
+        retry_kwargs = dict(gen_kwargs)
+        retry_kwargs["excluded_names"] = _taken_names(excluded_names)
+        retry_kwargs["user_feedback"] = (
+            f"{gen_kwargs['user_feedback']}\n"
+            f"The patient name '{full_name}' is already taken; use a different first and last name."
+        ).strip()
+        try:
+            retried, _usage = ai_engine.generate_clinical_data(**retry_kwargs, use_cache=False)
+        except Exception as e:
+            print(f"   ⚠️  Regeneration for a new name failed ({e}); keeping '{full_name}'.")
+            return result
+        if retried is None:
+            return result
+        result = retried
+    print(f"   ⚠️  Name '{full_name}' is already used; keeping it after {NAME_CLASH_RETRIES} retries.")
+    return result
+
+
+def _prepare_patient_contexts(
+    patient_ids: list[str], feedback: str, cases: dict, excluded_names: list[str] | None = None
+) -> dict:
+    """Run prepare_patient_generation for each ID; returns {patient_id: ctx} for the known ones."""
+    contexts = {}
+    for p_id in patient_ids:
+        print(f"\n🚀 Preparing Patient ID: {p_id}")
+        ctx = prepare_patient_generation(p_id, feedback, case_data=cases.get(p_id), excluded_names=excluded_names)
+        if ctx is not None:
+            contexts[str(p_id)] = ctx
+    return contexts
+
+
+def _finalize_patient_results(
+    contexts: dict, results: dict, generation_mode: dict, excluded_names: list[str] | None = None
+) -> list[str]:
+    """
+    Finalize every prepared patient from its (payload, usage) result; returns generated names.
+    With excluded_names, each new persona's name is reserved first (see _claim_persona_name),
+    so personas from one bulk response are unique against existing names and each other.
+    """
+    names = []
+    for p_id, ctx in contexts.items():
+        result, _usage = results.get(p_id, (None, None))
+        if result is None:
+            print(f"❌ AI generation failed for patient {p_id}: no usable result.")
+            continue
+        if excluded_names is not None and ctx["generation_kwargs"]["existing_persona"] is None:
+            result = _claim_persona_name(ctx["generation_kwargs"], result, excluded_names)
+        print(f"\n🧾 Finalizing Patient ID: {p_id}")
+        new_name = finalize_patient_workflow(ctx, result, generation_mode)
+        if new_name:
+            names.append(new_name)
+    return names
+
+
+def _fill_missing_results(requests_by_id: dict, results: dict):
+    """Regenerate, one validated call each, every patient a bulk request left without a payload."""
+    for p_id, gen_kwargs in requests_by_id.items():
+        if results.get(p_id, (None, None))[0] is not None:
+            continue
+        try:
+            results[p_id] = ai_engine.generate_clinical_data(**gen_kwargs) or (None, None)
+        except Exception as e:
+            print(f"❌ AI generation failed for patient {p_id}: {e}")
+
+
+def _normalize_generation_mode(generation_mode: dict | None) -> dict:
+    if generation_mode is None:
+        generation_mode = {"persona": True, "reports": True, "summary": True}
+    return {
+        "persona": generation_mode.get("persona", False),
+        "reports": generation_mode.get("reports", False),
+        "summary": generation_mode.get("summary", False),
+    }
+
+
+def process_patients_via_batch_api(
+    patient_ids: list[str],
+    feedback: str = "",
+    generation_mode: dict = None,
+    cases: dict | None = None,
+    poll_interval: float = 30.0,
+    max_wait: float | None = None,
+    cancel_check: callable = None,
+    excluded_names: list[str] | None = None,
+) -> list[str]:
+    """
+    Offline bulk path: prepare every patient, submit all clinical-data prompts
+    as one provider Batch API job, then finalize each patient from its result.
+    If the job fails, is cancelled or outlives max_wait, and for any patient
+    whose payload failed validation, generation falls back to per-patient calls.
+    New persona names are reserved in excluded_names (as process_patient_workflow does).
+    Returns the list of generated full names.
+    """
+    generation_mode = _normalize_generation_mode(generation_mode)
+    contexts = _prepare_patient_contexts(patient_ids, feedback, cases or {}, excluded_names)
+    if not contexts:
+        return []
+
+    requests_by_id = {p_id: ctx["generation_kwargs"] for p_id, ctx in contexts.items()}
+    try:
+        batch_id = ai_engine.submit_clinical_data_batch(requests_by_id)
+        results = ai_engine.collect_clinical_data_batch(
+            batch_id, requests_by_id,
+            poll_interval=poll_interval, max_wait=max_wait, cancel_check=cancel_check,
+        )
+    except Exception as e:
+        if cancel_check and cancel_check():
+            print(f"   ⛔ Batch run cancelled: {e}")
+            return []
+        print(f"   ⚠️  Batch API run failed ({e}); falling back to per-patient calls.")
+        results = {}
+    _fill_missing_results(requests_by_id, results)
+    return _finalize_patient_results(contexts, results, generation_mode, excluded_names)
+
+
+def process_patients_grouped(
+    patient_ids: list[str],
+    feedback: str = "",
+    generation_mode: dict = None,
+    cases: dict | None = None,
+    group_size: int = 4,
+    excluded_names: list[str] | None = None,
+) -> list[str]:
+    """
+    Bulk path that packs group_size patients into each clinical-data request
+    (ai_engine.generate_clinical_data_multi). Patients missing from a grouped
+    response are retried one at a time. New persona names are reserved in
+    excluded_names, including against the other personas of the same group.
+    Returns the list of generated full names.
+    """
+    generation_mode = _normalize_generation_mode(generation_mode)
+    cases = cases or {}
+    names = []
+    for start in range(0, len(patient_ids), max(1, group_size)):
+        contexts = _prepare_patient_contexts(patient_ids[start:start + group_size], feedback, cases, excluded_names)
+        if not contexts:
+            continue
+
+        requests_by_id = {p_id: ctx["generation_kwargs"] for p_id, ctx in contexts.items()}
+        try:
+            results = ai_engine.generate_clinical_data_multi(requests_by_id)
+        except Exception as e:
+            print(f"   ⚠️  Grouped generation failed ({e}); falling back to per-patient calls.")
+            results = {}
+
+        _fill_missing_results(requests_by_id, results)
+        names.extend(_finalize_patient_results(contexts, results, generation_mode, excluded_names))
+    return names
+
 def preview_patient_generation(
     patient_id: str,
     feedback: str = "",
@@ -874,7 +1335,9 @@ def render_patient_pdfs_from_content(
     
 
     docs_written: list[str] = []
-    current_year = datetime.datetime.now().year
+    run_started = datetime.datetime.now()
+    current_year = run_started.year
+    service_date = run_started.strftime("%m-%d-%Y")
     current_mrn = f"MRN-{patient_id}-{current_year}"
     
     current_major = get_latest_major_version(patient_id)
@@ -946,13 +1409,29 @@ def render_patient_pdfs_from_content(
                 image_map=None, mrn=current_mrn,
                 output_folder=get_patient_persona_folder(patient_id), version=doc_version_str,
             )
-            docs_written.append(os.path.basename(persona_path))
-            print(f"   👤 Persona → {os.path.basename(persona_path)}")
+            pf = os.path.basename(persona_path)
+            docs_written.append(pf)
+            print(f"   👤 Persona → {pf}")
         except Exception as e:
             print(f"   ⚠️  Persona PDF failed: {e}")
 
     # ── Report PDFs from edited content ──────────────────────────────────────
     if generation_mode.get("reports", False) and documents_content:
+        doc_id_prefix = f"DOC-{patient_id}-v{doc_version_str}-"
+        report_folder_prefix = os.path.join(os.fspath(patient_report_folder), "")
+        persist_images = os.getenv("PERSIST_IMAGES", "false").lower() == "true"
+
+        # Facility/provider come from the persona and are the same for every document
+        fac_name = "Medical Center"
+        if persona_obj:
+            proc_fac = getattr(persona_obj, "procedure_facility", None)
+            if proc_fac:
+                fac_name = getattr(proc_fac, "facility_name", "Medical Center")
+
+        prov_name = "Unknown Provider"
+        if persona_obj and getattr(persona_obj, "provider", None):
+            prov_name = getattr(persona_obj.provider, "generalPractitioner", "Unknown Provider")
+
         for seq, doc_info in enumerate(documents_content, start=1):
             if cancel_check and cancel_check():
                 print("   ⛔ Cancellation requested during PDF creation.")
@@ -965,49 +1444,36 @@ def render_patient_pdfs_from_content(
                     # Fallback: best-effort plain text
                     content_body = _strip_html_tags(content_html).strip()
                 seq_str = f"{seq:03d}"
-                doc_identifier = f"DOC-{patient_id}-v{doc_version_str}-{seq_str}"
+                doc_identifier = f"{doc_id_prefix}{seq_str}"
                 safe_title = sanitize_filename_component(title_hint)
                 final_base = f"{doc_identifier}-{safe_title}"
 
-                fac_name = "Medical Center"
-                if persona_obj:
-                    proc_fac = getattr(persona_obj, "procedure_facility", None)
-                    if proc_fac:
-                        fac_name = getattr(proc_fac, "facility_name", "Medical Center")
-
-                prov_name = "Unknown Provider"
-                if persona_obj and getattr(persona_obj, "provider", None):
-                    prov_name = getattr(persona_obj.provider, "generalPractitioner", "Unknown Provider")
-
                 doc_meta = types.SimpleNamespace(
                     title_hint=title_hint,
                     facility_name=fac_name,
                     provider_name=prov_name,
-                    service_date=datetime.datetime.now().strftime("%m-%d-%Y"),
+                    service_date=service_date,
                     accession_number=f"ACC-{patient_id}-{seq_str}",
                 )
                 image_path = None
-                imaging_keywords = ["ECG", "XRAY", "X-RAY", "MRI", "CT", "ULTRASOUND", "ECHO", "RADIOGRAPH", "SCAN"]
-                found_keyword = next((kw for kw in imaging_keywords if re.search(rf'\b{kw}\b', str(title_hint).upper())), "Radiograph")
+                found_keyword = _imaging_keyword(title_hint)
                 
-                if any(re.search(rf'\b{kw}\b', str(title_hint).upper()) for kw in imaging_keywords):
-                    print(f"      📸 Imaging document detected '{title_hint}', generating supportive AI visual...")
-                    img_filename = f"{final_base}_img.png"
-                    temp_image_path = os.path.join(patient_report_folder, img_filename)
+                if found_keyword:
+                    if DOC_DETAIL_LOGS:
+                        print(f"      📸 Imaging document detected '{title_hint}', generating supportive AI visual...")
+                    temp_image_path = f"{report_folder_prefix}{final_base}_img.png"
                     
                     sanitized_hint = title_hint.replace("_", " ").replace("-", " ")
                     image_context = f"High-fidelity medical visualization of {sanitized_hint} radiological findings"
                     
                     try:
-                        from src.ai.engine import AIEngine
-                        ai_engine = AIEngine()
                         generated_path = ai_engine.generate_clinical_image(
                             context=image_context, 
                             image_type=found_keyword, 
                             output_path=temp_image_path
                         )
-                        if generated_path:
-                            image_path = generated_path
+                        image_path = _materialize_generated_image(generated_path, temp_image_path)
+                        if image_path and DOC_DETAIL_LOGS:
                             print(f"      🖼️  Saved image to {image_path}")
                     except Exception as e:
                         print(f"      ⚠️  Could not generate image: {e}")
@@ -1023,16 +1489,16 @@ def render_patient_pdfs_from_content(
                     version=doc_version_str,
                 )
                 
-                if image_path:
-                    persist_images = os.getenv("PERSIST_IMAGES", "false").lower() == "true"
-                    if not persist_images:
-                        try:
-                            os.remove(image_path)
-                        except Exception as e:
-                            print(f"      ⚠️  Could not remove temp image {image_path}: {e}")
-
-                docs_written.append(os.path.basename(pdf_path))
-                print(f"      ✅ {os.path.basename(pdf_path)}")
+                if image_path and not persist_images:
+                    try:
+                        os.remove(image_path)
+                    except Exception as e:
+                        print(f"      ⚠️  Could not remove temp image {image_path}: {e}")
+
+                rf = os.path.basename(pdf_path)
+                docs_written.append(rf)
+                if DOC_DETAIL_LOGS:
+                    print(f"      ✅ {rf}")
             except Exception as e:
                 
                 print(f"      ❌ PDF failed for '{doc_info.get('title_hint','?')}': {e}")
@@ -1075,10 +1541,13 @@ def render_patient_pdfs_from_content(
                 version=doc_version_str,
             )
             if sum_path:
-                docs_written.append(os.path.basename(sum_path))
-                print(f"   📊 Summary → {os.path.basename(sum_path)}")
+                sf = os.path.basename(sum_path)
+                docs_written.append(sf)
+                print(f"   📊 Summary → {sf}")
         except Exception as e:
             print(f"   ⚠️  Summary failed: {e}")
 
+    _drop_failed_writes(docs_written)
+
     print(f"\n✅ {len(docs_written)} PDF(s) rendered from confirmed content.")
     return docs_written
@@ -0,0 +1,72 @@
+"""
+Unit tests for the single-pass markdown formatting used by the PDF builders.
+"""
+import os
+import re
+import sys
+import unittest
+
+# Ensure src is importable
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_BASE_DIR, "src"))
+sys.path.insert(0, _BASE_DIR)
+
+from src.doc_generation.pdf_generator import format_clinical_text, format_clinical_lines
+
+
+def _legacy_format_clinical_text(text: str) -> str:
+    """The original four-pass implementation the single regex pass replaced."""
+    if not text: return ""
+    text = re.sub(r'^-{3,}', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
+    text = re.sub(r'__(.*?)__', r'<b>\1</b>', text)
+    text = re.sub(r'^(#+)\s*(.*)', r'<b><font size=12>\2</font></b><br/>', text, flags=re.MULTILINE)
+    return text.strip()
+
+
+SAMPLES = [
+    "",
+    "Plain clinical prose with no markers.",
+    "Hyphen-ated words and snake_case_ids stay as they are.",
+    "**Chief Complaint:** knee pain",
+    "Patient reports __severe__ pain and **limited** ROM.",
+    "# Assessment\nStable.",
+    "## Plan\n- Follow up in 2 weeks\n- PT referral",
+    "---\n# Findings\n**Impression:** normal",
+    "----\nHorizontal rule above.",
+    "Text\n---\nMore text",
+    "### **Bold header**\nbody",
+    "**__nested__** markers",
+    "Unclosed **bold marker",
+    "#NoSpaceHeader\nline",
+    "  # indented hash is not a header\n",
+    "Mixed __one__ and **two** and __three__ on a line",
+    "A # in the middle of a line",
+    "Multiple\n\n\n# Header after blank lines\ntext",
+]
+
+
+class TestFormatClinicalText(unittest.TestCase):
+    def test_matches_legacy_multi_regex_output(self):
+        """format_clinical_text produces the same markup as the original four re.sub passes."""
+        for sample in SAMPLES:
+            with self.subTest(sample=sample):
+                self.assertEqual(format_clinical_text(sample), _legacy_format_clinical_text(sample))
+
+    def test_plain_text_fast_path(self):
+        """Text without markers is returned stripped and otherwise untouched."""
+        self.assertEqual(format_clinical_text("  well-known snake_case value  "), "well-known snake_case value")
+
+    def test_lines_match_per_line_calls(self):
+        """format_clinical_lines equals calling format_clinical_text on each non-blank line."""
+        for sample in SAMPLES:
+            expected = [
+                format_clinical_text(ln.strip())
+                for ln in sample.split("\n") if ln.strip()
+            ]
+            with self.subTest(sample=sample):
+                self.assertEqual(format_clinical_lines(sample), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+Unit tests for on-disk helpers: purge utilities, history logging and the
+directory-listing cache behind the version lookups.
+"""
+import fnmatch
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Ensure src is importable
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_BASE_DIR, "src"))
+sys.path.insert(0, _BASE_DIR)
+
+from src.data import history
+from src.utils import file_utils, purge_manager
+
+
+def _touch(path: str, data: bytes = b"%PDF"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class _TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+
+class TestPurgeHelpers(_TempDirTestCase):
+    def test_pattern_regex_matches_fnmatch(self):
+        """The cached combined regex accepts exactly the names fnmatch accepts for any pattern."""
+        patterns = purge_manager._SUMMARY_PATTERNS + ("DOC-*.pdf", "*-persona-*.pdf")
+        names = [
+            "DOC-1-v1.0-001-MRI.pdf", "DOC-.pdf", "DOC-1.pdfx", "doc-1.pdf",
+            "221-persona-v1.pdf", "221-persona.pdf", "persona-x.pdf",
+            "Clinical_Summary_Patient_221.pdf", "Concise_Summary_Patient_.pdf",
+            "Annotator_Summary_Patient_9-v2.pdf", "Other_Summary_Patient_1.pdf",
+        ]
+        regex = purge_manager._pattern_regex(patterns)
+        self.assertIs(regex, purge_manager._pattern_regex(patterns))
+        for name in names:
+            with self.subTest(name=name):
+                expected = any(fnmatch.fnmatchcase(name, p) for p in patterns)
+                self.assertEqual(bool(regex.match(name)), expected)
+
+    def test_patient_files_scans_each_patient_folder(self):
+        """_patient_files returns matching regular files only, skipping hidden files and directories."""
+        root = os.path.join(self.tmp, "patient-data")
+        _touch(os.path.join(root, "1 - A", "DOC-1-v1.0-001-MRI.pdf"))
+        _touch(os.path.join(root, "1 - A", "1-persona-v1.pdf"))
+        _touch(os.path.join(root, "2 - B", "DOC-2-v1.0-001-CT.pdf"))
+        _touch(os.path.join(root, "2 - B", ".DOC-hidden.pdf"))
+        os.makedirs(os.path.join(root, "2 - B", "DOC-dir.pdf"))
+        _touch(os.path.join(root, "stray.pdf"))
+
+        with mock.patch.object(purge_manager, "PATIENT_DATA_DIR", root):
+            found = sorted(os.path.basename(p) for p in purge_manager._patient_files("DOC-*.pdf"))
+        self.assertEqual(found, ["DOC-1-v1.0-001-MRI.pdf", "DOC-2-v1.0-001-CT.pdf"])
+
+        with mock.patch.object(purge_manager, "PATIENT_DATA_DIR", os.path.join(self.tmp, "missing")):
+            self.assertEqual(purge_manager._patient_files("DOC-*.pdf"), [])
+
+    def test_clear_dir_and_rmtree_report_missing(self):
+        """_clear_dir empties in place; both helpers return False for a missing path."""
+        target = os.path.join(self.tmp, "summary")
+        _touch(os.path.join(target, "a.pdf"))
+        _touch(os.path.join(target, "nested", "b.pdf"))
+        self.assertTrue(purge_manager._clear_dir(target))
+        self.assertTrue(os.path.isdir(target))
+        self.assertEqual(os.listdir(target), [])
+        self.assertTrue(purge_manager._rmtree(target))
+        self.assertFalse(purge_manager._rmtree(target))
+        self.assertFalse(purge_manager._clear_dir(target))
+
+    def test_remove_db_entries_single_rewrite(self):
+        """Several IDs are dropped with one read and one rewrite; unknown IDs are ignored."""
+        db_path = os.path.join(self.tmp, "patients_db.json")
+        with open(db_path, "w", encoding="utf-8") as f:
+            json.dump({"1": {"first_name": "A"}, "2": {"first_name": "B"}, "3": {"first_name": "C"}}, f)
+
+        with mock.patch.object(purge_manager, "DB_PATH", db_path), \
+                mock.patch.object(purge_manager, "_save_db", wraps=purge_manager._save_db) as save:
+            purge_manager._remove_db_entries(["1", "3", "404"])
+            self.assertEqual(save.call_count, 1)
+            self.assertEqual(purge_manager._load_db(), {"2": {"first_name": "B"}})
+            self.assertFalse(os.path.exists(f"{db_path}.tmp"))
+
+            purge_manager._remove_db_entries(["404"])
+            self.assertEqual(save.call_count, 1)
+
+    def test_remove_files_serial_and_parallel(self):
+        """_remove_files deletes every path on both the serial and the thread-pool branch."""
+        for count in (3, purge_manager._PARALLEL_UNLINK_MIN + 5):
+            paths = [os.path.join(self.tmp, f"f{count}_{i}.pdf") for i in range(count)]
+            for p in paths:
+                _touch(p)
+            removed, error = purge_manager._remove_files(paths)
+            with self.subTest(count=count):
+                self.assertIsNone(error)
+                self.assertEqual(removed, paths)
+                self.assertFalse(any(os.path.exists(p) for p in paths))
+
+    def test_partial_failure_reports_removed_then_raises(self):
+        """Files deleted before a failure are still reported; the first error is re-raised afterwards."""
+        for count in (3, purge_manager._PARALLEL_UNLINK_MIN + 5):
+            paths = [os.path.join(self.tmp, f"g{count}_{i}.pdf") for i in range(count)]
+            for p in paths[:1] + paths[2:]:
+                _touch(p)
+            with self.subTest(count=count), \
+                    mock.patch.object(purge_manager, "_print_deleted") as printed:
+                with self.assertRaises(FileNotFoundError):
+                    purge_manager._delete_and_report(paths)
+                reported = printed.call_args.args[0]
+                self.assertIn(paths[0], reported)
+                self.assertNotIn(paths[1], reported)
+                self.assertFalse(any(os.path.exists(p) for p in reported))
+
+
+class TestRootOutputsPresent(_TempDirTestCase):
+    def test_alphanumeric_patient_id(self):
+        """Report detection is case-insensitive for IDs containing letters (e.g. 'P101')."""
+        from src.workflow import _root_outputs_present
+
+        folder = os.path.join(self.tmp, "P101 - Test Patient")
+        _touch(os.path.join(folder, "DOC-P101-v1.0-001-MRI.pdf"))
+        self.assertEqual(_root_outputs_present(folder, "P101", False, True), (False, True))
+        self.assertEqual(_root_outputs_present(folder, "P101", True, True), (False, True))
+
+        _touch(os.path.join(folder, "P101-persona-v1.0.pdf"))
+        self.assertEqual(_root_outputs_present(folder, "P101", True, True), (True, True))
+        self.assertEqual(_root_outputs_present(folder, "P102", True, True), (True, False))
+
+
+class TestHistoryAcrossPurge(_TempDirTestCase):
+    def test_append_after_logs_folder_removed(self):
+        """append_history recreates the logs folder after a purge instead of failing."""
+        logs_dir = os.path.join(self.tmp, "logs", "7 - Test Patient")
+        log_path = os.path.join(logs_dir, "7.txt")
+        with mock.patch.object(history, "get_patient_logs_folder", return_value=logs_dir):
+            history.append_history("7", "first", "created")
+            self.assertIn("AI CHANGES: created", history.get_history("7"))
+
+            self.assertTrue(purge_manager._rmtree(os.path.join(self.tmp, "logs")))
+            self.assertEqual(history.get_history("7"), "")
+
+            history.append_history("7", "", "regenerated")
+            content = history.get_history("7")
+        self.assertTrue(os.path.isfile(log_path))
+        self.assertIn("USER FEEDBACK: None", content)
+        self.assertIn("AI CHANGES: regenerated", content)
+        self.assertNotIn("created", content)
+
+
+class TestListingCache(_TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        file_utils.invalidate_listing_cache()
+        self.addCleanup(file_utils.invalidate_listing_cache)
+
+    def _age(self, path: str, seconds: int):
+        stamp = time.time() - seconds
+        os.utime(path, (stamp, stamp))
+
+    def test_listing_refreshes_when_mtime_changes(self):
+        """A settled listing is cached and rescanned once the directory mtime moves."""
+        folder = os.path.join(self.tmp, "reports")
+        _touch(os.path.join(folder, "DOC-1-v1.0-001.pdf"))
+        self._age(folder, 60)
+        self.assertEqual(sorted(file_utils._iter_pdf_names(folder)), ["DOC-1-v1.0-001.pdf"])
+        self.assertIn(folder, file_utils._DIR_LISTING_CACHE)
+
+        _touch(os.path.join(folder, "DOC-1-v2.0-001.pdf"))
+        self._age(folder, 30)
+        self.assertEqual(
+            sorted(file_utils._iter_pdf_names(folder)),
+            ["DOC-1-v1.0-001.pdf", "DOC-1-v2.0-001.pdf"],
+        )
+
+    def test_recent_listing_is_not_cached(self):
+        """A directory modified within the racy window is rescanned on every call."""
+        folder = os.path.join(self.tmp, "reports")
+        _touch(os.path.join(folder, "DOC-1-v1.0-001.pdf"))
+        list(file_utils._iter_pdf_names(folder))
+        self.assertNotIn(folder, file_utils._DIR_LISTING_CACHE)
+
+        # Same-tick change: the mtime is pinned, yet the new file is still seen
+        stat = os.stat(folder)
+        _touch(os.path.join(folder, "DOC-1-v1.0-002.pdf"))
+        os.utime(folder, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(len(list(file_utils._iter_pdf_names(folder))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()